@@ -0,0 +1,30 @@
+from typing import Callable, Dict
+from src.data.map_generator import generate_environment, generate_maze, generate_rooms
+
+STYLES = ('open', 'rectangles', 'maze', 'rooms')
+
+
+def open_field(size: int, seed: int) -> Dict:
+    """No obstacles at all."""
+    return generate_environment(size, size, density=0, goal_count=3, seed=seed)
+
+
+def random_rectangles(size: int, seed: int) -> Dict:
+    """Random axis-aligned rectangles covering roughly a quarter of the map."""
+    return generate_environment(size, size, density=0.25, goal_count=3, seed=seed,
+                                max_wall_size=max(2, size // 20))
+
+
+GENERATORS: Dict[str, Callable[[int, int], Dict]] = {
+    'open': open_field,
+    'rectangles': random_rectangles,
+    'maze': generate_maze,
+    'rooms': generate_rooms,
+}
+
+
+def generate(style: str, size: int, seed: int = 0) -> Dict:
+    """Build the deterministic benchmark map for (style, size, seed) with src.data.map_generator."""
+    if style not in GENERATORS:
+        raise ValueError(f"Unknown map style: {style}")
+    return GENERATORS[style](size, seed)
@@ -0,0 +1,161 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from benchmarks.map_generators import STYLES, generate
+from src.algorithms.registry import registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCALES = (100, 1000)
+# Metrics compared against the baseline; larger is worse for all of them.
+COMPARED_METRICS = ('wall_time', 'expansions', 'peak_frontier', 'peak_rss_kb', 'tracemalloc_peak')
+
+
+def measure(environment: Dict, method: str, use_tracemalloc: bool) -> Dict:
+    """Run one search in this process, stepping it to sample the frontier size."""
+    algorithm_class = registry.load(method)
+    if use_tracemalloc:
+        tracemalloc.start()
+    started = time.perf_counter()
+    algorithm = algorithm_class(environment)
+    peak_frontier = 0
+    for _ in algorithm.steps():
+        if algorithm.frontier is not None and len(algorithm.frontier) > peak_frontier:
+            peak_frontier = len(algorithm.frontier)
+    wall_time = time.perf_counter() - started
+    result = {
+        'wall_time': wall_time,
+        'expansions': len(algorithm.moves),
+        'path_length': len(algorithm.path),
+        'peak_frontier': peak_frontier,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+    if use_tracemalloc:
+        result['tracemalloc_peak'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def _child(connection, environment: Dict, method: str, use_tracemalloc: bool) -> None:
+    logging.disable(logging.CRITICAL)
+    try:
+        connection.send(measure(environment, method, use_tracemalloc))
+    except BaseException as e:
+        connection.send({'error': f"{type(e).__name__}: {e}"})
+    finally:
+        connection.close()
+
+
+def run_isolated(environment: Dict, method: str, timeout: float, use_tracemalloc: bool) -> Dict:
+    """Measure one run in a fresh process so peak RSS and crashes stay per-run."""
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=_child, args=(sender, environment, method, use_tracemalloc))
+    process.start()
+    sender.close()
+    if receiver.poll(timeout):
+        try:
+            result = receiver.recv()
+        except EOFError:
+            result = {'error': f"worker exited with code {process.exitcode}"}
+    else:
+        process.terminate()
+        result = {'error': 'timeout'}
+    process.join()
+    return result
+
+
+def run_suite(scales: List[int], styles: List[str], methods: List[str], seed: int,
+              timeout: float, use_tracemalloc: bool) -> Dict[str, Dict]:
+    results = {}
+    for size in scales:
+        for style in styles:
+            environment = generate(style, size, seed)
+            for method in methods:
+                key = f"{style}/{size}/{method}"
+                result = run_isolated(environment, method, timeout, use_tracemalloc)
+                results[key] = result
+                if 'error' in result:
+                    print(f"{key:32} {result['error']}", flush=True)
+                else:
+                    print(f"{key:32} {result['wall_time']:9.3f}s "
+                          f"{result['expansions']:>9} exp "
+                          f"{result['peak_frontier']:>8} frontier "
+                          f"{result['peak_rss_kb']:>9} KB rss", flush=True)
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """Return a message for every metric that grew beyond threshold relative to the baseline."""
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        if 'error' in result and 'error' not in previous:
+            regressions.append(f"{key}: now fails ({result['error']})")
+            continue
+        for metric in COMPARED_METRICS:
+            if metric not in result or not previous.get(metric):
+                continue
+            ratio = result[metric] / previous[metric]
+            if ratio > 1 + threshold:
+                regressions.append(
+                    f"{key}: {metric} {previous[metric]:.6g} -> {result[metric]:.6g} ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    methods = registry.names()
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.runner",
+        description="Benchmark every search algorithm on generated maps.")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                        help="comma-separated map sizes, e.g. 100,1000,4000")
+    parser.add_argument("--styles", default=",".join(STYLES),
+                        help=f"comma-separated map styles from {', '.join(STYLES)}")
+    parser.add_argument("--methods", default=",".join(methods),
+                        help="comma-separated methods (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120.0,
+                        help="seconds before a single run is abandoned")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="also record the tracemalloc peak (slows the search down)")
+    parser.add_argument("--save", metavar="FILE", help="write the results as a JSON baseline")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative growth that counts as a regression (default 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run_suite([int(s) for s in args.scales.split(',') if s],
+                        [s for s in args.styles.split(',') if s],
+                        [m for m in args.methods.split(',') if m],
+                        args.seed, args.timeout, args.tracemalloc)
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({'python': platform.python_version(), 'seed': args.seed,
+                       'results': results}, file, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            baseline = json.load(file)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
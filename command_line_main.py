@@ -1,35 +1,97 @@
+import argparse
+import json
+import os
 import sys
 import logging
 from src.utils.logging import setup_logging
-from src.data.file_reader import read_input_file
-from src.data.environment_parser import parse_environment
+from src.data.bulk_parser import load_environment
+from src.data.file_reader import COMPILED_EXTENSION
+from src.data.map_cache import compile_environment
+from src.data.move_writer import MOVE_FORMATS
 from src.command_line_robot import CommandLineRobot
+from src.utils.metrics import SearchMetrics
+
+
+def single_run_parser():
+    parser = argparse.ArgumentParser(prog="command_line_main.py")
+    parser.add_argument("filename")
+    parser.add_argument("method")
+    parser.add_argument("--metrics", action="store_true",
+                        help="print the run's search metrics as a JSON line after the result")
+    parser.add_argument("--count-only", action="store_true",
+                        help="count expansions instead of keeping the list of expanded cells")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="include the tracemalloc peak in the metrics (slows the search down)")
+    parser.add_argument("--format", choices=MOVE_FORMATS, default="text",
+                        help="moves line format: the default move list, run-length encoded runs "
+                             "or packed 2-bit binary (4-connected paths only)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="parse the text map without reading or writing its compiled cache")
+    return parser
 
 
 def main():
     log_path = setup_logging()
     logger = logging.getLogger(__name__)
-    logger.info(f"Command-line application started. Log file: {log_path}")
+    logger.info("Command-line application started. Log file: %s", log_path)
+
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from src.batch_runner import batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        from src.service import serve_main
+        sys.exit(serve_main(sys.argv[2:]))
+
+    if len(sys.argv) > 1 and sys.argv[1] == "generate":
+        from src.data.map_generator import generate_main
+        sys.exit(generate_main(sys.argv[2:]))
+
+    if len(sys.argv) > 1 and sys.argv[1] == "decode":
+        from src.data.move_writer import decode_main
+        sys.exit(decode_main(sys.argv[2:]))
+
+    if len(sys.argv) in (3, 4) and sys.argv[1] == "compile":
+        source = sys.argv[2]
+        target = sys.argv[3] if len(sys.argv) == 4 else \
+            os.path.splitext(source)[0] + COMPILED_EXTENSION
+        try:
+            compile_environment(load_environment(source, use_cache=False), target)
+            print(f"Compiled {source} -> {target}")
+        except Exception as e:
+            logger.error("Error occurred: %s", e)
+            print(f"An error occurred: {str(e)}")
+            sys.exit(1)
+        return
 
-    if len(sys.argv) != 3:
-        print("Usage: python command_line_main.py <filename> <method>")
+    if len(sys.argv) < 3 or sys.argv[1].startswith('-'):
+        print("Usage: python command_line_main.py <filename> <method> [--metrics] [--count-only] [--tracemalloc] [--format text|rle|packed] [--no-cache]")
+        print("       python command_line_main.py compile <filename.txt> [<output.pfm>]")
+        print("       python command_line_main.py batch --help")
+        print("       python command_line_main.py decode <output>")
+        print("       python command_line_main.py generate --help")
+        print("       python command_line_main.py serve --help")
         sys.exit(1)
 
-    filename = sys.argv[1]
-    method = sys.argv[2]
+    options = single_run_parser().parse_args(sys.argv[1:])
+    filename = options.filename
+    method = options.method
+    metrics = None
+    if options.metrics or options.count_only or options.tracemalloc:
+        metrics = SearchMetrics(count_only=options.count_only, trace_memory=options.tracemalloc)
 
     try:
-        raw_data = read_input_file(filename)
-        environment = parse_environment(raw_data)
+        environment = load_environment(filename, use_cache=not options.no_cache)
         robot = CommandLineRobot(environment)
 
-        goal, num_nodes, path = robot.run_algorithm(method)
-        output = robot.format_output(filename, method, goal, num_nodes, path)
-        print(output)
+        goal, num_nodes, path = robot.run_algorithm(method, metrics)
+        robot.write_output(sys.stdout, filename, method, goal, num_nodes, path, options.format)
+        if options.metrics:
+            print(json.dumps({'file': filename, 'method': method, 'metrics': metrics.as_dict()}))
 
         logger.info("Command-line application completed successfully")
     except Exception as e:
-        logger.error(f"Error occurred: {str(e)}")
+        logger.error("Error occurred: %s", e)
         print(f"An error occurred: {str(e)}")
         sys.exit(1)
 
@@ -7,7 +7,7 @@ from src.robot_navigation_app import RobotNavigationApp
 if __name__ == "__main__":
     log_path = setup_logging()
     logger = logging.getLogger(__name__)
-    logger.info(f"Application started. Log file: {log_path}")
+    logger.info("Application started. Log file: %s", log_path)
 
     root = ctk.CTk()
     root.geometry("800x600")
@@ -1,66 +1,65 @@
-import heapq
-import time
 import logging
-from typing import List, Tuple, Dict, Set
-from src.utils.pathfinding_utils import get_neighbors, reconstruct_path, manhattan_distance, parse_walls
+from typing import Iterator, Tuple
+from src.algorithms.base import SearchAlgorithm
+from src.utils.search_buffers import SearchBuffers
 
 logger = logging.getLogger(__name__)
 
 
-class AStar:
-    def __init__(self, environment: Dict):
-        self.rows, self.cols = environment['dimensions']
-        self.start = environment['start']
-        self.goals = set(environment['goals'])
-        self.walls = parse_walls(environment['walls'])
-        self.moves = []
+class AStar(SearchAlgorithm):
+    def steps(self) -> Iterator[Tuple[int, int]]:
+        """Run A* algorithm, yielding each expanded cell, and store the path to the goal."""
+        if self.unsolvable():
+            return
+        grid = self.grid
+        goals = set(grid.ids(self.goals))
+        start = grid.index(*self.start)
+        # Unit step costs and an integer heuristic keep every f-value a small
+        # integer, so a bucket queue gives O(1) push, pop and decrease-key.
+        # The full-map tables are reused from the previous search (see
+        # SearchBuffers), so a short search does not pay for the whole map.
+        buffers = SearchBuffers.acquire(grid)
+        open_set, closed_set = buffers.open_set, buffers.closed
+        g_score, parent = buffers.g_score, buffers.parent
+        expanded = []
+        self.frontier = open_set
+        g_score[start] = 0
+        open_set.push(start, self.heuristic(self.start))
 
-    def run(self, callback) -> List[Tuple[int, int]]:
-        """Run A* algorithm and return the path to the goal."""
-        open_set = [(0, self.start)]
-        closed_set = set()
-        g_score = {self.start: 0}
-        f_score = {self.start: min(manhattan_distance(
-            self.start, goal) for goal in self.goals)}
-        parent = {self.start: None}
+        try:
+            while open_set:
+                current = open_set.pop()
+                expanded.append(current)
+                self.moves.append(grid.coords(current))
 
-        while open_set:
-            _, current = heapq.heappop(open_set)
-            self.moves.append(current)
+                yield self.moves[-1]
 
-            # Update UI and wait
-            callback(self.moves)
-            time.sleep(0.1)
+                if current in goals:
+                    logger.info("Goal reached at %s", grid.coords(current))
+                    self.path = grid.reconstruct_path(parent, current)
+                    return
 
-            if current in self.goals:
-                logger.info(f"Goal reached at {current}")
-                return reconstruct_path(parent, current)
+                closed_set[current] = 1
 
-            closed_set.add(current)
+                for neighbor in grid.neighbors(current):
+                    if closed_set[neighbor]:
+                        continue
 
-            for neighbor in get_neighbors(*current, self.rows, self.cols, self.walls):
-                if neighbor in closed_set:
-                    continue
+                    tentative_g_score = g_score[current] + 1
 
-                tentative_g_score = g_score[current] + 1
+                    if neighbor not in open_set:
+                        parent[neighbor] = current
+                        g_score[neighbor] = tentative_g_score
+                        f_score = g_score[neighbor] + \
+                            self.heuristic(grid.coords(neighbor))
+                        open_set.push(neighbor, f_score)
+                    elif tentative_g_score < g_score[neighbor]:
+                        parent[neighbor] = current
+                        g_score[neighbor] = tentative_g_score
+                        f_score = g_score[neighbor] + \
+                            self.heuristic(grid.coords(neighbor))
+                        open_set.decrease_key(neighbor, f_score)
 
-                if neighbor not in [item[1] for item in open_set]:
-                    parent[neighbor] = current
-                    g_score[neighbor] = tentative_g_score
-                    f_score[neighbor] = g_score[neighbor] + \
-                        min(manhattan_distance(neighbor, goal)
-                            for goal in self.goals)
-                    heapq.heappush(open_set, (f_score[neighbor], neighbor))
-                elif tentative_g_score < g_score[neighbor]:
-                    parent[neighbor] = current
-                    g_score[neighbor] = tentative_g_score
-                    f_score[neighbor] = g_score[neighbor] + \
-                        min(manhattan_distance(neighbor, goal)
-                            for goal in self.goals)
-                    # Update priority
-                    open_set = [(f_score[item[1]], item[1]) if item[1]
-                                == neighbor else item for item in open_set]
-                    heapq.heapify(open_set)
-
-        logger.warning("No path to goal found")
-        return []
+            logger.warning("No path to goal found")
+        finally:
+            buffers.release(expanded)
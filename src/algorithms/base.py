@@ -0,0 +1,81 @@
+import logging
+from contextlib import nullcontext
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from src.utils.goal_index import GoalIndex
+from src.utils.grid import Grid
+from src.utils.pathfinding_utils import manhattan_distance
+
+logger = logging.getLogger(__name__)
+
+
+class SearchAlgorithm:
+    """
+    Common state and driver for the grid search engines.
+
+    Subclasses implement `steps()` as a generator that yields every expanded
+    cell and stores the final path in `self.path`. Callers either drive the
+    generator themselves (e.g. the GUI pulling steps at its frame rate) or
+    call `run()`, which exhausts it at full speed. While a search runs,
+    `self.frontier` refers to its open list (anything with a length) so
+    tools can sample the frontier size between steps.
+
+    `self.metrics` is None unless the run is profiled (see
+    src.utils.metrics.profile); engines time their distinct stages, such as
+    building a shared structure, with `self.phase(name)`.
+
+    Cells outside the map have no id of their own (Grid.index would alias
+    them onto real cells), so goals outside the map are dropped here and
+    engines check `unsolvable()` before indexing the start.
+    """
+
+    # Distance metric behind heuristic(); engines with other move sets override it.
+    metric = staticmethod(manhattan_distance)
+
+    def __init__(self, environment: Dict):
+        self.rows, self.cols = environment['dimensions']
+        self.start = environment['start']
+        self.grid = Grid.from_environment(environment)
+        self.goals = {goal for goal in environment['goals'] if self.grid.in_bounds(*goal)}
+        self.goal_index = GoalIndex(self.goals, self.metric)
+        self.moves = []
+        self.path = []
+        self.frontier = None
+        self.metrics = None
+
+    def heuristic(self, node: Tuple[int, int]) -> float:
+        """Lower bound on the distance from node to the nearest goal."""
+        return self.goal_index.distance(node)
+
+    def start_heuristic(self, node: Tuple[int, int]) -> float:
+        """Lower bound on the distance from node back to the start, for searches run from the goals."""
+        return self.metric(node, self.start)
+
+    def unsolvable(self) -> bool:
+        """True, with a warning, when the start is off the map or no goal is on it."""
+        if not self.grid.in_bounds(*self.start):
+            logger.warning("Start %s is outside the %sx%s map; no path to goal", self.start, self.rows, self.cols)
+            return True
+        if not self.goals:
+            logger.warning("No goal lies on the %sx%s map; no path to goal", self.rows, self.cols)
+            return True
+        return False
+
+    def phase(self, name: str):
+        """Context manager timing a named phase into the attached metrics; a no-op otherwise."""
+        if self.metrics is None:
+            return nullcontext()
+        return self.metrics.phase(name)
+
+    def steps(self) -> Iterator[Tuple[int, int]]:
+        """Yield each expanded cell; the resulting path is left in self.path."""
+        raise NotImplementedError
+
+    def run(self, callback: Optional[Callable[[List[Tuple[int, int]]], None]] = None) -> List[Tuple[int, int]]:
+        """Run the search to completion and return the path to the goal."""
+        if callback is None:
+            for _ in self.steps():
+                pass
+        else:
+            for _ in self.steps():
+                callback(self.moves)
+        return self.path
@@ -1,44 +1,47 @@
-import queue
-import time
 import logging
-from typing import List, Tuple, Dict
-from src.utils.pathfinding_utils import get_neighbors, reconstruct_path, parse_walls
+from collections import deque
+from typing import Iterator, Tuple
+from src.algorithms.base import SearchAlgorithm
+from src.utils.search_buffers import SearchBuffers
 
 logger = logging.getLogger(__name__)
 
 
-class BFS:
-    def __init__(self, environment: Dict):
-        self.rows, self.cols = environment['dimensions']
-        self.start = environment['start']
-        self.goals = set(environment['goals'])
-        self.walls = parse_walls(environment['walls'])
-        self.moves = []
-
-    def run(self, callback) -> List[Tuple[int, int]]:
-        """Run BFS algorithm and return the path to the goal."""
-        q = queue.Queue()
-        q.put(self.start)
-        visited = set([self.start])
-        parent = {self.start: None}
-
-        while not q.empty():
-            current = q.get()
-            self.moves.append(current)
-
-            # Update UI and wait
-            callback(self.moves)
-            time.sleep(0.1)
-
-            if current in self.goals:
-                logger.info(f"Goal reached at {current}")
-                return reconstruct_path(parent, current)
-
-            for neighbor in get_neighbors(*current, self.rows, self.cols, self.walls):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    parent[neighbor] = current
-                    q.put(neighbor)
-
-        logger.warning("No path to goal found")
-        return []
+class BFS(SearchAlgorithm):
+    def steps(self) -> Iterator[Tuple[int, int]]:
+        """Run BFS algorithm, yielding each expanded cell, and store the path to the goal."""
+        if self.unsolvable():
+            return
+        grid = self.grid
+        start = grid.index(*self.start)
+        goals = set(grid.ids(self.goals))
+        q = deque([start])
+        self.frontier = q
+        # Full-map tables reused from the previous search; see SearchBuffers.
+        buffers = SearchBuffers.acquire(grid)
+        visited, parent = buffers.closed, buffers.parent
+        visited[start] = 1
+        expanded = []
+
+        try:
+            while q:
+                current = q.popleft()
+                expanded.append(current)
+                self.moves.append(grid.coords(current))
+
+                yield self.moves[-1]
+
+                if current in goals:
+                    logger.info("Goal reached at %s", grid.coords(current))
+                    self.path = grid.reconstruct_path(parent, current)
+                    return
+
+                for neighbor in grid.neighbors(current):
+                    if not visited[neighbor]:
+                        visited[neighbor] = 1
+                        parent[neighbor] = current
+                        q.append(neighbor)
+
+            logger.warning("No path to goal found")
+        finally:
+            buffers.release(expanded)
@@ -1,71 +1,135 @@
-import heapq
-from typing import List, Tuple, Dict, Set
-from src.utils.pathfinding_utils import get_neighbors, manhattan_distance, parse_walls
-
-class BidirectionalAStar:
-    def __init__(self, environment: Dict):
-        self.rows, self.cols = environment['dimensions']
-        self.start = environment['start']
-        self.goals = set(environment['goals'])
-        self.walls = parse_walls(environment['walls'])
-        self.moves = []
-
-    def heuristic(self, a: Tuple[int, int], b: Tuple[int, int]) -> int:
-        return manhattan_distance(a, b)
-
-    def search(self, start: Tuple[int, int], goals: Set[Tuple[int, int]], reverse: bool = False):
-        open_set = [(0, start)]
-        closed_set = set()
-        g_score = {start: 0}
-        f_score = {start: min(self.heuristic(start, goal) for goal in goals)}
-        parent = {start: None}
-
-        while open_set:
-            current_f, current = heapq.heappop(open_set)
-
-            if current in goals:
-                return current, parent, g_score
-
-            closed_set.add(current)
-
-            for neighbor in get_neighbors(*current, self.rows, self.cols, self.walls):
-                if neighbor in closed_set:
-                    continue
-
-                tentative_g_score = g_score[current] + 1
-
-                if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                    parent[neighbor] = current
-                    g_score[neighbor] = tentative_g_score
-                    f_score = g_score[neighbor] + min(self.heuristic(neighbor, goal) for goal in goals)
-                    heapq.heappush(open_set, (f_score, neighbor))
-
-        return None, parent, g_score
-
-    def run(self, callback=None) -> List[Tuple[int, int]]:
-        forward_goal, forward_parent, forward_g = self.search(self.start, self.goals)
-        backward_start, backward_parent, backward_g = self.search(list(self.goals)[0], {self.start}, reverse=True)
-
-        if forward_goal is None or backward_start is None:
-            return []
-
-        intersection = set(forward_g.keys()) & set(backward_g.keys())
-        if not intersection:
-            return []
-
-        meeting_point = min(intersection, key=lambda x: forward_g[x] + backward_g[x])
-
-        path = []
-        current = meeting_point
-        while current:
-            path.append(current)
-            current = forward_parent[current]
-        path = path[::-1]
-
-        current = backward_parent[meeting_point]
-        while current:
-            path.append(current)
-            current = backward_parent[current]
-
-        self.moves = path
+import logging
+import math
+from typing import Iterator, List, Tuple
+from src.algorithms.base import SearchAlgorithm
+from src.utils.grid import UNVISITED
+from src.utils.search_buffers import SearchBuffers
+
+logger = logging.getLogger(__name__)
+
+FORWARD, BACKWARD = 0, 1
+
+
+class BidirectionalAStar(SearchAlgorithm):
+    """
+    Bidirectional A* with front-to-end heuristics.
+
+    The forward search starts at the robot and is guided by the distance to
+    the nearest goal; the backward search is seeded with every goal at once
+    and guided by the distance to the start. Whenever a generated node
+    already has a cost from the other side, the combined cost is a candidate
+    path length mu. The search stops once the f-value at the top of either
+    frontier reaches mu, since no unexplored path can then be shorter.
+
+    Only one side has to push its top f up to mu, so each step goes to the
+    side expected to get there in fewer expansions: the f it still has to
+    climb times the expansions each unit of f has cost it so far. A side
+    whose heuristic leads it straight on keeps its f and stays cheap, while
+    a side trapped behind obstacles, where A* alone would flood a whole
+    region, has its turns handed to the other side. The backward search
+    visits neighbours in the opposite order, so that among equal f-values
+    both sides walk the same staircase towards each other instead of
+    passing side by side.
+    """
+
+    def steps(self) -> Iterator[Tuple[int, int]]:
+        """Run bidirectional A*, yielding each expanded cell, and store the path to the goal."""
+        if self.unsolvable():
+            return
+        grid = self.grid
+        start = grid.index(*self.start)
+        goals = grid.ids(self.goals)
+        # A goal inside a wall can only be reached by starting on it.
+        seeds = [goal for goal in goals if not grid.blocked[goal]]
+
+        def to_goal(cell: int) -> int:
+            return self.heuristic(grid.coords(cell))
+
+        def to_start(cell: int) -> int:
+            return self.start_heuristic(grid.coords(cell))
+
+        estimates = (to_goal, to_start)
+        # One set of full-map tables per side, reused from previous searches;
+        # see SearchBuffers.
+        buffers = (SearchBuffers.acquire(grid), SearchBuffers.acquire(grid))
+        open_sets = tuple(side.open_set for side in buffers)
+        closed_sets = tuple(side.closed for side in buffers)
+        g_scores = tuple(side.g_score for side in buffers)
+        parents = tuple(side.parent for side in buffers)
+
+        g_scores[FORWARD][start] = 0
+        open_sets[FORWARD].push(start, to_goal(start))
+        for goal in seeds:
+            g_scores[BACKWARD][goal] = 0
+            open_sets[BACKWARD].push(goal, to_start(goal))
+
+        best = 0 if start in goals else math.inf
+        meeting = start if start in goals else UNVISITED
+        initial = [open_set.peek()[0] if open_set else 0 for open_set in open_sets]
+        expanded = ([], [])
+
+        try:
+            while open_sets[FORWARD] and open_sets[BACKWARD]:
+                tops = (open_sets[FORWARD].peek()[0], open_sets[BACKWARD].peek()[0])
+                if max(tops) >= best:
+                    break
+
+                side = self.pick_side(tops, initial, [len(cells) for cells in expanded], best)
+                open_set, closed_set = open_sets[side], closed_sets[side]
+                g_score, parent, estimate = g_scores[side], parents[side], estimates[side]
+                other_g_score = g_scores[1 - side]
+                self.frontier = open_set
+
+                current = open_set.pop()
+                closed_set[current] = 1
+                expanded[side].append(current)
+                self.moves.append(grid.coords(current))
+
+                yield self.moves[-1]
+
+                neighbors = grid.neighbors(current)
+                for neighbor in (neighbors if side == FORWARD else reversed(neighbors)):
+                    if closed_set[neighbor]:
+                        continue
+
+                    tentative_g_score = g_score[current] + 1
+
+                    if g_score[neighbor] == UNVISITED or tentative_g_score < g_score[neighbor]:
+                        parent[neighbor] = current
+                        g_score[neighbor] = tentative_g_score
+                        open_set.update(neighbor, tentative_g_score + estimate(neighbor))
+                        if other_g_score[neighbor] != UNVISITED and \
+                                tentative_g_score + other_g_score[neighbor] < best:
+                            best = tentative_g_score + other_g_score[neighbor]
+                            meeting = neighbor
+
+            if meeting == UNVISITED:
+                logger.warning("No path to goal found")
+                return
+
+            self.path = self.join_paths(parents, meeting)
+            logger.info("Goal reached at %s", self.path[-1])
+        finally:
+            buffers[FORWARD].release(expanded[FORWARD], [start])
+            buffers[BACKWARD].release(expanded[BACKWARD], seeds)
+
+    @staticmethod
+    def pick_side(tops, initial, expanded, best) -> int:
+        """
+        Return the side expected to raise its top f to the bound in fewer
+        expansions. Until a path is known the bound is just past the higher
+        top f. On a 4-connected grid f moves in steps of 2, hence the +2.
+        """
+        target = best if best != math.inf else max(tops) + 2
+        work = [(target - tops[side]) * (expanded[side] + 1) / (tops[side] - initial[side] + 2)
+                for side in (FORWARD, BACKWARD)]
+        return FORWARD if work[FORWARD] <= work[BACKWARD] else BACKWARD
+
+    def join_paths(self, parents, meeting: int) -> List[Tuple[int, int]]:
+        """Start-to-meeting path from the forward tree, then meeting-to-goal from the backward tree."""
+        path = self.grid.reconstruct_path(parents[FORWARD], meeting)
+        current = parents[BACKWARD][meeting]
+        while current != UNVISITED:
+            path.append(self.grid.coords(current))
+            current = parents[BACKWARD][current]
         return path
@@ -1,43 +1,45 @@
-import time
 import logging
-from typing import List, Tuple, Dict, Set
-from src.utils.pathfinding_utils import get_neighbors, reconstruct_path, parse_walls
+from typing import Iterator, Tuple
+from src.algorithms.base import SearchAlgorithm
+from src.utils.search_buffers import SearchBuffers
 
 logger = logging.getLogger(__name__)
 
 
-class DFS:
-    def __init__(self, environment: Dict):
-        self.rows, self.cols = environment['dimensions']
-        self.start = environment['start']
-        self.goals = set(environment['goals'])
-        self.walls = parse_walls(environment['walls'])
-        self.moves = []
-
-    def run(self, callback) -> List[Tuple[int, int]]:
-        """Run DFS algorithm and return the path to the goal."""
-        stack = [self.start]
-        visited = set()
-        parent = {self.start: None}
-
-        while stack:
-            current = stack.pop()
-            if current not in visited:
-                visited.add(current)
-                self.moves.append(current)
-
-                # Update UI and wait
-                callback(self.moves)
-                time.sleep(0.1)
-
-                if current in self.goals:
-                    logger.info(f"Goal reached at {current}")
-                    return reconstruct_path(parent, current)
-
-                for neighbor in get_neighbors(*current, self.rows, self.cols, self.walls):
-                    if neighbor not in visited:
-                        stack.append(neighbor)
-                        parent[neighbor] = current
-
-        logger.warning("No path to goal found")
-        return []
+class DFS(SearchAlgorithm):
+    def steps(self) -> Iterator[Tuple[int, int]]:
+        """Run DFS algorithm, yielding each expanded cell, and store the path to the goal."""
+        if self.unsolvable():
+            return
+        grid = self.grid
+        goals = set(grid.ids(self.goals))
+        stack = [grid.index(*self.start)]
+        self.frontier = stack
+        # Full-map tables reused from the previous search; see SearchBuffers.
+        buffers = SearchBuffers.acquire(grid)
+        visited, parent = buffers.closed, buffers.parent
+        expanded = []
+
+        try:
+            while stack:
+                current = stack.pop()
+                if not visited[current]:
+                    visited[current] = 1
+                    expanded.append(current)
+                    self.moves.append(grid.coords(current))
+
+                    yield self.moves[-1]
+
+                    if current in goals:
+                        logger.info("Goal reached at %s", grid.coords(current))
+                        self.path = grid.reconstruct_path(parent, current)
+                        return
+
+                    for neighbor in grid.neighbors(current):
+                        if not visited[neighbor]:
+                            stack.append(neighbor)
+                            parent[neighbor] = current
+
+            logger.warning("No path to goal found")
+        finally:
+            buffers.release(expanded)
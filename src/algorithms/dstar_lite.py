@@ -0,0 +1,156 @@
+import logging
+from typing import Dict, Iterable, Iterator, List, Tuple
+from src.algorithms.base import SearchAlgorithm
+from src.utils.frontier import IndexedHeap
+from src.utils.grid import UNVISITED
+
+logger = logging.getLogger(__name__)
+
+INFINITY = 2 ** 31 - 1
+
+
+class DStarLite(SearchAlgorithm):
+    """
+    D* Lite: an incremental planner that keeps its search state between plans.
+
+    The search runs backwards from every goal (each seeded with rhs = 0)
+    towards the robot, so when the robot moves or walls change only the
+    cells whose distance-to-goal is affected are re-expanded. The planner
+    works on a private copy of the grid; use add_walls, remove_walls and
+    move_start to report changes, then call replan(). Stepping onto a cell
+    costs 1 if it is open; a start inside a wall can still step out of it,
+    like in the other engines.
+    """
+
+    def __init__(self, environment: Dict):
+        super().__init__(environment)
+        # Wall changes stay private to the planner, not the shared environment grid.
+        self.grid = self.grid.copy()
+        grid = self.grid
+        self.start_id = grid.index(*self.start) if grid.in_bounds(*self.start) else UNVISITED
+        self.goal_ids = set(grid.ids(self.goals))
+        self.g = grid.new_cost_array(INFINITY)
+        self.rhs = grid.new_cost_array(INFINITY)
+        self.open_set = IndexedHeap(grid.size)
+        self.frontier = self.open_set
+        self.key_modifier = 0
+        for goal in self.goal_ids:
+            self.rhs[goal] = 0
+            self.open_set.push(goal, self.calculate_key(goal))
+
+    def distance_from_start(self, cell: int) -> int:
+        return self.start_heuristic(self.grid.coords(cell))
+
+    def calculate_key(self, cell: int) -> Tuple[int, int]:
+        best = min(self.g[cell], self.rhs[cell])
+        return best + self.distance_from_start(cell) + self.key_modifier, best
+
+    def update_vertex(self, cell: int) -> None:
+        grid, g, rhs = self.grid, self.g, self.rhs
+        if cell not in self.goal_ids:
+            if grid.blocked[cell] and cell != self.start_id:
+                rhs[cell] = INFINITY
+            else:
+                best = min((g[neighbor] for neighbor in grid.neighbors(cell)), default=INFINITY)
+                rhs[cell] = best + 1 if best < INFINITY else INFINITY
+        if cell in self.open_set:
+            self.open_set.remove(cell)
+        if g[cell] != rhs[cell]:
+            self.open_set.push(cell, self.calculate_key(cell))
+
+    def predecessors(self, cell: int) -> List[int]:
+        """Cells that can step onto cell; walls only matter as the start."""
+        grid = self.grid
+        if grid.blocked[cell]:
+            return []
+        return [cell + offset for offset in grid.offsets
+                if not grid.blocked[cell + offset] or cell + offset == self.start_id]
+
+    def compute_shortest_path(self) -> Iterator[Tuple[int, int]]:
+        open_set, g, rhs = self.open_set, self.g, self.rhs
+        start = self.start_id
+        while open_set and (open_set.peek()[0] < self.calculate_key(start) or rhs[start] != g[start]):
+            old_key, current = open_set.pop_with_priority()
+            new_key = self.calculate_key(current)
+            if old_key < new_key:
+                open_set.push(current, new_key)
+                continue
+
+            self.moves.append(self.grid.coords(current))
+
+            yield self.moves[-1]
+
+            if g[current] > rhs[current]:
+                g[current] = rhs[current]
+            else:
+                g[current] = INFINITY
+                self.update_vertex(current)
+            for predecessor in self.predecessors(current):
+                self.update_vertex(predecessor)
+
+    def extract_path(self) -> List[Tuple[int, int]]:
+        """Follow the steepest descent of g from the start to a goal."""
+        grid, g = self.grid, self.g
+        current = self.start_id
+        if g[current] == INFINITY:
+            return []
+        path = [grid.coords(current)]
+        while current not in self.goal_ids:
+            current = min(grid.neighbors(current), key=g.__getitem__)
+            path.append(grid.coords(current))
+        return path
+
+    def steps(self) -> Iterator[Tuple[int, int]]:
+        """Plan or repair the plan, yielding each expanded cell, and store the path to the goal."""
+        self.moves.clear()
+        if self.unsolvable():
+            self.path = []
+            return
+        yield from self.compute_shortest_path()
+        self.path = self.extract_path()
+        if self.path:
+            logger.info("Goal reached at %s", self.path[-1])
+        else:
+            logger.warning("No path to goal found")
+
+    def replan(self) -> List[Tuple[int, int]]:
+        """Repair the plan after the reported changes and return the new path."""
+        return self.run()
+
+    def _set_walls(self, walls: Iterable[Iterable[int]], value: int) -> None:
+        grid = self.grid
+        changed = []
+        for x, y, width, height in walls:
+            for column in range(max(x, 0), min(x + width, grid.cols)):
+                for row in range(max(y, 0), min(y + height, grid.rows)):
+                    cell = grid.index(column, row)
+                    if grid.blocked[cell] != value:
+                        grid.blocked[cell] = value
+                        changed.append(cell)
+        if changed:
+            grid.mark_changed()
+        for cell in changed:
+            self.update_vertex(cell)
+            for offset in grid.offsets:
+                self.update_vertex(cell + offset)
+        logger.info("%s cells changed", len(changed))
+
+    def add_walls(self, walls: Iterable[Iterable[int]]) -> None:
+        """Block every (x, y, width, height) rectangle; takes effect on the next replan()."""
+        self._set_walls(walls, 1)
+
+    def remove_walls(self, walls: Iterable[Iterable[int]]) -> None:
+        """Clear every (x, y, width, height) rectangle; takes effect on the next replan()."""
+        self._set_walls(walls, 0)
+
+    def move_start(self, position: Tuple[int, int]) -> None:
+        """Move the robot to position; takes effect on the next replan()."""
+        grid = self.grid
+        previous = self.start_id
+        self.key_modifier += abs(position[0] - self.start[0]) + abs(position[1] - self.start[1])
+        self.start = position
+        self.start_id = grid.index(*position) if grid.in_bounds(*position) else UNVISITED
+        # Only a start may step out of a wall, so both cells may change their rhs.
+        for cell in (previous, self.start_id):
+            if cell != UNVISITED:
+                self.update_vertex(cell)
@@ -0,0 +1,144 @@
+import heapq
+import logging
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.algorithms.base import SearchAlgorithm
+from src.utils.grid import UNVISITED
+
+logger = logging.getLogger(__name__)
+
+# A cut-off branch waiting for a larger bound: (cell, parent, depth)
+Deferred = Tuple[int, int, int]
+
+
+class DeferredBranches:
+    """
+    Branches cut off by the bound, bucketed by the bound they need, with the
+    bounds on a heap. Its length is the number of branches waiting, so it
+    is what the search reports as its frontier.
+    """
+
+    def __init__(self):
+        self.buckets: Dict[int, List[Deferred]] = {}
+        self.bounds: List[int] = []
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    def push(self, bound: int, branch: Deferred) -> None:
+        bucket = self.buckets.get(bound)
+        if bucket is None:
+            bucket = self.buckets[bound] = []
+            heapq.heappush(self.bounds, bound)
+        bucket.append(branch)
+        self.size += 1
+
+    def pop_bucket(self) -> Tuple[int, List[Deferred]]:
+        """Remove and return the smallest bound and the branches waiting for it."""
+        bound = heapq.heappop(self.bounds)
+        bucket = self.buckets.pop(bound)
+        self.size -= len(bucket)
+        return bound, bucket
+
+
+class FringeSearch(SearchAlgorithm):
+    """
+    Fringe search: IDA* that resumes each iteration from the branches the
+    previous one cut off instead of restarting at the start.
+
+    Every iteration is a depth-first pass bounded by depth + Manhattan
+    distance to the nearest goal. Branches beyond the bound are kept in
+    DeferredBranches, and the next iteration starts from those waiting for
+    the smallest bound. Everything inside the previous bound is already
+    expanded at its shallowest depth, so it is not walked again: with the
+    consistent heuristic no cell is expanded twice, and the search costs
+    about as many expansions as A*. The price is memory: the depth and
+    parent tables hold every cell reached, like A*'s. It ends when no
+    branch is left, which is how unreachable goals are detected.
+    """
+
+    def __init__(self, environment: Dict):
+        super().__init__(environment)
+        self.start_id = self.grid.index(*self.start) if self.grid.in_bounds(*self.start) else UNVISITED
+
+    def estimate(self, cell: int) -> int:
+        return self.heuristic(self.grid.coords(cell))
+
+    def iteration(self, bound: int, roots: List[Deferred], goals, depth_at: Dict[int, int],
+                  parent: Dict[int, int], deferred: DeferredBranches):
+        """
+        Run one bounded depth-first pass from the branches cut off at this
+        bound, deferring the ones beyond it; returns the goal id or None.
+        """
+        neighbors_of = self.grid.neighbors
+        estimate = self.estimate
+        for cell, previous, depth in roots:
+            known = depth_at.get(cell)
+            if known is not None and known <= depth:
+                continue
+            parent[cell] = previous
+            yield self.record(cell, depth, depth_at)
+            if cell in goals:
+                return cell
+
+            stack = [(cell, depth, iter(neighbors_of(cell)))]
+            while stack:
+                node, depth, neighbors = stack[-1]
+                next_depth = depth + 1
+                for neighbor in neighbors:
+                    known = depth_at.get(neighbor)
+                    if known is not None and known <= next_depth:
+                        continue
+                    f = next_depth + estimate(neighbor)
+                    if f > bound:
+                        deferred.push(f, (neighbor, node, next_depth))
+                        continue
+
+                    parent[neighbor] = node
+                    yield self.record(neighbor, next_depth, depth_at)
+                    if neighbor in goals:
+                        return neighbor
+                    stack.append((neighbor, next_depth, iter(neighbors_of(neighbor))))
+                    break
+                else:
+                    stack.pop()
+        return None
+
+    def record(self, cell: int, depth: int, depth_at: Dict[int, int]) -> Tuple[int, int]:
+        coords = self.grid.coords(cell)
+        if cell not in depth_at:
+            self.moves.append(coords)
+        depth_at[cell] = depth
+        return coords
+
+    def steps(self) -> Iterator[Tuple[int, int]]:
+        """Run fringe search, yielding each expanded cell, and store the path to the goal."""
+        if self.unsolvable():
+            return
+        grid = self.grid
+        goals = set(grid.ids(self.goals))
+        depth_at: Dict[int, int] = {}
+        parent: Dict[int, int] = {}
+        deferred = DeferredBranches()
+        self.frontier = deferred
+        deferred.push(self.estimate(self.start_id), (self.start_id, UNVISITED, 0))
+
+        goal: Optional[int] = None
+        iterations = 0
+        while deferred and goal is None:
+            bound, roots = deferred.pop_bucket()
+            iterations += 1
+            goal = yield from self.iteration(bound, roots, goals, depth_at, parent, deferred)
+
+        if goal is None:
+            logger.warning("No path to goal found")
+            return
+        logger.info("Goal reached at %s after %s iterations", grid.coords(goal), iterations)
+        path = []
+        while goal != UNVISITED:
+            path.append(grid.coords(goal))
+            goal = parent[goal]
+        self.path = path[::-1]
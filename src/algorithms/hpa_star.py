@@ -0,0 +1,380 @@
+import heapq
+import logging
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from src.algorithms.base import SearchAlgorithm
+from src.utils.grid import Grid, UNVISITED
+
+logger = logging.getLogger(__name__)
+
+CLUSTER_SIZE = 32
+# Border segments at least this long get a transition at each end instead of one in the middle.
+LONG_ENTRANCE = 6
+# Abstract graphs kept in memory, most recently used last.
+CACHE_SIZE = 4
+# A cached graph of the same size is patched only when at most this share of its clusters changed.
+PATCH_FRACTION = 0.25
+
+Cluster = Tuple[int, int]
+Border = Tuple[Cluster, Cluster]
+# A cluster's occupancy copied into its own small Grid, plus the map
+# coordinates of the cluster's top-left cell.
+Window = Tuple[Grid, int, int]
+
+_graphs: 'OrderedDict[Tuple[bytes, int], AbstractGraph]' = OrderedDict()
+
+
+def abstract_graph(grid: Grid, cluster_size: int = CLUSTER_SIZE) -> 'AbstractGraph':
+    """
+    Return the abstract graph for grid, from the cache when this exact map
+    was seen before. Otherwise, if the most recently used graph with the
+    same dimensions differs in at most PATCH_FRACTION of its clusters, a
+    copy of it is patched, so only those clusters are rebuilt; the old
+    graph stays cached for its own map. Failing both, a new graph is built.
+    """
+    key = (grid.fingerprint(), cluster_size)
+    graph = _graphs.get(key)
+    if graph is not None:
+        _graphs.move_to_end(key)
+        return graph
+
+    for candidate in reversed(_graphs.values()):
+        if candidate.matches(grid, cluster_size):
+            changed = candidate.changed_clusters(grid)
+            if len(changed) <= PATCH_FRACTION * candidate.clusters_x * candidate.clusters_y:
+                graph = candidate.copy()
+                graph.update(grid, changed)
+                logger.info("Abstract graph patched: %s clusters rebuilt", len(changed))
+            break
+    if graph is None:
+        graph = AbstractGraph(grid, cluster_size)
+        logger.info("Abstract graph built: %s nodes", len(graph.edges))
+
+    _graphs[key] = graph
+    while len(_graphs) > CACHE_SIZE:
+        _graphs.popitem(last=False)
+    return graph
+
+
+class AbstractGraph:
+    """
+    Cluster-level graph of a grid for hierarchical pathfinding.
+
+    The map is split into square clusters. Wherever two neighboring clusters
+    share a run of open cells along their border, one or two transitions are
+    placed on it, each a pair of adjacent cells joined by a unit-cost edge.
+    Inside every cluster, the transition cells are joined by edges weighted
+    with their true in-cluster distance. Transitions are kept per border, so
+    a wall change only rebuilds the borders and the intra-cluster edges of
+    the clusters it touches.
+    """
+
+    def __init__(self, grid: Grid, cluster_size: int = CLUSTER_SIZE):
+        self.rows, self.cols = grid.rows, grid.cols
+        self.stride = grid.stride
+        self.cluster_size = cluster_size
+        self.clusters_x = -(-self.cols // cluster_size)
+        self.clusters_y = -(-self.rows // cluster_size)
+        self.edges: Dict[int, Dict[int, int]] = {}
+        self.borders: Dict[Border, List[Tuple[int, int]]] = {}
+        self.nodes: Dict[Cluster, Set[int]] = {}
+        self.snapshot = b''
+        self.update(grid)
+
+    def matches(self, grid: Grid, cluster_size: int) -> bool:
+        return (grid.rows, grid.cols, cluster_size) == (self.rows, self.cols, self.cluster_size)
+
+    def cluster_of(self, cell: int) -> Cluster:
+        x, y = divmod(cell, self.stride)
+        return (x - 1) // self.cluster_size, (y - 1) // self.cluster_size
+
+    def bounds(self, cluster: Cluster) -> Tuple[int, int, int, int]:
+        """Return x0, y0, x1, y1 of a cluster, exclusive at the far end."""
+        size = self.cluster_size
+        x0, y0 = cluster[0] * size, cluster[1] * size
+        return x0, y0, min(x0 + size, self.cols), min(y0 + size, self.rows)
+
+    def window(self, grid: Grid, cluster: Cluster) -> Window:
+        x0, y0, x1, y1 = self.bounds(cluster)
+        local = Grid(y1 - y0, x1 - x0)
+        height = y1 - y0
+        for x in range(x0, x1):
+            source = grid.index(x, y0)
+            target = local.index(x - x0, 0)
+            local.blocked[target:target + height] = grid.blocked[source:source + height]
+        return local, x0, y0
+
+    def changed_clusters(self, grid: Grid) -> Set[Cluster]:
+        """Clusters whose cells differ from the snapshot taken at the last update."""
+        if not self.snapshot:
+            return {(cx, cy) for cx in range(self.clusters_x) for cy in range(self.clusters_y)}
+        changed = set()
+        size, blocked, snapshot = self.cluster_size, grid.blocked, self.snapshot
+        for x in range(self.cols):
+            first = grid.index(x, 0)
+            if blocked[first:first + self.rows] == snapshot[first:first + self.rows]:
+                continue
+            for cy in range(self.clusters_y):
+                low = first + cy * size
+                high = first + min((cy + 1) * size, self.rows)
+                if blocked[low:high] != snapshot[low:high]:
+                    changed.add((x // size, cy))
+        return changed
+
+    def copy(self) -> 'AbstractGraph':
+        """A copy that can be patched without touching this graph."""
+        graph = AbstractGraph.__new__(AbstractGraph)
+        graph.__dict__.update(self.__dict__)
+        graph.edges = {node: dict(links) for node, links in self.edges.items()}
+        graph.borders = dict(self.borders)
+        graph.nodes = dict(self.nodes)
+        return graph
+
+    def update(self, grid: Grid, changed: Optional[Set[Cluster]] = None) -> int:
+        """
+        Bring the graph in line with grid; returns the number of clusters
+        rebuilt. changed may pass in the result of changed_clusters(grid).
+        """
+        if changed is None:
+            changed = self.changed_clusters(grid)
+        if changed:
+            self.rebuild(grid, changed)
+        self.snapshot = bytes(grid.blocked)
+        return len(changed)
+
+    def cluster_borders(self, cluster: Cluster) -> List[Border]:
+        cx, cy = cluster
+        borders = []
+        if cx > 0:
+            borders.append(((cx - 1, cy), cluster))
+        if cx + 1 < self.clusters_x:
+            borders.append((cluster, (cx + 1, cy)))
+        if cy > 0:
+            borders.append(((cx, cy - 1), cluster))
+        if cy + 1 < self.clusters_y:
+            borders.append((cluster, (cx, cy + 1)))
+        return borders
+
+    def transitions(self, grid: Grid, border: Border) -> List[Tuple[int, int]]:
+        """Find the open runs along a border and place transitions on them."""
+        first, second = border
+        x0, y0, x1, y1 = self.bounds(first)
+        if second[0] != first[0]:
+            # Vertical border: column x1 - 1 faces column x1.
+            pairs = [(grid.index(x1 - 1, y), grid.index(x1, y)) for y in range(y0, y1)]
+        else:
+            # Horizontal border: row y1 - 1 faces row y1.
+            pairs = [(grid.index(x, y1 - 1), grid.index(x, y1)) for x in range(x0, x1)]
+
+        blocked = grid.blocked
+        result = []
+        run: List[Tuple[int, int]] = []
+        for pair in pairs + [None]:
+            if pair is not None and not blocked[pair[0]] and not blocked[pair[1]]:
+                run.append(pair)
+                continue
+            if len(run) >= LONG_ENTRANCE:
+                result.extend((run[0], run[-1]))
+            elif run:
+                result.append(run[len(run) // 2])
+            run = []
+        return result
+
+    def rebuild(self, grid: Grid, changed: Set[Cluster]) -> None:
+        edges = self.edges
+        redo = {border for cluster in changed for border in self.cluster_borders(cluster)}
+        for border in redo:
+            for a, b in self.borders.get(border, ()):
+                edges[a].pop(b, None)
+                edges[b].pop(a, None)
+            self.borders[border] = self.transitions(grid, border)
+            for a, b in self.borders[border]:
+                edges.setdefault(a, {})[b] = 1
+                edges.setdefault(b, {})[a] = 1
+
+        affected = {cluster for border in redo for cluster in border}
+        for cluster in affected:
+            # Drop the old intra-cluster edges but keep the transition edges.
+            for node in self.nodes.get(cluster, ()):
+                links = edges.get(node)
+                if links is None:
+                    continue
+                for other in [other for other in links if self.cluster_of(other) == cluster]:
+                    del links[other]
+                if not links:
+                    del edges[node]
+
+            nodes = {cell for border in self.cluster_borders(cluster)
+                     for pair in self.borders.get(border, ()) for cell in pair
+                     if self.cluster_of(cell) == cluster}
+            self.nodes[cluster] = nodes
+            self.link_cluster(grid, cluster, nodes)
+
+    def link_cluster(self, grid: Grid, cluster: Cluster, nodes: Set[int]) -> None:
+        """Join every pair of transition cells in a cluster by their in-cluster distance."""
+        window = self.window(grid, cluster)
+        ordered = sorted(nodes)
+        for i, node in enumerate(ordered):
+            targets = ordered[i + 1:]
+            if not targets:
+                break
+            for other, distance in self.distances(window, grid, node, targets).items():
+                self.edges[node][other] = distance
+                self.edges[other][node] = distance
+
+    def search_window(self, window: Window, grid: Grid, source: int, targets: Iterable[int]):
+        """Breadth-first search inside a cluster; returns local parent and distance tables and the local ids of targets."""
+        local, x0, y0 = window
+        to_local = {}
+        for target in targets:
+            x, y = grid.coords(target)
+            to_local[local.index(x - x0, y - y0)] = target
+        x, y = grid.coords(source)
+        start = local.index(x - x0, y - y0)
+
+        distance = local.new_cost_array()
+        parent = local.new_parent_array()
+        distance[start] = 0
+        remaining = len(to_local) - (start in to_local)
+        blocked, offsets = local.blocked, local.offsets
+        queue = deque([start])
+        while queue and remaining:
+            current = queue.popleft()
+            next_distance = distance[current] + 1
+            for offset in offsets:
+                neighbor = current + offset
+                if distance[neighbor] == UNVISITED and not blocked[neighbor]:
+                    distance[neighbor] = next_distance
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+                    if neighbor in to_local:
+                        remaining -= 1
+        return parent, distance, to_local
+
+    def distances(self, window: Window, grid: Grid, source: int, targets: Iterable[int]) -> Dict[int, int]:
+        """In-cluster distances from source to each reachable target."""
+        _, distance, to_local = self.search_window(window, grid, source, targets)
+        return {target: distance[cell] for cell, target in to_local.items()
+                if distance[cell] != UNVISITED}
+
+    def connect(self, grid: Grid, start: int, goals: Set[int]) -> Dict[int, Dict[int, int]]:
+        """
+        Temporary edges for one query: from the start to the transitions of
+        its cluster, and from the transitions of every goal's cluster to that
+        goal. The cached graph itself is left untouched.
+        """
+        links: Dict[int, Dict[int, int]] = {}
+        windows: Dict[Cluster, Window] = {}
+        sources = [start]
+        if grid.blocked[start]:
+            # A start inside a wall can only step straight out of it, possibly
+            # into another cluster, so search from its open neighbors instead.
+            sources = grid.neighbors(start)
+            links[start] = {source: 1 for source in sources}
+        for source in sources:
+            cluster = self.cluster_of(source)
+            if cluster not in windows:
+                windows[cluster] = self.window(grid, cluster)
+            targets = self.nodes.get(cluster, set()) | \
+                {goal for goal in goals if self.cluster_of(goal) == cluster}
+            links.setdefault(source, {}).update(
+                self.distances(windows[cluster], grid, source, targets))
+
+        for goal in goals:
+            cluster = self.cluster_of(goal)
+            if cluster not in windows:
+                windows[cluster] = self.window(grid, cluster)
+            nodes = self.nodes.get(cluster, ())
+            for node, distance in self.distances(windows[cluster], grid, goal, nodes).items():
+                links.setdefault(node, {})[goal] = distance
+        return links
+
+    def refine(self, grid: Grid, abstract_path: List[int]) -> List[Tuple[int, int]]:
+        """Expand an abstract path into grid cells, searching only the clusters it crosses."""
+        path = [grid.coords(abstract_path[0])]
+        windows: Dict[Cluster, Window] = {}
+        for a, b in zip(abstract_path, abstract_path[1:]):
+            cluster = self.cluster_of(a)
+            if cluster != self.cluster_of(b):
+                path.append(grid.coords(b))
+                continue
+            if cluster not in windows:
+                windows[cluster] = self.window(grid, cluster)
+            window = windows[cluster]
+            local, x0, y0 = window
+            parent, _, to_local = self.search_window(window, grid, a, [b])
+            segment = local.reconstruct_path(parent, next(iter(to_local)))
+            path.extend((x + x0, y + y0) for x, y in segment[1:])
+        return path
+
+
+class HPAStar(SearchAlgorithm):
+    """
+    Hierarchical A*: search the cached abstract graph of the map, then
+    refine the abstract path cluster by cluster.
+
+    Only the start's and the goals' clusters are searched at cell level
+    before the abstract search, so a query costs a few cluster-sized
+    searches plus a search over transition nodes. Paths are near-optimal:
+    routes are restricted to pass through transition cells. The expanded
+    cells reported in moves are abstract nodes.
+    """
+
+    cluster_size = CLUSTER_SIZE
+
+    def steps(self) -> Iterator[Tuple[int, int]]:
+        """Run HPA*, yielding each expanded abstract node, and store the path to the goal."""
+        if self.unsolvable():
+            return
+        grid = self.grid
+        start = grid.index(*self.start)
+        goals = {goal for goal in grid.ids(self.goals)
+                 if goal == start or not grid.blocked[goal]}
+        if start in goals:
+            self.moves.append(self.start)
+            yield self.moves[-1]
+            self.path = [self.start]
+            return
+
+        with self.phase('abstract_graph'):
+            graph = abstract_graph(grid, self.cluster_size)
+        with self.phase('connect'):
+            links = graph.connect(grid, start, goals)
+        edges = graph.edges
+
+        open_set = [(self.heuristic(self.start), start)]
+        self.frontier = open_set
+        g_score = {start: 0}
+        parent = {start: UNVISITED}
+        closed_set = set()
+
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current in closed_set:
+                continue
+            closed_set.add(current)
+            self.moves.append(grid.coords(current))
+
+            yield self.moves[-1]
+
+            if current in goals:
+                logger.info("Goal reached at %s", grid.coords(current))
+                abstract_path = [current]
+                while parent[abstract_path[-1]] != UNVISITED:
+                    abstract_path.append(parent[abstract_path[-1]])
+                with self.phase('refine'):
+                    self.path = graph.refine(grid, abstract_path[::-1])
+                return
+
+            for neighbors in (edges.get(current, {}), links.get(current, {})):
+                for neighbor, cost in neighbors.items():
+                    if neighbor in closed_set:
+                        continue
+                    tentative_g_score = g_score[current] + cost
+                    if tentative_g_score < g_score.get(neighbor, tentative_g_score + 1):
+                        g_score[neighbor] = tentative_g_score
+                        parent[neighbor] = current
+                        f_score = tentative_g_score + self.heuristic(grid.coords(neighbor))
+                        heapq.heappush(open_set, (f_score, neighbor))
+
+        logger.warning("No path to goal found")
@@ -1,49 +1,144 @@
-import time
 import logging
-from typing import List, Tuple, Dict, Set
-from src.utils.pathfinding_utils import get_neighbors, reconstruct_path, parse_walls
+import math
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.algorithms.base import SearchAlgorithm
+from src.utils.grid import UNVISITED
 
 logger = logging.getLogger(__name__)
 
+# Cells the transposition table may hold; it bounds the search's memory.
+TABLE_LIMIT = 1 << 18
+
+
+class IDDFS(SearchAlgorithm):
+    """
+    Iterative deepening depth-first search with an explicit stack.
+
+    Each iteration is a depth-first search that prunes cells whose depth
+    plus `estimate` exceeds the bound; the next iteration raises the bound
+    to the smallest value pruned. The search ends when a goal is entered,
+    or when an iteration prunes nothing, which is how unreachable goals are
+    detected. The stack holds only the current path, and that path is the
+    result, so no parent table is kept.
+
+    A transposition table keeps the shallowest depth at which each cell has
+    been entered, and the iteration that last entered it. A cell reached
+    deeper than its recorded depth is skipped, and one reached at that depth
+    is entered once per iteration; since estimates are consistent, the
+    recorded depth is the true distance once an iteration has covered it,
+    so each iteration walks the cells inside its bound about once. A cell
+    entered again at a strictly smaller depth is counted in `reentries`.
+    The table holds at most TABLE_LIMIT cells; cells beyond that are only
+    checked against the current path, so the search's memory is
+    O(depth + TABLE_LIMIT) whatever the map size, at the cost of repeated
+    work once a search outgrows the table.
+
+    `moves` records the first expansion of each cell (every expansion of a
+    cell that did not fit in the table); every expansion is still yielded.
+    """
 
-class IDDFS:
     def __init__(self, environment: Dict):
-        self.rows, self.cols = environment['dimensions']
-        self.start = environment['start']
-        self.goals = set(environment['goals'])
-        self.walls = parse_walls(environment['walls'])
-        self.moves = []
-
-    def dfs(self, node, depth, parent, callback):
-        self.moves.append(node)
-        callback(self.moves)
-        time.sleep(0.1)
-
-        if node in self.goals:
-            return node
-
-        if depth <= 0:
-            return None
-
-        for neighbor in get_neighbors(*node, self.rows, self.cols, self.walls):
-            if neighbor not in parent:
-                parent[neighbor] = node
-                result = self.dfs(neighbor, depth - 1, parent, callback)
-                if result is not None:
-                    return result
-
-        return None
-
-    def run(self, callback) -> List[Tuple[int, int]]:
-        """Run IDDFS algorithm and return the path to the goal."""
-        max_depth = self.rows * self.cols  # Maximum possible path length
-
-        for depth in range(max_depth):
-            parent = {self.start: None}
-            result = self.dfs(self.start, depth, parent, callback)
-            if result is not None:
-                logger.info(f"Goal reached at {result}")
-                return reconstruct_path(parent, result)
-
-        logger.warning("No path to goal found")
-        return []
+        super().__init__(environment)
+        self.start_id = self.grid.index(*self.start) if self.grid.in_bounds(*self.start) else UNVISITED
+        # Entries into a cell at a smaller depth than it was already entered at in the same iteration
+        self.reentries = 0
+
+    def estimate(self, cell: int) -> int:
+        """Lower bound added to the depth when pruning; plain IDDFS bounds the depth alone."""
+        return 0
+
+    def iteration(self, bound: int, number: int, goals, depth_at: Dict[int, int], entered: Dict[int, int]):
+        """
+        Run one bounded depth-first pass; returns (path of cell ids to a goal
+        or None, smallest pruned bound).
+        """
+        neighbors_of = self.grid.neighbors
+        estimate = self.estimate
+        next_bound = math.inf
+
+        start = self.start_id
+        if estimate(start) > bound:
+            return None, estimate(start)
+        yield self.enter(start, 0, number, depth_at, entered)
+        if start in goals:
+            return [start], next_bound
+        on_path = {start}
+        stack = [(start, iter(neighbors_of(start)))]
+        self.frontier = stack
+
+        while stack:
+            node, neighbors = stack[-1]
+            next_depth = len(stack)
+            for neighbor in neighbors:
+                known = depth_at.get(neighbor)
+                if known is not None:
+                    if known < next_depth or (known == next_depth and entered[neighbor] == number):
+                        continue
+                elif neighbor in on_path:
+                    continue
+                f = next_depth + estimate(neighbor)
+                if f > bound:
+                    if f < next_bound:
+                        next_bound = f
+                    continue
+
+                on_path.add(neighbor)
+                stack.append((neighbor, iter(neighbors_of(neighbor))))
+                yield self.enter(neighbor, next_depth, number, depth_at, entered)
+                if neighbor in goals:
+                    return [cell for cell, _ in stack], next_bound
+                break
+            else:
+                on_path.discard(node)
+                stack.pop()
+
+        return None, next_bound
+
+    def enter(self, cell: int, depth: int, number: int, depth_at: Dict[int, int],
+              entered: Dict[int, int]) -> Tuple[int, int]:
+        coords = self.grid.coords(cell)
+        if cell in depth_at:
+            if entered[cell] == number:
+                self.reentries += 1
+        elif len(depth_at) < TABLE_LIMIT:
+            self.moves.append(coords)
+        else:
+            self.moves.append(coords)
+            return coords
+        depth_at[cell] = depth
+        entered[cell] = number
+        return coords
+
+    def steps(self) -> Iterator[Tuple[int, int]]:
+        """Run IDDFS algorithm, yielding each expanded cell, and store the path to the goal."""
+        if self.unsolvable():
+            return
+        grid = self.grid
+        goals = set(grid.ids(self.goals))
+        depth_at: Dict[int, int] = {}
+        entered: Dict[int, int] = {}
+        bound = self.estimate(self.start_id)
+
+        path: Optional[List[int]] = None
+        iterations = 0
+        while path is None and bound != math.inf:
+            iterations += 1
+            path, bound = yield from self.iteration(bound, iterations, goals, depth_at, entered)
+
+        if path is None:
+            logger.warning("No path to goal found")
+        else:
+            logger.info("Goal reached at %s after %s iterations", grid.coords(path[-1]), iterations)
+            self.path = [grid.coords(cell) for cell in path]
+        if self.reentries:
+            logger.info("%s cells re-entered at a smaller depth", self.reentries)
+
+
+class IDAStar(IDDFS):
+    """
+    Iterative deepening A*: the same explicit-stack search, bounded by
+    depth + Manhattan distance to the nearest goal instead of depth alone.
+    """
+
+    def estimate(self, cell: int) -> int:
+        return self.heuristic(self.grid.coords(cell))
@@ -0,0 +1,246 @@
+import logging
+import math
+from typing import Iterator, List, Optional, Tuple, Dict
+from src.algorithms.base import SearchAlgorithm
+from src.utils.grid import UNVISITED
+from src.utils.pathfinding_utils import octile_distance
+from src.utils.search_buffers import SearchBuffers
+
+logger = logging.getLogger(__name__)
+
+DIAGONAL_COST = math.sqrt(2)
+
+
+def _sign(value: int) -> int:
+    return (value > 0) - (value < 0)
+
+
+class JPS(SearchAlgorithm):
+    """
+    Jump Point Search for 4-connected uniform-cost grids.
+
+    Canonical paths only turn from a horizontal run into a vertical one at a
+    forced neighbor, while vertical runs may branch horizontally anywhere. A
+    horizontal jump therefore stops at forced neighbors, and a vertical jump
+    stops wherever a horizontal scan finds a jump point. Only jump points are
+    expanded (and reported in moves); the returned path is the full cell
+    sequence with the same cost as A*.
+    """
+
+    def __init__(self, environment: Dict):
+        super().__init__(environment)
+        self.goal_ids = set(self.grid.ids(self.goals))
+
+    def jump_horizontal(self, cell: int, step: int) -> Optional[int]:
+        """Scan along x from cell; step is +/- stride."""
+        blocked = self.grid.blocked
+        goals = self.goal_ids
+        while True:
+            cell += step
+            if blocked[cell]:
+                return None
+            if cell in goals:
+                return cell
+            if (not blocked[cell + 1] and blocked[cell - step + 1]) or \
+                    (not blocked[cell - 1] and blocked[cell - step - 1]):
+                return cell
+
+    def jump_vertical(self, cell: int, step: int) -> Optional[int]:
+        """Scan along y from cell; step is +/- 1."""
+        blocked = self.grid.blocked
+        goals = self.goal_ids
+        stride = self.grid.stride
+        while True:
+            cell += step
+            if blocked[cell]:
+                return None
+            if cell in goals:
+                return cell
+            if self.jump_horizontal(cell, stride) is not None or \
+                    self.jump_horizontal(cell, -stride) is not None:
+                return cell
+
+    def successors(self, cell: int, parent: int) -> List[int]:
+        grid = self.grid
+        blocked = grid.blocked
+        stride = grid.stride
+        if parent == UNVISITED:
+            jumps = [self.jump_vertical(cell, 1), self.jump_horizontal(cell, stride),
+                     self.jump_vertical(cell, -1), self.jump_horizontal(cell, -stride)]
+        elif abs(cell - parent) < stride:
+            step = _sign(cell - parent)
+            jumps = [self.jump_vertical(cell, step),
+                     self.jump_horizontal(cell, stride),
+                     self.jump_horizontal(cell, -stride)]
+        else:
+            step = stride * _sign(cell - parent)
+            jumps = [self.jump_horizontal(cell, step)]
+            for side in (1, -1):
+                if not blocked[cell + side] and blocked[cell - step + side]:
+                    jumps.append(self.jump_vertical(cell, side))
+        return [jump for jump in jumps if jump is not None]
+
+    def distance(self, a: int, b: int) -> int:
+        stride = self.grid.stride
+        return abs(a // stride - b // stride) + abs(a % stride - b % stride)
+
+    def steps(self) -> Iterator[Tuple[int, int]]:
+        """Run Jump Point Search, yielding each expanded jump point, and store the path to the goal."""
+        if self.unsolvable():
+            return
+        grid = self.grid
+        start = grid.index(*self.start)
+        # Full-map tables reused from the previous search; see SearchBuffers.
+        # Jump points are written far from the cells expanded, so they are
+        # handed back as reached cells for the reset.
+        buffers = SearchBuffers.acquire(grid)
+        open_set, closed_set = buffers.open_set, buffers.closed
+        g_score, parent = buffers.g_score, buffers.parent
+        self.frontier = open_set
+        open_set.push(start, self.heuristic(self.start))
+        g_score[start] = 0
+        expanded, reached = [], []
+
+        try:
+            while open_set:
+                current = open_set.pop()
+                expanded.append(current)
+                self.moves.append(grid.coords(current))
+
+                yield self.moves[-1]
+
+                if current in self.goal_ids:
+                    logger.info("Goal reached at %s", grid.coords(current))
+                    self.path = self.expand_path(grid.reconstruct_path(parent, current))
+                    return
+
+                closed_set[current] = 1
+
+                for successor in self.successors(current, parent[current]):
+                    if closed_set[successor]:
+                        continue
+                    tentative_g_score = g_score[current] + self.distance(current, successor)
+                    if g_score[successor] == UNVISITED or tentative_g_score < g_score[successor]:
+                        parent[successor] = current
+                        reached.append(successor)
+                        g_score[successor] = tentative_g_score
+                        open_set.update(successor, tentative_g_score +
+                                        self.heuristic(grid.coords(successor)))
+
+            logger.warning("No path to goal found")
+        finally:
+            buffers.release(expanded, reached)
+
+    @staticmethod
+    def expand_path(jump_points: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Fill in the straight segments between consecutive jump points."""
+        path = jump_points[:1]
+        for (x, y), (next_x, next_y) in zip(jump_points, jump_points[1:]):
+            dx, dy = _sign(next_x - x), _sign(next_y - y)
+            while (x, y) != (next_x, next_y):
+                x, y = x + dx, y + dy
+                path.append((x, y))
+        return path
+
+
+class JPS8(JPS):
+    """
+    Jump Point Search for 8-connected grids with octile costs.
+
+    Diagonal moves may not cut corners: both orthogonal cells next to a
+    diagonal step must be open. Costs match A* over the same move set.
+    """
+
+    metric = staticmethod(octile_distance)
+
+    def jump(self, cell: int, dx: int, dy: int) -> Optional[int]:
+        blocked = self.grid.blocked
+        goals = self.goal_ids
+        stride = self.grid.stride
+        while True:
+            if dx and dy and (blocked[cell + dx * stride] or blocked[cell + dy]):
+                return None
+            cell += dx * stride + dy
+            if blocked[cell]:
+                return None
+            if cell in goals:
+                return cell
+            if dx and dy:
+                if self.jump(cell, dx, 0) is not None or self.jump(cell, 0, dy) is not None:
+                    return cell
+            elif dx:
+                if (not blocked[cell - 1] and blocked[cell - dx * stride - 1]) or \
+                        (not blocked[cell + 1] and blocked[cell - dx * stride + 1]):
+                    return cell
+            else:
+                if (not blocked[cell - stride] and blocked[cell - stride - dy]) or \
+                        (not blocked[cell + stride] and blocked[cell + stride - dy]):
+                    return cell
+
+    def successors(self, cell: int, parent: int) -> List[int]:
+        stride = self.grid.stride
+        if parent == UNVISITED:
+            directions = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+        else:
+            px, py = divmod(parent, stride)
+            x, y = divmod(cell, stride)
+            dx, dy = _sign(x - px), _sign(y - py)
+            directions = [(dx, dy)]
+            if dx and dy:
+                directions += [(dx, 0), (0, dy)]
+            elif dx:
+                directions += [(dx, 1), (dx, -1), (0, 1), (0, -1)]
+            else:
+                directions += [(1, dy), (-1, dy), (1, 0), (-1, 0)]
+        jumps = [self.jump(cell, dx, dy) for dx, dy in directions]
+        return [jump for jump in jumps if jump is not None]
+
+    def distance(self, a: int, b: int) -> float:
+        stride = self.grid.stride
+        dx = abs(a // stride - b // stride)
+        dy = abs(a % stride - b % stride)
+        return max(dx, dy) + (DIAGONAL_COST - 1) * min(dx, dy)
+
+    def steps(self) -> Iterator[Tuple[int, int]]:
+        """Run 8-connected Jump Point Search, yielding each expanded jump point, and store the path to the goal."""
+        if self.unsolvable():
+            return
+        grid = self.grid
+        start = grid.index(*self.start)
+        # Full-map tables reused as in JPS; the float g-scores only cover jump points.
+        buffers = SearchBuffers.acquire(grid)
+        open_set, closed_set, parent = buffers.heap, buffers.closed, buffers.parent
+        self.frontier = open_set
+        open_set.push(start, self.heuristic(self.start))
+        g_score = {start: 0.0}
+        expanded, reached = [], []
+
+        try:
+            while open_set:
+                current = open_set.pop()
+                expanded.append(current)
+                self.moves.append(grid.coords(current))
+
+                yield self.moves[-1]
+
+                if current in self.goal_ids:
+                    logger.info("Goal reached at %s", grid.coords(current))
+                    self.path = self.expand_path(grid.reconstruct_path(parent, current))
+                    return
+
+                closed_set[current] = 1
+
+                for successor in self.successors(current, parent[current]):
+                    if closed_set[successor]:
+                        continue
+                    tentative_g_score = g_score[current] + self.distance(current, successor)
+                    if successor not in g_score or tentative_g_score < g_score[successor]:
+                        parent[successor] = current
+                        reached.append(successor)
+                        g_score[successor] = tentative_g_score
+                        open_set.update(successor, tentative_g_score +
+                                        self.heuristic(grid.coords(successor)))
+
+            logger.warning("No path to goal found")
+        finally:
+            buffers.release(expanded, reached)
@@ -0,0 +1,164 @@
+import importlib
+import logging
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Entry point group third-party packages register their engines under, e.g.
+#   [project.entry-points."path_finder.algorithms"]
+#   FLOW = "my_package.flow:FlowSearch"
+ENTRY_POINT_GROUP = "path_finder.algorithms"
+
+CAPABILITIES = ('optimal', 'heuristic', 'weighted', 'streaming')
+
+
+class AlgorithmSpec:
+    """
+    A registered search engine: where to import it from and what it can do.
+
+    target is a "module:Class" string, an entry point or the class itself;
+    the module is only imported by the first load(). Capabilities:
+    optimal (returns a shortest path, or the cheapest one on weighted maps
+    when weighted is also set), heuristic (guided by the goal-distance
+    heuristic), weighted (honors terrain costs) and streaming (yields
+    expansions as it goes, so the GUI can animate it). label is the name
+    shown in the GUI, and only engines with gui set get a button.
+    """
+
+    def __init__(self, name: str, target, label: Optional[str] = None, optimal: bool = False,
+                 heuristic: bool = False, weighted: bool = False, streaming: bool = True,
+                 gui: bool = False):
+        self.name = name
+        self.target = target
+        self.label = label or name
+        self.optimal = optimal
+        self.heuristic = heuristic
+        self.weighted = weighted
+        self.streaming = streaming
+        self.gui = gui
+        self.algorithm_class: Optional[type] = target if isinstance(target, type) else None
+
+    def load(self) -> type:
+        """Import the engine on first use and return its class."""
+        if self.algorithm_class is None:
+            if isinstance(self.target, str):
+                module_name, class_name = self.target.split(':')
+                self.algorithm_class = getattr(importlib.import_module(module_name), class_name)
+            else:
+                self.algorithm_class = self.target.load()
+                # Entry points cannot carry metadata, so plugins may declare it on the class.
+                for capability, value in getattr(self.algorithm_class, 'capabilities', {}).items():
+                    if capability in CAPABILITIES:
+                        setattr(self, capability, bool(value))
+        return self.algorithm_class
+
+    def capabilities(self) -> Dict[str, bool]:
+        return {capability: getattr(self, capability) for capability in CAPABILITIES}
+
+
+class AlgorithmRegistry:
+    """
+    Method names mapped to lazily imported engines.
+
+    Built-in engines are registered below by module path, so looking one up
+    imports nothing else. Aliases map the assignment's method codes (CUS1,
+    CUS2) onto the engines they stand for. Third-party engines are found
+    through the ENTRY_POINT_GROUP entry points, which are only scanned when
+    a name is not built in or the full list is asked for. Built-in names
+    take precedence over plugins.
+    """
+
+    def __init__(self):
+        self.specs: 'OrderedDict[str, AlgorithmSpec]' = OrderedDict()
+        self.aliases: Dict[str, str] = {}
+        self.plugins_loaded = False
+
+    def register(self, name: str, target, **options) -> AlgorithmSpec:
+        spec = AlgorithmSpec(name, target, **options)
+        self.specs[name] = spec
+        return spec
+
+    def alias(self, alias: str, name: str) -> None:
+        self.aliases[alias] = name
+
+    def load_plugins(self) -> None:
+        if self.plugins_loaded:
+            return
+        self.plugins_loaded = True
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:
+            return
+        found = entry_points()
+        if hasattr(found, 'select'):
+            found = found.select(group=ENTRY_POINT_GROUP)
+        else:
+            found = found.get(ENTRY_POINT_GROUP, [])
+        for entry_point in found:
+            if entry_point.name in self.specs or entry_point.name in self.aliases:
+                logger.warning("Ignoring plugin engine %s: the name is taken", entry_point.name)
+                continue
+            self.register(entry_point.name, entry_point)
+
+    def get(self, name: str) -> AlgorithmSpec:
+        """Return the spec registered under name or an alias of it."""
+        name = self.aliases.get(name, name)
+        spec = self.specs.get(name)
+        if spec is None and not self.plugins_loaded:
+            self.load_plugins()
+            spec = self.specs.get(name)
+        if spec is None:
+            raise ValueError(f"Unknown method: {name}")
+        return spec
+
+    def load(self, name: str) -> type:
+        """Return the engine class for a method name, importing it on first use."""
+        return self.get(name).load()
+
+    def names(self) -> List[str]:
+        """Every registered method name, plugins included, in registration order."""
+        self.load_plugins()
+        return list(self.specs)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names())
+
+    def __contains__(self, name: str) -> bool:
+        try:
+            self.get(name)
+        except ValueError:
+            return False
+        return True
+
+
+registry = AlgorithmRegistry()
+
+registry.register('BFS', 'src.algorithms.bfs:BFS', optimal=True, gui=True)
+registry.register('DFS', 'src.algorithms.dfs:DFS', gui=True)
+registry.register('GBFS', 'src.algorithms.gbfs:GBFS', heuristic=True, gui=True)
+registry.register('AS', 'src.algorithms.astar:AStar', label="A*", optimal=True, heuristic=True, gui=True)
+registry.register('IDDFS', 'src.algorithms.iddfs:IDDFS', optimal=True, gui=True)
+registry.register('IDAS', 'src.algorithms.iddfs:IDAStar', label="IDA*", optimal=True, heuristic=True)
+registry.register('FRINGE', 'src.algorithms.fringe_search:FringeSearch', label="Fringe Search", optimal=True,
+                  heuristic=True)
+registry.register('BEST', 'src.algorithms.best_first_search:BestFirstSearch', label="Best-First Search",
+                  heuristic=True, gui=True)
+registry.register('JPS', 'src.algorithms.jps:JPS', optimal=True, heuristic=True, gui=True)
+# 8-connected; diagonal steps are reported as e.g. 'up-left'
+registry.register('JPS8', 'src.algorithms.jps:JPS8', label="JPS (8-connected)", optimal=True, heuristic=True)
+registry.register('BIAS', 'src.algorithms.bidirectional_astar:BidirectionalAStar', label="Bidirectional A*",
+                  optimal=True, heuristic=True, gui=True)
+# Hierarchical; near-optimal, abstract graph cached per map
+registry.register('HPA', 'src.algorithms.hpa_star:HPAStar', label="HPA*", heuristic=True)
+# Incremental; see CommandLineRobot.replan()
+registry.register('DSL', 'src.algorithms.dstar_lite:DStarLite', label="D* Lite", optimal=True)
+# Cached distance field per map and goal set; only the path cells are reported
+registry.register('DF', 'src.algorithms.distance_field_search:DistanceFieldSearch', label="Distance Field",
+                  optimal=True, streaming=False)
+registry.register('DIJ', 'src.algorithms.dijkstra:Dijkstra', label="Dijkstra", optimal=True, weighted=True)
+registry.register('WAS', 'src.algorithms.weighted_astar:WeightedAStar', label="Weighted-terrain A*",
+                  optimal=True, heuristic=True, weighted=True)
+
+registry.alias('CUS1', 'IDAS')  # Custom Search 1: iterative deepening A*
+registry.alias('CUS2', 'BEST')  # Custom Search 2: best-first search
@@ -0,0 +1,18 @@
+from src.algorithms.astar import AStar
+from src.algorithms.dijkstra import Dijkstra
+
+
+class WeightedAStar(Dijkstra):
+    """
+    A* over weighted terrain: Dijkstra's cost-aware loop guided by the
+    Manhattan distance to the nearest goal.
+
+    Every step costs at least 1, so the distance never overestimates and is
+    consistent, which keeps priorities monotone for the RadixHeap and the
+    paths cheapest. Unit-cost maps run the bucket-queue AStar unchanged.
+    """
+
+    unit_cost_engine = AStar
+
+    def estimate(self, cell: int) -> int:
+        return self.heuristic(self.grid.coords(cell))
@@ -0,0 +1,156 @@
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+from src.data.bulk_parser import load_environment
+from src.data.file_reader import check_input_filename
+from src.command_line_robot import CommandLineRobot
+from src.utils.metrics import SearchMetrics
+
+logger = logging.getLogger(__name__)
+
+# Maps kept parsed per worker process, most recently used last.
+MAP_CACHE_SIZE = 16
+
+# filename -> ((mtime, size), environment), so each map is parsed once per worker.
+_environments: 'OrderedDict[str, Tuple[Tuple[int, int], Dict]]' = OrderedDict()
+
+
+def cached_environment(filename: str) -> Dict:
+    """
+    Return the parsed environment for filename, parsing it on first use in
+    this process. A file modified since it was parsed is parsed again, and
+    only the MAP_CACHE_SIZE most recently used maps are kept.
+    """
+    check_input_filename(filename)
+    status = os.stat(filename)
+    signature = (status.st_mtime_ns, status.st_size)
+    cached = _environments.get(filename)
+    if cached is not None and cached[0] == signature:
+        _environments.move_to_end(filename)
+        return cached[1]
+    environment = load_environment(filename)
+    _environments[filename] = (signature, environment)
+    _environments.move_to_end(filename)
+    while len(_environments) > MAP_CACHE_SIZE:
+        _environments.popitem(last=False)
+    return environment
+
+
+def run_job(filename: str, method: str, metrics: bool = False) -> Dict:
+    """
+    Run one map/method pair and return a JSON-serializable result record,
+    with the run's search metrics under 'metrics' when requested.
+    """
+    started = time.perf_counter()
+    search_metrics = SearchMetrics() if metrics else None
+    try:
+        robot = CommandLineRobot(cached_environment(filename))
+        goal, num_nodes, path = robot.run_algorithm(method, search_metrics)
+    except Exception as e:
+        logger.error("Batch job %s %s failed: %s", filename, method, e)
+        return {'file': filename, 'method': method, 'error': str(e)}
+    result = {
+        'file': filename,
+        'method': method,
+        'goal': list(goal) if goal else None,
+        'num_nodes': num_nodes,
+        'path': [list(cell) for cell in path],
+        'moves': CommandLineRobot.path_to_moves(path),
+        'wall_time': time.perf_counter() - started,
+    }
+    if search_metrics is not None:
+        result['metrics'] = search_metrics.as_dict()
+    return result
+
+
+def read_manifest(manifest: str) -> List[Tuple[str, str]]:
+    """Read '<filename> <method>' pairs, one per line; blank lines and '#' comments are skipped."""
+    jobs = []
+    with open(manifest, 'r') as file:
+        for line_number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = line.split()
+            if len(parts) != 2:
+                raise ValueError(
+                    f"Manifest line {line_number} must be '<filename> <method>': {line}")
+            jobs.append((parts[0], parts[1]))
+    return jobs
+
+
+def expand_jobs(patterns: Iterable[str], methods: Iterable[str]) -> List[Tuple[str, str]]:
+    """Cross every map matching the glob patterns with every method."""
+    filenames = sorted({name for pattern in patterns for name in glob.glob(pattern)})
+    return [(filename, method) for filename in filenames for method in methods]
+
+
+def render_text(result: Dict) -> str:
+    """Render a result record with the single-run text format."""
+    if 'error' in result:
+        return f"{result['file']} {result['method']}\nAn error occurred: {result['error']}"
+    goal = tuple(result['goal']) if result['goal'] else None
+    path = [tuple(cell) for cell in result['path']]
+    return CommandLineRobot.format_output(
+        result['file'], result['method'], goal, result['num_nodes'], path)
+
+
+def run_batch(jobs: List[Tuple[str, str]], workers: Optional[int] = None,
+              output: TextIO = sys.stdout, text: bool = False, metrics: bool = False) -> int:
+    """
+    Fan jobs out over a process pool and stream each result as it completes.
+    Returns the number of failed jobs.
+    """
+    failures = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_job, filename, method, metrics)
+                   for filename, method in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            failures += 'error' in result
+            if text:
+                output.write(render_text(result) + "\n")
+            else:
+                output.write(json.dumps(result) + "\n")
+            output.flush()
+    logger.info("Batch finished: %s jobs, %s failed", len(jobs), failures)
+    return failures
+
+
+def batch_main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="command_line_main.py batch",
+        description="Run many map/method pairs in parallel and stream JSON Lines results.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--manifest", help="file of '<filename> <method>' lines")
+    source.add_argument("--maps", nargs="+", metavar="GLOB",
+                        help="map file globs, crossed with --methods")
+    parser.add_argument("--methods", default="BFS,DFS,GBFS,AS,CUS1,CUS2",
+                        help="comma-separated methods used with --maps")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument("--output", help="write results here instead of stdout")
+    parser.add_argument("--text", action="store_true",
+                        help="render results with the single-run text format")
+    parser.add_argument("--metrics", action="store_true",
+                        help="add each run's search metrics to its JSON record")
+    args = parser.parse_args(argv)
+
+    if args.manifest:
+        jobs = read_manifest(args.manifest)
+    else:
+        jobs = expand_jobs(args.maps, [m for m in args.methods.split(',') if m])
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            failures = run_batch(jobs, args.workers, output, args.text, args.metrics)
+    else:
+        failures = run_batch(jobs, args.workers, sys.stdout, args.text, args.metrics)
+    return 1 if failures else 0
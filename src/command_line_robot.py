@@ -1,12 +1,9 @@
 import logging
-from typing import List, Tuple, Dict
-from src.data.environment_parser import parse_environment
-from src.algorithms.bfs import BFS
-from src.algorithms.dfs import DFS
-from src.algorithms.gbfs import GBFS
-from src.algorithms.astar import AStar
-from src.algorithms.iddfs import IDDFS
-from src.algorithms.best_first_search import BestFirstSearch
+from typing import Iterable, List, Optional, TextIO, Tuple, Dict
+from src.algorithms.registry import registry
+from src.data.move_writer import PACKED_CODES, iter_moves, write_moves
+from src.utils.connectivity import reachable_environment
+from src.utils.metrics import SearchMetrics, profile
 
 logger = logging.getLogger(__name__)
 
@@ -14,24 +11,70 @@ logger = logging.getLogger(__name__)
 class CommandLineRobot:
     def __init__(self, environment: Dict):
         self.environment = environment
-        self.algorithms = {
-            'BFS': BFS,
-            'DFS': DFS,
-            'GBFS': GBFS,
-            'AS': AStar,
-            'IDDFS': IDDFS,
-            'CUS1': IDDFS,  # Assuming IDDFS as Custom Search 1
-            'CUS2': BestFirstSearch  # Assuming BestFirstSearch as Custom Search 2
-        }
+        # Method names resolve through the shared registry, which imports
+        # only the engine that is actually run.
+        self.algorithms = registry
+        # Standing D* Lite plan kept between replan() calls
+        self.planner = None
+        # Metrics of the last profiled run_algorithm() call
+        self.last_metrics: Optional[SearchMetrics] = None
 
-    def run_algorithm(self, method: str) -> Tuple[str, int, List[Tuple[int, int]]]:
-        if method not in self.algorithms:
-            raise ValueError(f"Unknown method: {method}")
+    def run_algorithm(self, method: str, metrics: Optional[SearchMetrics] = None) -> Tuple[str, int, List[Tuple[int, int]]]:
+        """
+        Solve the map with method. When metrics is given, the run is profiled
+        into it (and it is kept as last_metrics); otherwise the search runs
+        uninstrumented.
+        """
+        algorithm_class = self.algorithms.load(method)
+        if metrics is not None:
+            self.last_metrics = metrics
+            with metrics.tracing():
+                return self.profile_algorithm(algorithm_class, metrics)
 
-        algorithm = self.algorithms[method](self.environment)
-        # No UI updates for command-line version
-        path = algorithm.run(lambda x: None)
+        # Goals outside the start's connected component can never be reached,
+        # so they are dropped up front and a hopeless query is not searched at all.
+        environment = reachable_environment(self.environment)
+        if environment is None:
+            logger.info("No goal is in the start's component; search skipped")
+            return None, 0, []
 
+        algorithm = algorithm_class(environment)
+        # No UI updates for command-line version, so the search runs at full speed
+        path = algorithm.run()
+        return self.result(algorithm, path)
+
+    def profile_algorithm(self, algorithm_class: type, metrics: SearchMetrics) -> Tuple[str, int, List[Tuple[int, int]]]:
+        with metrics.phase('reachability'):
+            environment = reachable_environment(self.environment)
+        if environment is None:
+            logger.info("No goal is in the start's component; search skipped")
+            return None, 0, []
+        with metrics.phase('setup'):
+            algorithm = algorithm_class(environment)
+        path = profile(algorithm, metrics)
+        return self.result(algorithm, path)
+
+    def replan(self, added_walls: Iterable[Iterable[int]] = (), removed_walls: Iterable[Iterable[int]] = (),
+               start: Optional[Tuple[int, int]] = None) -> Tuple[str, int, List[Tuple[int, int]]]:
+        """
+        Apply wall changes and a new robot position to the standing D* Lite
+        plan and repair it, returning the same triple as run_algorithm. The
+        first call plans from scratch; later calls only re-expand the cells
+        the changes affect, which num_nodes reflects.
+        """
+        if self.planner is None:
+            self.planner = self.algorithms.load('DSL')(self.environment)
+        if removed_walls:
+            self.planner.remove_walls(removed_walls)
+        if added_walls:
+            self.planner.add_walls(added_walls)
+        if start is not None:
+            self.planner.move_start(start)
+        path = self.planner.replan()
+        return self.result(self.planner, path)
+
+    @staticmethod
+    def result(algorithm, path: List[Tuple[int, int]]) -> Tuple[str, int, List[Tuple[int, int]]]:
         if path:
             goal = path[-1]
             num_nodes = len(algorithm.moves)
@@ -42,19 +85,7 @@ class CommandLineRobot:
 
     @staticmethod
     def path_to_moves(path: List[Tuple[int, int]]) -> List[str]:
-        moves = []
-        for i in range(1, len(path)):
-            prev_x, prev_y = path[i-1]
-            curr_x, curr_y = path[i]
-            if curr_x < prev_x:
-                moves.append('left')
-            elif curr_x > prev_x:
-                moves.append('right')
-            elif curr_y < prev_y:
-                moves.append('up')
-            elif curr_y > prev_y:
-                moves.append('down')
-        return moves
+        return list(iter_moves(path))
 
     @staticmethod
     def format_output(filename: str, method: str, goal: Tuple[int, int], num_nodes: int, path: List[Tuple[int, int]]) -> str:
@@ -63,3 +94,26 @@ class CommandLineRobot:
             return f"{filename} {method}\n{goal} {num_nodes}\n{moves}"
         else:
             return f"{filename} {method}\nNo goal is reachable; {num_nodes}"
+
+    @staticmethod
+    def write_output(stream: TextIO, filename: str, method: str, goal: Tuple[int, int], num_nodes: int,
+                     path: List[Tuple[int, int]], move_format: str = 'text') -> None:
+        """
+        Write what format_output renders, streaming the moves line in
+        move_format instead of building it as one string. packed moves go to
+        the binary buffer underneath stream.
+        """
+        if not goal:
+            stream.write(CommandLineRobot.format_output(filename, method, goal, num_nodes, path) + "\n")
+            return
+        if move_format == 'packed' and not all(move in PACKED_CODES for move in iter_moves(path)):
+            raise ValueError(f"{method} returned diagonal moves, which the packed format cannot hold; use rle")
+        stream.write(f"{filename} {method}\n{goal} {num_nodes}\n")
+        if move_format == 'packed':
+            stream.flush()
+            write_moves(stream.buffer, path, move_format)
+            stream.buffer.write(b"\n")
+            stream.buffer.flush()
+        else:
+            write_moves(stream, path, move_format)
+            stream.write("\n")
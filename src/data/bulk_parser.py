@@ -0,0 +1,151 @@
+import logging
+import os
+import re
+from array import array
+from src.data import map_cache
+from src.data.file_reader import check_input_filename, is_compiled_map, read_input_text
+
+WALL_LINE_RE = re.compile(
+    r'\s*\(\s*-?\d+\s*,\s*-?\d+\s*,\s*-?\d+\s*,\s*-?\d+\s*\)\s*')
+# Weighted terrain: (x, y, width, height, cost) sets the cost of stepping into the rectangle.
+COST_LINE_RE = re.compile(
+    r'\s*\(\s*-?\d+\s*,\s*-?\d+\s*,\s*-?\d+\s*,\s*-?\d+\s*,\s*-?\d+\s*\)\s*')
+# Walls as written by file_writer, without spaces: the common case, checked first.
+COMPACT_WALL_RE = re.compile(r'\(-?\d+,-?\d+,-?\d+,-?\d+\)')
+# Any line of the rectangle section: a wall, a cost rectangle or blank.
+RECTANGLE_LINE_RE = re.compile(
+    r'\s*(?:\(\s*-?\d+\s*,\s*-?\d+\s*,\s*-?\d+\s*,\s*-?\d+\s*(?:,\s*-?\d+\s*)?\)\s*)?')
+PUNCTUATION = str.maketrans('(),', '   ')
+
+
+def _invalid_wall_line(body):
+    """Return (line number, line) of the first malformed wall or cost line, for error reporting."""
+    for number, line in enumerate(body.splitlines(), 4):
+        if not RECTANGLE_LINE_RE.fullmatch(line):
+            return number, line.strip()
+    return None, None
+
+
+def _parse_mixed_lines(body):
+    """Line-by-line fallback for bodies that mix wall and cost rectangles."""
+    walls, costs = [], []
+    for number, line in enumerate(body.splitlines(), 4):
+        if not line or line.isspace():
+            continue
+        if WALL_LINE_RE.fullmatch(line):
+            walls.append(list(map(int, line.translate(PUNCTUATION).split())))
+        elif COST_LINE_RE.fullmatch(line):
+            costs.append(list(map(int, line.translate(PUNCTUATION).split())))
+        else:
+            raise ValueError(f"invalid wall on line {number}: {line.strip()!r}")
+    return walls, costs
+
+
+def parse_rectangles_bulk(body):
+    """
+    Parses the rectangle section and returns (walls, costs): walls as
+    [x, y, width, height] lists and cost rectangles as [x, y, width,
+    height, cost] lists. Wall-only bodies take a single-pass bulk path.
+    """
+    # Every line is shape-checked by a compiled pattern (the loop stays in C),
+    # then the numbers are converted in a single split of the whole body.
+    lines = body.splitlines()
+    if not all(map(COMPACT_WALL_RE.fullmatch, lines)) and \
+            not all(map(RECTANGLE_LINE_RE.fullmatch, lines)):
+        number, line = _invalid_wall_line(body)
+        raise ValueError(f"invalid wall on line {number}: {line!r}")
+    tokens = body.translate(PUNCTUATION).split()
+    if len(tokens) != 4 * body.count('('):
+        # Cost rectangles are rare and few, so mixed bodies go line by line.
+        return _parse_mixed_lines(body)
+    numbers = array('i', map(int, tokens))
+    values = iter(numbers)
+    return [list(wall) for wall in zip(values, values, values, values)], []
+
+
+def parse_environment_text(text):
+    """
+    Parses the whole input text and returns the same structured environment
+    object as parse_environment. Raises an error if the parsing fails.
+    """
+    logger = logging.getLogger(__name__)
+
+    try:
+        sections = text.split('\n', 3) if text else []
+        lines = [line.strip() for line in sections[:3]]
+
+        # Parse grid dimensions
+        dimensions = lines[0][1:-1].split(',')
+        rows, cols = map(int, dimensions)
+
+        # Parse start position
+        start = tuple(map(int, lines[1][1:-1].split(',')))
+
+        # Parse goal positions
+        goals = [tuple(map(int, goal.strip()[1:-1].split(',')))
+                 for goal in lines[2].split('|')]
+
+        # Parse walls and weighted terrain
+        walls, costs = parse_rectangles_bulk(sections[3]) if len(sections) > 3 else ([], [])
+
+        environment = {
+            'dimensions': (rows, cols),
+            'start': start,
+            'goals': goals,
+            'walls': walls
+        }
+        # Unit-cost maps carry no 'costs' entry, so they stay exactly as before.
+        if costs:
+            environment['costs'] = costs
+
+        logger.info("Successfully parsed environment data")
+        return environment
+    except IndexError:
+        logger.error("Input data does not contain enough lines")
+        raise ValueError("Input data does not contain enough lines")
+    except ValueError as e:
+        logger.error("Error parsing numeric values: %s", e)
+        raise ValueError(f"Error parsing numeric values: {str(e)}")
+    except Exception as e:
+        logger.error(
+            "Unexpected error occurred while parsing environment: %s", e)
+        raise
+
+
+def load_environment(filename, use_cache=True, cache_dir=None):
+    """
+    Reads and parses an environment file with a single read and bulk parse.
+
+    Compiled .pfm maps are memory-mapped directly. For .txt maps, when
+    use_cache is set, a compiled copy keyed by the source's path and content
+    hash is kept in cache_dir (see map_cache.default_cache_dir) and
+    memory-mapped on later loads; editing the source changes the hash, so
+    stale copies are never used, and they are deleted when the new copy is
+    written.
+    """
+    logger = logging.getLogger(__name__)
+
+    check_input_filename(filename)
+    if is_compiled_map(filename):
+        return map_cache.load_compiled(filename)
+
+    text = read_input_text(filename)
+    if not use_cache:
+        return parse_environment_text(text)
+
+    digest = map_cache.source_hash(text.encode())
+    cached = map_cache.cache_path(filename, digest, cache_dir)
+    if os.path.exists(cached):
+        try:
+            return map_cache.load_compiled(cached, digest)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable map cache %s: %s", cached, e)
+
+    environment = parse_environment_text(text)
+    try:
+        map_cache.compile_environment(environment, cached, digest)
+    except OSError as e:
+        logger.warning("Could not write map cache %s: %s", cached, e)
+    else:
+        map_cache.evict_older_copies(cached)
+    return environment
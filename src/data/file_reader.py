@@ -1,10 +1,57 @@
 import logging
 import os
 
+COMPILED_EXTENSION = '.pfm'
+
+
+def check_input_filename(filename):
+    """
+    Raises an error unless filename is a .txt map or a compiled .pfm map.
+    """
+    if not filename.lower().endswith(('.txt', COMPILED_EXTENSION)):
+        raise ValueError("Input file must be a .txt or compiled .pfm file")
+
+
+def is_compiled_map(filename):
+    return filename.lower().endswith(COMPILED_EXTENSION)
+
 
 def read_input_file(filename):
     """
     Reads the input file and returns the raw content.
+    Compiled .pfm maps are rendered back into text lines.
+    Raises an error if the file is neither a .txt nor a .pfm file.
+    """
+    logger = logging.getLogger(__name__)
+
+    try:
+        check_input_filename(filename)
+
+        if is_compiled_map(filename):
+            from src.data.map_cache import compiled_lines
+            lines = compiled_lines(filename)
+            logger.info("Successfully read input file: %s", filename)
+            return lines
+
+        with open(filename, 'r') as file:
+            logger.info("Successfully read input file: %s", filename)
+            return file.readlines()
+    except FileNotFoundError:
+        logger.error("File not found: %s", filename)
+        raise
+    except IOError as e:
+        logger.error(
+            "IO error occurred while reading file %s: %s", filename, e)
+        raise
+    except Exception as e:
+        logger.error(
+            "Unexpected error occurred while reading file %s: %s", filename, e)
+        raise
+
+
+def read_input_text(filename):
+    """
+    Reads the whole input file in one call and returns it as a single string.
     Raises an error if the file is not a .txt file.
     """
     logger = logging.getLogger(__name__)
@@ -14,16 +61,17 @@ def read_input_file(filename):
             raise ValueError("Input file must be a .txt file")
 
         with open(filename, 'r') as file:
-            logger.info(f"Successfully read input file: {filename}")
-            return file.readlines()
+            text = file.read()
+            logger.info("Successfully read input file: %s", filename)
+            return text
     except FileNotFoundError:
-        logger.error(f"File not found: {filename}")
+        logger.error("File not found: %s", filename)
         raise
     except IOError as e:
         logger.error(
-            f"IO error occurred while reading file {filename}: {str(e)}")
+            "IO error occurred while reading file %s: %s", filename, e)
         raise
     except Exception as e:
         logger.error(
-            f"Unexpected error occurred while reading file {filename}: {str(e)}")
+            "Unexpected error occurred while reading file %s: %s", filename, e)
         raise
@@ -0,0 +1,31 @@
+import logging
+from typing import Dict, List
+from src.data.file_reader import is_compiled_map
+
+
+def environment_lines(environment: Dict) -> List[str]:
+    """Renders an environment in the text map format, one line per entry."""
+    rows, cols = environment['dimensions']
+    lines = [f"[{rows},{cols}]\n",
+             "({},{})\n".format(*environment['start']),
+             " | ".join("({},{})".format(*goal) for goal in environment['goals']) + "\n"]
+    lines.extend("({},{},{},{})\n".format(*wall) for wall in environment['walls'])
+    lines.extend("({},{},{},{},{})\n".format(*cost) for cost in environment.get('costs', ()))
+    return lines
+
+
+def write_environment(environment: Dict, filename: str) -> None:
+    """
+    Writes an environment as a text map, or as a compiled map when filename
+    ends in .pfm.
+    """
+    logger = logging.getLogger(__name__)
+
+    if is_compiled_map(filename):
+        from src.data.map_cache import compile_environment
+        compile_environment(environment, filename)
+        return
+
+    with open(filename, 'w') as file:
+        file.writelines(environment_lines(environment))
+    logger.info("Map written to %s", filename)
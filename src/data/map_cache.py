@@ -0,0 +1,189 @@
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Sequence
+from typing import Dict, List, Optional
+from src.data.file_reader import COMPILED_EXTENSION
+from src.data.file_writer import environment_lines
+from src.utils.grid import Grid
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PFMAP\x00'
+VERSION = 2
+# magic, version, rows, cols, start x, start y, goal count, wall count, cost count, source hash
+HEADER = struct.Struct('<6sHiiiiIII32s')
+ALIGNMENT = 8
+
+
+class WallList(Sequence):
+    """Read-only [x, y, width, height] view over the packed wall table of a compiled map."""
+
+    def __init__(self, values: memoryview):
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values) // 4
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("wall index out of range")
+        return self.values[4 * index:4 * index + 4].tolist()
+
+
+def source_hash(data: bytes) -> bytes:
+    """Content hash that keys the compiled cache of a text map."""
+    return hashlib.sha256(data).digest()
+
+
+def default_cache_dir() -> str:
+    """PATHFINDER_CACHE_DIR, or path_finder under the user's cache directory."""
+    configured = os.environ.get('PATHFINDER_CACHE_DIR')
+    if configured:
+        return configured
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'path_finder')
+
+
+def source_key(filename: str) -> str:
+    """Short hash of a source map's absolute path, the prefix of its cached copies."""
+    return hashlib.sha256(os.path.abspath(filename).encode()).hexdigest()[:16]
+
+
+def cache_path(filename: str, digest: bytes, cache_dir: Optional[str] = None) -> str:
+    """Cached copy of filename compiled from content with the given hash."""
+    name = f"{source_key(filename)}-{digest.hex()}{COMPILED_EXTENSION}"
+    return os.path.join(cache_dir or default_cache_dir(), name)
+
+
+def evict_older_copies(path: str) -> None:
+    """
+    Delete the other cached copies of the same source map. Those were
+    compiled from earlier content and can never match again unless the
+    file is reverted, so the cache holds one copy per source file.
+    """
+    directory, name = os.path.split(path)
+    prefix = name.split('-', 1)[0] + '-'
+    try:
+        entries = os.listdir(directory)
+    except OSError:
+        return
+    for entry in entries:
+        if entry != name and entry.startswith(prefix) and entry.endswith(COMPILED_EXTENSION):
+            try:
+                os.unlink(os.path.join(directory, entry))
+                logger.info("Evicted stale map cache %s", entry)
+            except OSError as e:
+                logger.warning("Could not evict map cache %s: %s", entry, e)
+
+
+def _int32_bytes(values: List[int]) -> bytes:
+    packed = array('i', values)
+    if sys.byteorder != 'little':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def compile_environment(environment: Dict, path: str, digest: bytes = b'') -> None:
+    """
+    Writes the environment as a compiled map: a fixed header with dimensions,
+    start and counts, the goal and wall tables, then the grid's occupancy
+    bytes in Grid layout so loading can use them in place. The file is
+    written to a temporary name and renamed, so readers never see it partial.
+    Cost rectangles are stored as a table after the walls; the few of them
+    are rasterized again on load rather than storing the cost array.
+    """
+    rows, cols = environment['dimensions']
+    grid = Grid.from_environment(environment)
+    goals = [value for goal in environment['goals'] for value in goal]
+    walls = [value for wall in environment['walls'] for value in wall]
+    costs = environment.get('costs', [])
+    header = HEADER.pack(MAGIC, VERSION, rows, cols, *environment['start'],
+                         len(environment['goals']), len(environment['walls']), len(costs), digest)
+    tables = _int32_bytes(goals) + _int32_bytes(walls) + \
+        _int32_bytes([value for cost in costs for value in cost])
+    padding = b'\x00' * (-(len(header) + len(tables)) % ALIGNMENT)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(header)
+            file.write(tables)
+            file.write(padding)
+            file.write(grid.blocked)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    logger.info("Compiled map written to %s", path)
+
+
+def read_header(buffer) -> tuple:
+    if len(buffer) < HEADER.size:
+        raise ValueError("Compiled map is truncated")
+    fields = HEADER.unpack_from(buffer, 0)
+    if fields[0] != MAGIC or fields[1] != VERSION:
+        raise ValueError("Not a compiled map file or unsupported version")
+    return fields
+
+
+def load_compiled(path: str, digest: Optional[bytes] = None) -> Dict:
+    """
+    Memory-maps a compiled map and returns an environment whose grid and wall
+    list are views over the mapping, so nothing is parsed or copied. When
+    digest is given, a file compiled from different source content is
+    rejected with ValueError.
+    """
+    with open(path, 'rb') as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    buffer = memoryview(mapping)
+    _, _, rows, cols, start_x, start_y, goal_count, wall_count, cost_count, stored = read_header(buffer)
+    if digest is not None and stored != digest:
+        raise ValueError("Compiled map does not match its source")
+
+    offset = HEADER.size
+    wall_end = 2 * goal_count + 4 * wall_count
+    table_end = offset + 4 * (wall_end + 5 * cost_count)
+    grid_offset = table_end + (-table_end % ALIGNMENT)
+    if len(buffer) != grid_offset + (rows + 2) * (cols + 2):
+        raise ValueError("Compiled map is truncated")
+
+    tables = buffer[offset:table_end]
+    if sys.byteorder == 'little':
+        values = tables.cast('i')
+    else:
+        swapped = array('i', tables.tobytes())
+        swapped.byteswap()
+        values = memoryview(swapped)
+
+    grid = Grid(rows, cols, buffer[grid_offset:])
+    goals = values[:2 * goal_count].tolist()
+    environment = {
+        'dimensions': (rows, cols),
+        'start': (start_x, start_y),
+        'goals': list(zip(goals[0::2], goals[1::2])),
+        'walls': WallList(values[2 * goal_count:wall_end]),
+        'grid': grid,
+    }
+    if cost_count:
+        costs = values[wall_end:].tolist()
+        environment['costs'] = [costs[i:i + 5] for i in range(0, len(costs), 5)]
+        grid.add_costs(environment['costs'])
+    logger.info("Loaded compiled map: %s", path)
+    return environment
+
+
+def compiled_lines(path: str) -> List[str]:
+    """Renders a compiled map back into the text format, one line per entry."""
+    return environment_lines(load_compiled(path))
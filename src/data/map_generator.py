@@ -0,0 +1,202 @@
+import argparse
+import logging
+import random
+import re
+from typing import Dict, List, Optional
+from src.data.file_writer import write_environment
+from src.utils.connectivity import ComponentLabels
+from src.utils.grid import Grid
+
+logger = logging.getLogger(__name__)
+
+# Random picks tried before falling back to listing the start's component.
+SAMPLE_ATTEMPTS = 64
+
+
+def generate_environment(rows: int, cols: int, density: float = 0.2, goal_count: int = 1,
+                         seed: Optional[int] = None, max_wall_size: int = 3) -> Dict:
+    """
+    Builds a random map whose goals are always reachable from the start.
+
+    Random wall rectangles of up to max_wall_size cells a side are drawn to
+    cover about density of the map, skipping any that would cover the start.
+    One component-labelling pass then finds the start's component, and the
+    goals are picked inside it, so no attempt is ever searched or retried.
+    The same seed always gives the same map.
+    """
+    if rows < 1 or cols < 1:
+        raise ValueError("Map dimensions must be positive")
+    if not 0 <= density < 1:
+        raise ValueError("Wall density must be in [0, 1)")
+    if goal_count < 1 or max_wall_size < 1:
+        raise ValueError("Goal count and wall size must be positive")
+
+    rng = random.Random(seed)
+    start = (rng.randrange(cols), rng.randrange(rows))
+    mean_area = ((1 + max_wall_size) / 2) ** 2
+    walls = []
+    for _ in range(int(density * rows * cols / mean_area)):
+        x, y = rng.randrange(cols), rng.randrange(rows)
+        width, height = rng.randint(1, max_wall_size), rng.randint(1, max_wall_size)
+        if x <= start[0] < x + width and y <= start[1] < y + height:
+            continue
+        walls.append([x, y, min(width, cols - x), min(height, rows - y)])
+
+    grid = Grid(rows, cols)
+    grid.add_walls(walls)
+    components = ComponentLabels(grid)
+    goals = _pick_goals(rng, grid, components, grid.index(*start), goal_count)
+
+    environment = {
+        'dimensions': (rows, cols),
+        'start': start,
+        'goals': [grid.coords(goal) for goal in goals],
+        'walls': walls,
+        'grid': grid,
+    }
+    logger.info("Generated %sx%s map with %s walls and %s goals", rows, cols, len(walls), len(goals))
+    return environment
+
+
+def _pick_goals(rng: random.Random, grid: Grid, components: ComponentLabels,
+                start: int, goal_count: int) -> List[int]:
+    """Pick distinct goals other than the start inside the start's component."""
+    labels = components.labels
+    label = labels[start]
+    size = components.sizes[label]
+    if size == 1:
+        return [start]
+    goal_count = min(goal_count, size - 1)
+
+    goals = []
+    for _ in range(SAMPLE_ATTEMPTS * goal_count):
+        cell = grid.index(rng.randrange(grid.cols), rng.randrange(grid.rows))
+        if labels[cell] == label and cell != start and cell not in goals:
+            goals.append(cell)
+            if len(goals) == goal_count:
+                return goals
+
+    # The component is a small share of the map: list it once and sample from it.
+    cells = [cell for cell in range(grid.size)
+             if labels[cell] == label and cell != start and cell not in goals]
+    return goals + rng.sample(cells, goal_count - len(goals))
+
+
+def _square_environment(size: int) -> Dict:
+    """Square map with the start in the top-left and goals along the far edges."""
+    last = size - 1
+    return {
+        'dimensions': (size, size),
+        'start': (0, 0),
+        'goals': [(last, last), (last, last // 2), (last // 2, last)],
+        'walls': [],
+    }
+
+
+def _occupancy_to_walls(occupancy: bytearray, size: int) -> List[List[int]]:
+    """Compress a row-major occupancy map into one-column wall rectangles."""
+    walls = []
+    for x in range(size):
+        column = bytes(occupancy[x::size])
+        for run in re.finditer(b'\x01+', column):
+            walls.append([x, run.start(), 1, run.end() - run.start()])
+    return walls
+
+
+def _rasterize(walls: List[List[int]], size: int) -> bytearray:
+    occupancy = bytearray(size * size)
+    for x, y, width, height in walls:
+        run = b'\x01' * (min(x + width, size) - x)
+        for row in range(y, min(y + height, size)):
+            occupancy[row * size + x:row * size + x + len(run)] = run
+    return occupancy
+
+
+def _keep_endpoints_open(occupancy: bytearray, environment: Dict) -> None:
+    size = environment['dimensions'][1]
+    for x, y in [environment['start']] + environment['goals']:
+        occupancy[y * size + x] = 0
+
+
+def generate_maze(size: int, seed: int = 0) -> Dict:
+    """
+    Builds a square perfect maze carved by an iterative randomized
+    depth-first search, from the top-left start to goals on the far edges.
+    """
+    rng = random.Random(f"maze-{size}-{seed}")
+    occupancy = bytearray(b'\x01') * (size * size)
+    stack = [(0, 0)]
+    occupancy[0] = 0
+    while stack:
+        x, y = stack[-1]
+        options = [(x + dx, y + dy, x + dx // 2, y + dy // 2)
+                   for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+                   if 0 <= x + dx < size and 0 <= y + dy < size
+                   and occupancy[(y + dy) * size + x + dx]]
+        if not options:
+            stack.pop()
+            continue
+        nx, ny, wx, wy = rng.choice(options)
+        occupancy[wy * size + wx] = 0
+        occupancy[ny * size + nx] = 0
+        stack.append((nx, ny))
+    environment = _square_environment(size)
+    # Even sizes leave the last row/column uncarved; open them so the goals connect.
+    last = size - 1
+    if size % 2 == 0:
+        occupancy[last * size:size * size] = bytes(size)
+        occupancy[last::size] = bytes(size)
+    _keep_endpoints_open(occupancy, environment)
+    environment['walls'] = _occupancy_to_walls(occupancy, size)
+    return environment
+
+
+def generate_rooms(size: int, seed: int = 0) -> Dict:
+    """
+    Builds a square map of rooms separated by one-cell walls with a random
+    door to each neighbor, from the top-left start to goals on the far edges.
+    """
+    rng = random.Random(f"rooms-{size}-{seed}")
+    room = max(4, size // 25)
+    walls = []
+    lines = range(room, size - 1, room + 1)
+    for line in lines:
+        # Split each wall line into per-room segments with one door gap each.
+        for offset in range(0, size, room + 1):
+            span = min(room, size - offset)
+            door = offset + rng.randrange(span)
+            walls.append([line, offset, 1, door - offset])
+            walls.append([line, door + 1, 1, offset + span - door - 1])
+            door = offset + rng.randrange(span)
+            walls.append([offset, line, door - offset, 1])
+            walls.append([door + 1, line, offset + span - door - 1, 1])
+    environment = _square_environment(size)
+    occupancy = _rasterize([wall for wall in walls if wall[2] > 0 and wall[3] > 0], size)
+    for x in lines:
+        for y in lines:
+            occupancy[y * size + x] = 1
+    _keep_endpoints_open(occupancy, environment)
+    environment['walls'] = _occupancy_to_walls(occupancy, size)
+    return environment
+
+
+def generate_main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="command_line_main.py generate",
+        description="Write a seeded random map whose goals are reachable from the start.")
+    parser.add_argument("output", help="map file to write (.txt, or .pfm for a compiled map)")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--cols", type=int, default=100)
+    parser.add_argument("--density", type=float, default=0.2,
+                        help="approximate share of cells covered by walls (default 0.2)")
+    parser.add_argument("--goals", type=int, default=1, help="number of goals (default 1)")
+    parser.add_argument("--max-wall-size", type=int, default=3,
+                        help="largest wall rectangle side (default 3)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    environment = generate_environment(args.rows, args.cols, args.density, args.goals,
+                                       args.seed, args.max_wall_size)
+    write_environment(environment, args.output)
+    print(f"Generated {args.rows}x{args.cols} map -> {args.output}")
+    return 0
@@ -0,0 +1,248 @@
+import argparse
+import re
+import struct
+from typing import BinaryIO, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+MOVE_FORMATS = ('text', 'rle', 'packed')
+
+# Move named by the sign of a step's (dx, dy); y grows downwards.
+STEP_MOVES = {
+    (0, -1): 'up', (0, 1): 'down', (-1, 0): 'left', (1, 0): 'right',
+    (-1, -1): 'up-left', (1, -1): 'up-right', (-1, 1): 'down-left', (1, 1): 'down-right',
+}
+
+RLE_CODES = {'up': 'U', 'down': 'D', 'left': 'L', 'right': 'R',
+             'up-left': 'UL', 'up-right': 'UR', 'down-left': 'DL', 'down-right': 'DR'}
+RLE_MOVES = {code: move for move, code in RLE_CODES.items()}
+RLE_TOKEN_RE = re.compile(r'([UDLR]{1,2})(\d+)')
+
+PACKED_MAGIC = b'PFMV'
+# 2-bit move codes of the packed format, four moves per byte, first move in the low bits
+PACKED_CODES = {'up': 0, 'right': 1, 'down': 2, 'left': 3}
+PACKED_MOVES = ('up', 'right', 'down', 'left')
+# Every frame is a move count followed by its packed bytes; a zero count ends the stream.
+PACKED_FRAME = struct.Struct('<H')
+PACKED_FRAME_MOVES = 0xFFFC
+# Text writers hand the stream this many pieces at a time.
+TEXT_BATCH = 4096
+
+
+def iter_moves(path: Iterable[Tuple[int, int]]) -> Iterator[str]:
+    """Yield the move between each pair of consecutive path cells, without building a list."""
+    cells = iter(path)
+    previous = next(cells, None)
+    if previous is None:
+        return
+    prev_x, prev_y = previous
+    step_moves = STEP_MOVES
+    for x, y in cells:
+        move = step_moves.get((x - prev_x, y - prev_y))
+        if move is None and (x != prev_x or y != prev_y):
+            # Longer jumps are named by their direction alone.
+            move = step_moves[((x > prev_x) - (x < prev_x), (y > prev_y) - (y < prev_y))]
+        if move is not None:
+            yield move
+        prev_x, prev_y = x, y
+
+
+class MoveWriter:
+    """
+    Writes moves to a stream one at a time: call write() for each move, then
+    close(). Subclasses only buffer a bounded chunk, so the memory used does
+    not grow with the path. close() does not close the stream.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.count = 0
+
+    def write(self, move: str) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+
+class TextMoveWriter(MoveWriter):
+    """The legacy format: the repr of the list of move names, e.g. ['right', 'down']."""
+
+    def __init__(self, stream: TextIO):
+        super().__init__(stream)
+        self.pieces: List[str] = ['[']
+
+    def write(self, move: str) -> None:
+        if self.count:
+            self.pieces.append(', ')
+        self.pieces.append(repr(move))
+        self.count += 1
+        if len(self.pieces) >= TEXT_BATCH:
+            self.stream.write(''.join(self.pieces))
+            self.pieces.clear()
+
+    def close(self) -> None:
+        self.pieces.append(']')
+        self.stream.write(''.join(self.pieces))
+        self.pieces.clear()
+
+
+class RleMoveWriter(MoveWriter):
+    """
+    Run-length encoded moves: space-separated runs of a move code and a
+    count, e.g. R5 D2 UL1. The codes are U, D, L, R and the diagonals UL,
+    UR, DL and DR.
+    """
+
+    def __init__(self, stream: TextIO):
+        super().__init__(stream)
+        self.pieces: List[str] = []
+        self.runs = 0
+        self.run_move: Optional[str] = None
+        self.run_length = 0
+
+    def write(self, move: str) -> None:
+        self.count += 1
+        if move == self.run_move:
+            self.run_length += 1
+            return
+        self.flush_run()
+        self.run_move = move
+        self.run_length = 1
+
+    def flush_run(self) -> None:
+        if self.run_move is None:
+            return
+        if self.runs:
+            self.pieces.append(' ')
+        self.runs += 1
+        self.pieces.append(f"{RLE_CODES[self.run_move]}{self.run_length}")
+        if len(self.pieces) >= TEXT_BATCH:
+            self.stream.write(''.join(self.pieces))
+            self.pieces.clear()
+
+    def close(self) -> None:
+        self.flush_run()
+        self.run_move = None
+        self.stream.write(''.join(self.pieces))
+        self.pieces.clear()
+
+
+class PackedMoveWriter(MoveWriter):
+    """
+    Packed binary moves for 4-connected paths: PACKED_MAGIC, then frames of
+    a little-endian 16-bit move count and the moves packed 2 bits each (see
+    PACKED_CODES), ended by a frame with a count of 0. Diagonal moves cannot
+    be packed and raise ValueError.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        super().__init__(stream)
+        self.frame = bytearray()
+        self.frame_moves = 0
+        self.stream.write(PACKED_MAGIC)
+
+    def write(self, move: str) -> None:
+        code = PACKED_CODES.get(move)
+        if code is None:
+            raise ValueError(f"The packed format only holds 4-connected moves, not {move!r}; use rle")
+        slot = self.frame_moves & 3
+        if slot:
+            self.frame[-1] |= code << (2 * slot)
+        else:
+            self.frame.append(code)
+        self.frame_moves += 1
+        self.count += 1
+        if self.frame_moves == PACKED_FRAME_MOVES:
+            self.flush_frame()
+
+    def flush_frame(self) -> None:
+        if self.frame_moves:
+            self.stream.write(PACKED_FRAME.pack(self.frame_moves))
+            self.stream.write(self.frame)
+            self.frame.clear()
+            self.frame_moves = 0
+
+    def close(self) -> None:
+        self.flush_frame()
+        self.stream.write(PACKED_FRAME.pack(0))
+
+
+def move_writer(stream, move_format: str = 'text') -> MoveWriter:
+    """A writer for the format; packed needs a binary stream, the others a text stream."""
+    if move_format == 'text':
+        return TextMoveWriter(stream)
+    if move_format == 'rle':
+        return RleMoveWriter(stream)
+    if move_format == 'packed':
+        return PackedMoveWriter(stream)
+    raise ValueError(f"Unknown move format: {move_format}")
+
+
+def write_moves(stream, path: Iterable[Tuple[int, int]], move_format: str = 'text') -> int:
+    """Stream the moves of a path in the given format and return how many were written."""
+    writer = move_writer(stream, move_format)
+    write = writer.write
+    for move in iter_moves(path):
+        write(move)
+    writer.close()
+    return writer.count
+
+
+def decode_rle(line: str) -> Iterator[str]:
+    """Yield the moves of a run-length encoded line."""
+    for token in line.split():
+        match = RLE_TOKEN_RE.fullmatch(token)
+        if match is None or match.group(1) not in RLE_MOVES:
+            raise ValueError(f"Invalid run-length token: {token}")
+        move = RLE_MOVES[match.group(1)]
+        for _ in range(int(match.group(2))):
+            yield move
+
+
+def read_packed(stream: BinaryIO) -> Iterator[str]:
+    """Yield the moves of a packed stream, reading it one frame at a time."""
+    if stream.read(len(PACKED_MAGIC)) != PACKED_MAGIC:
+        raise ValueError("Not a packed move stream")
+    while True:
+        header = stream.read(PACKED_FRAME.size)
+        if len(header) != PACKED_FRAME.size:
+            raise ValueError("Packed move stream is truncated")
+        (frame_moves,) = PACKED_FRAME.unpack(header)
+        if not frame_moves:
+            return
+        frame = stream.read((frame_moves + 3) // 4)
+        if len(frame) != (frame_moves + 3) // 4:
+            raise ValueError("Packed move stream is truncated")
+        for i in range(frame_moves):
+            yield PACKED_MOVES[(frame[i >> 2] >> (2 * (i & 3))) & 3]
+
+
+def read_output_moves(stream: BinaryIO) -> Optional[List[str]]:
+    """
+    Read the moves of a single-run output written in any format from a
+    buffered binary file positioned after its two header lines. Returns None
+    when the output has no moves (no goal was reachable).
+    """
+    if stream.peek(len(PACKED_MAGIC))[:len(PACKED_MAGIC)] == PACKED_MAGIC:
+        return list(read_packed(stream))
+    line = stream.readline().decode().strip()
+    if not line:
+        return None
+    if line.startswith('['):
+        return [move.strip().strip("'") for move in line[1:-1].split(',') if move.strip()]
+    return list(decode_rle(line))
+
+
+def decode_main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="command_line_main.py decode",
+        description="Print a single-run output saved with --format rle or packed in the default text format.")
+    parser.add_argument("output", help="file holding the saved output")
+    args = parser.parse_args(argv)
+
+    with open(args.output, 'rb') as file:
+        header = [file.readline().decode().rstrip('\n') for _ in range(2)]
+        moves = read_output_moves(file)
+    print("\n".join(header))
+    if moves is not None:
+        print(moves)
+    return 0
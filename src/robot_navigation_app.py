@@ -1,17 +1,14 @@
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 import logging
+import queue
 import random
-from src.data.file_reader import read_input_file
-from src.data.environment_parser import parse_environment
+from src.data.bulk_parser import load_environment
+from src.data.map_generator import generate_environment
+from src.utils.connectivity import reachable_environment
 from src.visualizers.grid_visualizer import GridVisualizer
-from src.algorithms.bfs import BFS
-from src.algorithms.dfs import DFS
-from src.algorithms.gbfs import GBFS
-from src.algorithms.astar import AStar
-from src.algorithms.iddfs import IDDFS
-from src.algorithms.best_first_search import BestFirstSearch
-from src.algorithms.bidirectional_astar import BidirectionalAStar
+from src.search_worker import SearchWorker, step_delay
+from src.algorithms.registry import registry
 
 
 class RobotNavigationApp:
@@ -53,99 +50,75 @@ class RobotNavigationApp:
             self.sidebar, text="Generate Random Grid", command=self.generate_random_grid)
         self.random_grid_button.pack(pady=10, padx=20, fill="x")
 
-        # Add buttons for each algorithm
-        self.bfs_button = ctk.CTkButton(
-            self.sidebar, text="Run BFS", command=lambda: self.run_algorithm(BFS))
-        self.bfs_button.pack(pady=10, padx=20, fill="x")
-
-        self.dfs_button = ctk.CTkButton(
-            self.sidebar, text="Run DFS", command=lambda: self.run_algorithm(DFS))
-        self.dfs_button.pack(pady=10, padx=20, fill="x")
-
-        self.gbfs_button = ctk.CTkButton(
-            self.sidebar, text="Run GBFS", command=lambda: self.run_algorithm(GBFS))
-        self.gbfs_button.pack(pady=10, padx=20, fill="x")
-
-        self.astar_button = ctk.CTkButton(
-            self.sidebar, text="Run A*", command=lambda: self.run_algorithm(AStar))
-        self.astar_button.pack(pady=10, padx=20, fill="x")
-
-        self.iddfs_button = ctk.CTkButton(
-            self.sidebar, text="Run IDDFS", command=lambda: self.run_algorithm(IDDFS))
-        self.iddfs_button.pack(pady=10, padx=20, fill="x")
-
-        self.best_first_button = ctk.CTkButton(
-            self.sidebar, text="Run Best-First Search", command=lambda: self.run_algorithm(BestFirstSearch))
-        self.best_first_button.pack(pady=10, padx=20, fill="x")
-
-        # self.bidirectional_astar_button = ctk.CTkButton(
-        #     self.sidebar, text="Run Bidirectional A*", command=lambda: self.run_algorithm(BidirectionalAStar))
-        # self.bidirectional_astar_button.pack(pady=10, padx=20, fill="x")
+        # Add a button for each algorithm the registry marks for the GUI;
+        # an engine's module is imported when its button is first pressed.
+        self.algorithm_buttons = {}
+        for spec in registry.specs.values():
+            if not spec.gui:
+                continue
+            button = ctk.CTkButton(
+                self.sidebar, text=f"Run {spec.label}",
+                command=lambda name=spec.name: self.run_algorithm(registry.load(name)))
+            button.pack(pady=10, padx=20, fill="x")
+            self.algorithm_buttons[spec.name] = button
+
+        self.pause_button = ctk.CTkButton(
+            self.sidebar, text="Pause", command=self.toggle_pause, state="disabled")
+        self.pause_button.pack(pady=10, padx=20, fill="x")
+
+        self.stop_button = ctk.CTkButton(
+            self.sidebar, text="Stop", command=self.stop_search, state="disabled")
+        self.stop_button.pack(pady=10, padx=20, fill="x")
 
         self.environment = None
         self.current_algorithm = None
 
+        # Searches run on a SearchWorker thread; the UI drains its queue of
+        # expansion batches every frame_interval milliseconds.
+        self.search_worker = None
+        self.search_moves = []
+        self.search_job = None
+        self.frame_interval = 33
+
         self.logger.info("RobotNavigationApp initialized")
 
     def load_environment(self):
         try:
             filename = filedialog.askopenfilename(
-                filetypes=[("Text files", "*.txt")])
+                filetypes=[("Text files", "*.txt"), ("Compiled maps", "*.pfm")])
             if filename:
-                raw_data = read_input_file(filename)
-                self.environment = parse_environment(raw_data)
+                self.cancel_search()
+                self.environment = load_environment(filename)
                 self.visualizer.initialize_grid(self.environment)
                 self.logger.info(
-                    f"Environment loaded and visualized: {filename}")
+                    "Environment loaded and visualized: %s", filename)
         except Exception as e:
-            self.logger.error(f"Error loading environment: {str(e)}")
+            self.logger.error("Error loading environment: %s", e)
             messagebox.showerror(
                 "Error", f"Failed to load environment: {str(e)}")
 
     def clear_grid(self):
         try:
+            self.cancel_search()
             self.visualizer.clear_grid()
             self.environment = None
             self.current_algorithm = None
             self.logger.info("Grid cleared")
         except Exception as e:
-            self.logger.error(f"Error clearing grid: {str(e)}")
+            self.logger.error("Error clearing grid: %s", e)
             messagebox.showerror(
                 "Error", f"Failed to clear grid: {str(e)}")
 
     def generate_random_grid(self):
-        while True:
-            rows, cols = random.randint(5, 15), random.randint(5, 15)
-            start = (random.randint(0, cols-1), random.randint(0, rows-1))
-            goals = [(random.randint(0, cols-1), random.randint(0, rows-1))
-                     for _ in range(random.randint(1, 3))]
-
-            num_walls = random.randint(3, 10)
-            walls = []
-            for _ in range(num_walls):
-                x, y = random.randint(0, cols-1), random.randint(0, rows-1)
-                width, height = random.randint(1, 3), random.randint(1, 3)
-                walls.append((x, y, width, height))
-
-            self.environment = {
-                'dimensions': (rows, cols),
-                'start': start,
-                'goals': goals,
-                'walls': walls
-            }
-
-            # Check if the grid has a solution
-            bidirectional_astar = BidirectionalAStar(self.environment)
-            path = bidirectional_astar.run()
-
-            if path:
-                self.visualizer.initialize_grid(self.environment)
-                self.logger.info("Random grid generated with a valid solution")
-                messagebox.showinfo(
-                    "Random Grid", "A new random grid with a valid solution has been generated.")
-                break
-            else:
-                self.logger.info("Generated grid has no solution, retrying...")
+        self.cancel_search()
+        # Goals are placed inside the start's component, so every map is solvable.
+        self.environment = generate_environment(
+            random.randint(5, 15), random.randint(5, 15), density=random.uniform(0.05, 0.3),
+            goal_count=random.randint(1, 3), seed=random.randrange(2 ** 32))
+        self.visualizer.initialize_grid(self.environment)
+        self.logger.info("Random grid generated with a valid solution")
+        messagebox.showinfo(
+            "Random Grid", "A new random grid with a valid solution has been generated.")
 
     def run_algorithm(self, algorithm_class):
         if not self.environment:
@@ -153,24 +126,101 @@ class RobotNavigationApp:
             return
 
         try:
-            self.current_algorithm = algorithm_class(self.environment)
-            path = self.current_algorithm.run(self.update_visualizer)
-            if path:
-                self.logger.info(
-                    f"{algorithm_class.__name__} completed. Path found: {path}")
-                messagebox.showinfo(
-                    f"{algorithm_class.__name__} Complete", "Path to goal found!")
-            else:
+            self.cancel_search()
+            environment = reachable_environment(self.environment)
+            if environment is None:
                 self.logger.warning(
-                    f"{algorithm_class.__name__} completed. No path to goal found.")
+                    "%s skipped: no goal is reachable from the start", algorithm_class.__name__)
                 messagebox.showwarning(
                     f"{algorithm_class.__name__} Complete", "No path to goal found.")
+                return
+            self.current_algorithm = algorithm_class(environment)
+            self.visualizer.reset_moves()
+            self.search_moves = []
+            rows, cols = environment['dimensions']
+            self.search_worker = SearchWorker(
+                self.current_algorithm, delay=step_delay(rows * cols))
+            self.search_worker.start()
+            self.set_search_controls(True)
+            self.search_job = self.master.after(
+                self.frame_interval, self.poll_search)
         except Exception as e:
             self.logger.error(
-                f"Error running {algorithm_class.__name__}: {str(e)}")
+                "Error running %s: %s", algorithm_class.__name__, e)
             messagebox.showerror(
                 "Error", f"Failed to run {algorithm_class.__name__}: {str(e)}")
 
+    def poll_search(self):
+        """Drain the worker's queue, redraw once, and report the result when the search ends."""
+        algorithm_name = type(self.current_algorithm).__name__
+        self.search_job = None
+        outcome = None
+        while outcome is None:
+            try:
+                kind, payload = self.search_worker.updates.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'moves':
+                self.search_moves.extend(payload)
+            else:
+                outcome = kind, payload
+        self.update_visualizer(self.search_moves)
+
+        if outcome is None:
+            self.search_job = self.master.after(
+                self.frame_interval, self.poll_search)
+            return
+
+        self.search_worker = None
+        self.set_search_controls(False)
+        kind, payload = outcome
+        if kind == 'error':
+            self.logger.error("Error running %s: %s", algorithm_name, payload)
+            messagebox.showerror(
+                "Error", f"Failed to run {algorithm_name}: {str(payload)}")
+        elif kind == 'stopped':
+            self.logger.info(
+                "%s stopped after %s expansions", algorithm_name, len(self.search_moves))
+        elif payload:
+            self.logger.info(
+                "%s completed. Path found: %s", algorithm_name, payload)
+            messagebox.showinfo(
+                f"{algorithm_name} Complete", "Path to goal found!")
+        else:
+            self.logger.warning(
+                "%s completed. No path to goal found.", algorithm_name)
+            messagebox.showwarning(
+                f"{algorithm_name} Complete", "No path to goal found.")
+
+    def set_search_controls(self, running):
+        state = "normal" if running else "disabled"
+        self.pause_button.configure(state=state, text="Pause")
+        self.stop_button.configure(state=state)
+
+    def toggle_pause(self):
+        if self.search_worker is None:
+            return
+        if self.search_worker.paused:
+            self.search_worker.resume()
+            self.pause_button.configure(text="Pause")
+        else:
+            self.search_worker.pause()
+            self.pause_button.configure(text="Resume")
+
+    def stop_search(self):
+        """Ask the running search to stop; its partial moves stay on screen."""
+        if self.search_worker is not None:
+            self.search_worker.stop()
+
+    def cancel_search(self):
+        """Stop the current search, if one is running, and forget its pending updates."""
+        if self.search_job is not None:
+            self.master.after_cancel(self.search_job)
+            self.search_job = None
+        if self.search_worker is not None:
+            self.search_worker.stop()
+            self.search_worker = None
+            self.set_search_controls(False)
+
     def update_visualizer(self, moves):
-        self.visualizer.update_moves({move: 1 for move in moves})
-        self.master.update()
+        self.visualizer.update_moves(moves)
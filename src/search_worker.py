@@ -0,0 +1,98 @@
+import logging
+import queue
+import threading
+import time
+from src.algorithms.base import SearchAlgorithm
+
+logger = logging.getLogger(__name__)
+
+# Seconds between batches posted to the UI.
+POST_INTERVAL = 1 / 30
+# Small maps are paced so that a search over every cell takes about
+# ANIMATION_TIME seconds, but never slower than MAX_STEP_DELAY per
+# expansion. Below MIN_STEP_DELAY the search runs at full speed.
+ANIMATION_TIME = 3.0
+MAX_STEP_DELAY = 0.05
+MIN_STEP_DELAY = 0.001
+
+
+def step_delay(cells: int) -> float:
+    """Seconds per expansion that make a search over a map of this many cells watchable."""
+    delay = min(MAX_STEP_DELAY, ANIMATION_TIME / max(cells, 1))
+    return delay if delay >= MIN_STEP_DELAY else 0.0
+
+
+class SearchWorker(threading.Thread):
+    """
+    Runs a search on a background thread so the Tk main loop never blocks.
+
+    Newly expanded cells are posted to `updates` in batches, at most about
+    POST_INTERVAL apart, as ('moves', cells) messages. The run ends with one
+    of ('done', path), ('stopped', None) or ('error', exception). The UI
+    drains the queue on its own timer; stop() and pause()/resume() are
+    thread-safe and take effect before the next expansion. With a delay,
+    expansions are spaced that many seconds apart (see step_delay()), and a
+    stop cuts the wait short.
+    """
+
+    def __init__(self, algorithm: SearchAlgorithm, delay: float = 0.0):
+        super().__init__(name=f"search-{type(algorithm).__name__}", daemon=True)
+        self.algorithm = algorithm
+        self.updates: 'queue.Queue' = queue.Queue()
+        self.stop_requested = threading.Event()
+        self.unpaused = threading.Event()
+        self.unpaused.set()
+        self.delay = delay
+        self.posted = 0
+
+    def stop(self) -> None:
+        self.stop_requested.set()
+        self.unpaused.set()
+
+    def pause(self) -> None:
+        self.unpaused.clear()
+
+    def resume(self) -> None:
+        self.unpaused.set()
+
+    @property
+    def paused(self) -> bool:
+        return not self.unpaused.is_set()
+
+    def post_moves(self) -> None:
+        moves = self.algorithm.moves
+        if len(moves) > self.posted:
+            self.updates.put(('moves', moves[self.posted:]))
+            self.posted = len(moves)
+
+    def run(self) -> None:
+        try:
+            last_post = due = time.monotonic()
+            for _ in self.algorithm.steps():
+                now = time.monotonic()
+                if self.delay:
+                    due += self.delay
+                    if due > now:
+                        self.post_moves()
+                        self.stop_requested.wait(due - now)
+                        now = last_post = time.monotonic()
+                    else:
+                        # Fell behind; do not rush the next expansions to catch up.
+                        due = now
+                if not self.unpaused.is_set():
+                    self.post_moves()
+                    self.unpaused.wait()
+                    now = last_post = due = time.monotonic()
+                if self.stop_requested.is_set():
+                    self.post_moves()
+                    self.updates.put(('stopped', None))
+                    logger.info("%s stopped after %s expansions", self.name, len(self.algorithm.moves))
+                    return
+                if now - last_post >= POST_INTERVAL:
+                    self.post_moves()
+                    last_post = now
+            self.post_moves()
+            self.updates.put(('done', self.algorithm.path))
+        except Exception as e:
+            logger.error("%s failed: %s", self.name, e)
+            self.updates.put(('error', e))
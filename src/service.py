@@ -0,0 +1,216 @@
+import argparse
+import asyncio
+import ipaddress
+import json
+import logging
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from src.batch_runner import cached_environment, render_text, run_job
+from src.utils.connectivity import component_labels
+from src.utils.grid import Grid
+from src.utils.search_buffers import SearchBuffers
+
+logger = logging.getLogger(__name__)
+
+# Queries waiting for or running in a worker, per worker, before reads are paused.
+PENDING_PER_WORKER = 4
+
+
+def warm_maps(filenames: List[str]) -> None:
+    """
+    Worker initializer: parse and index the registered maps before the first
+    query, and allocate the search buffers for the last one.
+    """
+    for filename in filenames:
+        try:
+            environment = cached_environment(filename)
+            grid = Grid.from_environment(environment)
+            component_labels(grid)
+            SearchBuffers.acquire(grid).release(())
+        except Exception as e:
+            logger.error("Could not preload %s: %s", filename, e)
+
+
+def answer(request_id, filename: str, method: str) -> bytes:
+    """
+    Worker side of a query: run it with the batch runner's job and encode
+    the reply line here, so the event loop only copies bytes to the socket.
+    """
+    result = run_job(filename, method)
+    if 'error' not in result:
+        result['output'] = render_text(result)
+    if request_id is not None:
+        result['id'] = request_id
+    return (json.dumps(result) + "\n").encode()
+
+
+class PathfindingService:
+    """
+    Answers JSON Lines queries over a Unix socket or a localhost TCP port.
+
+    Each request line is an object such as
+    {"id": 7, "map": "warehouse", "method": "AS"}. "map" must be an id
+    registered with --map; clients cannot name files. Each reply line is the batch runner's result
+    record for the query: file, method, goal, num_nodes, path, moves and
+    wall_time, plus "output" holding the single-run text. The request's "id"
+    is echoed back. A connection may pipeline requests, and replies come
+    back as queries finish, so they can arrive out of order. {"op": "ping"}
+    and {"op": "stats"} are answered by the server itself.
+
+    Searches run in a process pool. Every worker keeps its own LRU of parsed
+    maps (see batch_runner.cached_environment), and the per-map indexes are
+    cached by fingerprint in each worker. Registered maps are loaded and
+    indexed when a worker starts, so a query costs its search plus one round
+    trip to a worker, not interpreter startup and parsing.
+    """
+
+    def __init__(self, maps: Dict[str, str], workers: Optional[int] = None):
+        self.maps = maps
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_maps,
+                                        initargs=(sorted(set(maps.values())),))
+        self.pending: Optional[asyncio.Semaphore] = None  # created on the serving loop
+        self.served = 0
+        self.connections = 0
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                # Holding a slot before reading on throttles clients that outpace the workers.
+                await self.pending.acquire()
+                task = asyncio.ensure_future(self.reply(line, writer))
+                tasks.add(task)
+                task.add_done_callback(lambda done: (tasks.discard(done), self.pending.release()))
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError as e:
+            logger.info("Client disconnected: %s", e)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.connections -= 1
+            writer.close()
+
+    async def reply(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        writer.write(await self.respond(line))
+        await writer.drain()
+
+    async def respond(self, line: bytes) -> bytes:
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("a request must be a JSON object")
+        except ValueError as e:
+            return self.encode({'error': f"invalid request: {str(e)}"})
+        request_id = request.get('id')
+
+        op = request.get('op', 'query')
+        if op == 'ping':
+            return self.encode({'id': request_id, 'ok': True})
+        if op == 'stats':
+            return self.encode({'id': request_id, 'served': self.served, 'workers': self.workers,
+                                'connections': self.connections, 'maps': sorted(self.maps)})
+        if op != 'query':
+            return self.encode({'id': request_id, 'error': f"unknown op: {op}"})
+        if not isinstance(request.get('map'), str) or not isinstance(request.get('method'), str):
+            return self.encode({'id': request_id, 'error': "a query needs 'map' and 'method' strings"})
+
+        filename = self.maps.get(request['map'])
+        if filename is None:
+            return self.encode({'id': request_id, 'error': f"unknown map: {request['map']}"})
+        loop = asyncio.get_running_loop()
+        try:
+            reply = await loop.run_in_executor(self.pool, answer, request_id, filename, request['method'])
+        except Exception as e:
+            logger.error("Query %s %s failed in the worker pool: %s", filename, request['method'], e)
+            return self.encode({'id': request_id, 'error': str(e)})
+        self.served += 1
+        return reply
+
+    @staticmethod
+    def encode(record: Dict) -> bytes:
+        if record.get('id') is None:
+            record.pop('id', None)
+        return (json.dumps(record) + "\n").encode()
+
+    async def serve(self, socket_path: Optional[str] = None, host: str = '127.0.0.1',
+                    port: Optional[int] = None) -> None:
+        """
+        Listen until SIGINT or SIGTERM, then finish the running queries and
+        shut the pool down. TCP is only served on a loopback address.
+        """
+        if not socket_path and not is_loopback(host):
+            raise ValueError(f"Refusing to listen on {host}: only loopback addresses are allowed")
+        self.pending = asyncio.Semaphore(self.workers * PENDING_PER_WORKER)
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            server = await asyncio.start_unix_server(self.handle_connection, path=socket_path)
+            address = socket_path
+        else:
+            server = await asyncio.start_server(self.handle_connection, host=host, port=port)
+            address = "%s:%s" % server.sockets[0].getsockname()[:2]
+
+        stopped = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signal_number, stopped.set)
+        logger.info("Pathfinding service listening on %s with %s workers", address, self.workers)
+        print(f"Listening on {address}", flush=True)
+
+        try:
+            await stopped.wait()
+        finally:
+            server.close()
+            await server.wait_closed()
+            self.pool.shutdown()
+            if socket_path and os.path.exists(socket_path):
+                os.unlink(socket_path)
+            logger.info("Pathfinding service stopped after %s queries", self.served)
+
+
+def is_loopback(host: str) -> bool:
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def parse_map_option(option: str) -> List[str]:
+    if '=' not in option:
+        return [os.path.splitext(os.path.basename(option))[0], option]
+    return option.split('=', 1)
+
+
+def serve_main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="command_line_main.py serve",
+        description="Answer pathfinding queries over a socket, keeping maps loaded between queries.")
+    listen = parser.add_mutually_exclusive_group(required=True)
+    listen.add_argument("--socket", help="Unix socket path to listen on")
+    listen.add_argument("--port", type=int, help="localhost TCP port to listen on")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="loopback address to bind with --port (default 127.0.0.1)")
+    parser.add_argument("--map", action="append", default=[], metavar="[ID=]FILE",
+                        help="preload a map under an id (default: the file name without extension)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="number of worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    if not is_loopback(args.host):
+        parser.error(f"--host must be a loopback address, not {args.host}")
+
+    maps = dict(parse_map_option(option) for option in args.map)
+    service = PathfindingService(maps, args.workers)
+    asyncio.run(service.serve(args.socket, args.host, args.port))
+    return 0
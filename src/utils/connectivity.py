@@ -0,0 +1,126 @@
+import logging
+import re
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from src.utils.grid import Grid, UNVISITED
+
+logger = logging.getLogger(__name__)
+
+OPEN_RUN = re.compile(b'\x00+')
+# Labelled maps kept in memory, most recently used last.
+CACHE_SIZE = 8
+
+_labels: 'OrderedDict[bytes, ComponentLabels]' = OrderedDict()
+
+
+class ComponentLabels:
+    """
+    Connected components of the open cells, labelled in one pass.
+
+    Every column is split into runs of open cells, and each run is merged by
+    union-find with the runs of the previous column it overlaps. The work is
+    proportional to the number of runs rather than cells. Walls are labelled
+    UNVISITED, and open cells get component labels 0..count-1.
+    """
+
+    def __init__(self, grid: Grid):
+        self.offsets = grid.offsets
+        self.labels = grid.new_cost_array()
+        self.sizes: List[int] = []
+        self._label(grid)
+
+    @property
+    def count(self) -> int:
+        return len(self.sizes)
+
+    def _label(self, grid: Grid) -> None:
+        runs: List[Tuple[int, int]] = []
+        parent: List[int] = []
+
+        def find(run: int) -> int:
+            while parent[run] != run:
+                parent[run] = parent[parent[run]]
+                run = parent[run]
+            return run
+
+        previous: List[Tuple[int, int, int]] = []
+        for x in range(grid.cols):
+            first = grid.index(x, 0)
+            column = bytes(grid.blocked[first:first + grid.rows])
+            current = []
+            j = 0
+            for match in OPEN_RUN.finditer(column):
+                low, high = match.span()
+                run = len(runs)
+                runs.append((first + low, first + high))
+                parent.append(run)
+                current.append((low, high, run))
+                # Runs are sorted, so previous runs ending before this one never overlap a later one.
+                while j < len(previous) and previous[j][1] <= low:
+                    j += 1
+                k = j
+                while k < len(previous) and previous[k][0] < high:
+                    root, other = find(run), find(previous[k][2])
+                    if root != other:
+                        parent[max(root, other)] = min(root, other)
+                    k += 1
+            previous = current
+
+        label_of = {}
+        labels, sizes = self.labels, self.sizes
+        for run, (low, high) in enumerate(runs):
+            root = find(run)
+            label = label_of.get(root)
+            if label is None:
+                label = label_of[root] = len(sizes)
+                sizes.append(0)
+            labels[low:high] = array('i', [label]) * (high - low)
+            sizes[label] += high - low
+
+    def components_from(self, start: int) -> Set[int]:
+        """Labels a search from start can enter; a start inside a wall can step into any open neighbor."""
+        labels = self.labels
+        reachable = {labels[start + offset] for offset in self.offsets + (0,)}
+        reachable.discard(UNVISITED)
+        return reachable
+
+    def reachable_goals(self, start: int, goals: Iterable[int]) -> List[int]:
+        """The goal ids that lie in a component reachable from start."""
+        components = self.components_from(start)
+        return [goal for goal in goals if goal == start or self.labels[goal] in components]
+
+
+def component_labels(grid: Grid) -> ComponentLabels:
+    """Return the component labels of grid, labelling each distinct map only once."""
+    key = grid.fingerprint()
+    components = _labels.get(key)
+    if components is not None:
+        _labels.move_to_end(key)
+        return components
+    components = ComponentLabels(grid)
+    logger.info("Labelled %s connected components", components.count)
+    _labels[key] = components
+    while len(_labels) > CACHE_SIZE:
+        _labels.popitem(last=False)
+    return components
+
+
+def reachable_environment(environment: Dict) -> Optional[Dict]:
+    """
+    Returns the environment limited to the goals reachable from the start,
+    or None when no goal is, so callers can reject the query without
+    searching. The environment itself is returned when nothing is dropped.
+    A start outside the map reaches nothing.
+    """
+    grid = Grid.from_environment(environment)
+    if not grid.in_bounds(*environment['start']):
+        return None
+    start = grid.index(*environment['start'])
+    goals = grid.ids(environment['goals'])
+    reachable = component_labels(grid).reachable_goals(start, goals)
+    if not reachable:
+        return None
+    if len(reachable) == len(environment['goals']):
+        return environment
+    return dict(environment, goals=[grid.coords(goal) for goal in reachable])
@@ -0,0 +1,127 @@
+import logging
+from array import array
+from collections import OrderedDict, deque
+from typing import FrozenSet, Iterable, List, Tuple
+from src.utils.grid import Grid, UNVISITED
+from src.utils import wavefront
+
+logger = logging.getLogger(__name__)
+
+# Total size of the distance arrays kept by the shared cache.
+DEFAULT_BUDGET = 256 * 1024 * 1024
+
+
+class DistanceField:
+    """
+    Distance from every cell to the nearest goal, computed once by a
+    multi-source breadth-first search out of the goals (the NumPy wavefront
+    when it is installed).
+
+    Walls and unreachable cells hold UNVISITED. Any start then gets a
+    shortest path by steepest descent in O(path length), without searching.
+    """
+
+    def __init__(self, grid: Grid, goals: Iterable[int]):
+        self.stride = grid.stride
+        self.offsets = grid.offsets
+        self.goals: FrozenSet[int] = frozenset(goals)
+        self.distance = self.build(grid, self.goals)
+
+    @staticmethod
+    def build(grid: Grid, goals: FrozenSet[int]) -> array:
+        blocked, offsets = grid.blocked, grid.offsets
+        # A goal inside a wall can only be reached by starting on it.
+        sources = [goal for goal in sorted(goals) if not blocked[goal]]
+        if wavefront.AVAILABLE:
+            distance = array('i')
+            distance.frombytes(wavefront.wavefront(grid, sources).tobytes())
+            return distance
+
+        distance = grid.new_cost_array()
+        for source in sources:
+            distance[source] = 0
+        queue = deque(sources)
+        while queue:
+            current = queue.popleft()
+            next_distance = distance[current] + 1
+            for offset in offsets:
+                neighbor = current + offset
+                if distance[neighbor] == UNVISITED and not blocked[neighbor]:
+                    distance[neighbor] = next_distance
+                    queue.append(neighbor)
+        return distance
+
+    def coords(self, cell: int) -> Tuple[int, int]:
+        # Same as Grid.coords; keeping the grid's bound method would pin the
+        # whole map in memory outside the cache's byte budget.
+        x, y = divmod(cell, self.stride)
+        return x - 1, y - 1
+
+    @property
+    def nbytes(self) -> int:
+        return self.distance.itemsize * len(self.distance)
+
+    def path_from(self, start: int) -> List[Tuple[int, int]]:
+        """Shortest path from start to the nearest goal, or [] if none is reachable."""
+        if start in self.goals:
+            return [self.coords(start)]
+        distance, offsets = self.distance, self.offsets
+        path = [self.coords(start)]
+        current = start
+        if distance[start] == UNVISITED:
+            # Walls are not in the field, but a start inside one may still step out.
+            reachable = [start + offset for offset in offsets
+                         if distance[start + offset] != UNVISITED]
+            if not reachable:
+                return []
+            current = min(reachable, key=distance.__getitem__)
+            path.append(self.coords(current))
+        while distance[current]:
+            target = distance[current] - 1
+            for offset in offsets:
+                if distance[current + offset] == target:
+                    current += offset
+                    break
+            path.append(self.coords(current))
+        return path
+
+
+class DistanceFieldCache:
+    """
+    Distance fields keyed by (map fingerprint, goal set). Least recently used
+    fields are evicted once their arrays exceed the byte budget, always
+    keeping the newest one.
+    """
+
+    def __init__(self, budget: int = DEFAULT_BUDGET):
+        self.budget = budget
+        self.fields: 'OrderedDict[Tuple[bytes, FrozenSet[int]], DistanceField]' = OrderedDict()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def get(self, grid: Grid, goals: Iterable[int]) -> DistanceField:
+        """Return the field for grid and goal ids, building it on a miss."""
+        key = (grid.fingerprint(), frozenset(goals))
+        field = self.fields.get(key)
+        if field is not None:
+            self.fields.move_to_end(key)
+            return field
+
+        field = DistanceField(grid, key[1])
+        logger.info("Distance field built for %s goals", len(key[1]))
+        self.fields[key] = field
+        self.nbytes += field.nbytes
+        while self.nbytes > self.budget and len(self.fields) > 1:
+            _, evicted = self.fields.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+        return field
+
+    def clear(self) -> None:
+        self.fields.clear()
+        self.nbytes = 0
+
+
+# Shared by every DistanceFieldSearch in this process.
+distance_fields = DistanceFieldCache()
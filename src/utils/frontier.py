@@ -0,0 +1,288 @@
+from array import array
+from typing import Any, List, Tuple
+
+ABSENT = -1
+
+
+class IndexedHeap:
+    """
+    Binary min-heap over integer items (cell ids) with a position map.
+
+    Membership tests, priority lookups and decrease-key are O(1)/O(log n)
+    instead of scanning the heap. Ties are broken on the item itself, so pop
+    order matches a plain heapq of (priority, item) tuples. Priorities may be
+    any comparable value, including tuples. `pushes` counts insertions and
+    priority changes, for profiling.
+    """
+
+    def __init__(self, capacity: int):
+        self.heap: List[Tuple[Any, int]] = []
+        self.position = array('i', [ABSENT]) * capacity
+        self.pushes = 0
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __bool__(self) -> bool:
+        return bool(self.heap)
+
+    def __contains__(self, item: int) -> bool:
+        return self.position[item] != ABSENT
+
+    def priority(self, item: int) -> Any:
+        return self.heap[self.position[item]][0]
+
+    def peek(self) -> Tuple[Any, int]:
+        """Return the (priority, item) pair at the top without removing it."""
+        return self.heap[0]
+
+    def push(self, item: int, priority: Any) -> None:
+        self.pushes += 1
+        self.heap.append((priority, item))
+        self.position[item] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+
+    def pop(self) -> int:
+        """Remove and return the item with the smallest priority."""
+        return self.pop_with_priority()[1]
+
+    def pop_with_priority(self) -> Tuple[Any, int]:
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        self.position[top[1]] = ABSENT
+        if heap:
+            heap[0] = last
+            self.position[last[1]] = 0
+            self._sift_down(0)
+        return top
+
+    def decrease_key(self, item: int, priority: Any) -> None:
+        self.pushes += 1
+        index = self.position[item]
+        self.heap[index] = (priority, item)
+        self._sift_up(index)
+
+    def update(self, item: int, priority: Any) -> None:
+        """Insert item, or move it to a new priority in either direction."""
+        index = self.position[item]
+        if index == ABSENT:
+            self.push(item, priority)
+            return
+        self.pushes += 1
+        old = self.heap[index]
+        self.heap[index] = (priority, item)
+        if (priority, item) < old:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def remove(self, item: int) -> None:
+        index = self.position[item]
+        heap = self.heap
+        last = heap.pop()
+        self.position[item] = ABSENT
+        if index < len(heap):
+            old = heap[index]
+            heap[index] = last
+            self.position[last[1]] = index
+            if last < old:
+                self._sift_up(index)
+            else:
+                self._sift_down(index)
+
+    def clear(self) -> None:
+        """Empty the heap in time proportional to the items left in it, keeping `pushes`."""
+        position = self.position
+        for _, item in self.heap:
+            position[item] = ABSENT
+        self.heap = []
+
+    def _sift_up(self, index: int) -> None:
+        heap, position = self.heap, self.position
+        entry = heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if entry < heap[parent]:
+                heap[index] = heap[parent]
+                position[heap[index][1]] = index
+                index = parent
+            else:
+                break
+        heap[index] = entry
+        position[entry[1]] = index
+
+    def _sift_down(self, index: int) -> None:
+        heap, position = self.heap, self.position
+        size = len(heap)
+        entry = heap[index]
+        child = 2 * index + 1
+        while child < size:
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if heap[child] < entry:
+                heap[index] = heap[child]
+                position[heap[index][1]] = index
+                index = child
+                child = 2 * index + 1
+            else:
+                break
+        heap[index] = entry
+        position[entry[1]] = index
+
+
+class BucketQueue:
+    """
+    Dial-style bucket queue for small non-negative integer priorities.
+
+    Every operation is O(1) amortized, which makes it the natural frontier for
+    unit-cost 4-connected searches where f-values only grow by 0 or 2 per
+    step. Items within one bucket are popped last-in first-out, which prefers
+    the deepest node among equal f-values. Removal from the middle of a bucket
+    swaps in the bucket's last item, tracked through the position map.
+    `pushes` counts insertions, including the re-insertion of a decrease-key.
+    """
+
+    def __init__(self, capacity: int):
+        self.buckets: List[List[int]] = []
+        self.position = array('i', [ABSENT]) * capacity
+        self.bucket_of = array('i', [ABSENT]) * capacity
+        self.cursor = 0
+        self.size = 0
+        self.pushes = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    def __contains__(self, item: int) -> bool:
+        return self.position[item] != ABSENT
+
+    def priority(self, item: int) -> int:
+        return self.bucket_of[item]
+
+    def push(self, item: int, priority: int) -> None:
+        buckets = self.buckets
+        while len(buckets) <= priority:
+            buckets.append([])
+        bucket = buckets[priority]
+        self.pushes += 1
+        self.position[item] = len(bucket)
+        self.bucket_of[item] = priority
+        bucket.append(item)
+        self.size += 1
+        if priority < self.cursor:
+            self.cursor = priority
+
+    def peek(self) -> Tuple[int, int]:
+        """Return the (priority, item) pair that pop() would take, without removing it."""
+        buckets = self.buckets
+        cursor = self.cursor
+        while not buckets[cursor]:
+            cursor += 1
+        self.cursor = cursor
+        return cursor, buckets[cursor][-1]
+
+    def pop(self) -> int:
+        """Remove and return an item with the smallest priority."""
+        return self.pop_with_priority()[1]
+
+    def pop_with_priority(self) -> Tuple[int, int]:
+        buckets = self.buckets
+        cursor = self.cursor
+        while not buckets[cursor]:
+            cursor += 1
+        self.cursor = cursor
+        item = buckets[cursor].pop()
+        self.position[item] = ABSENT
+        self.bucket_of[item] = ABSENT
+        self.size -= 1
+        return cursor, item
+
+    def remove(self, item: int) -> None:
+        bucket = self.buckets[self.bucket_of[item]]
+        index = self.position[item]
+        last = bucket.pop()
+        if last != item:
+            bucket[index] = last
+            self.position[last] = index
+        self.position[item] = ABSENT
+        self.bucket_of[item] = ABSENT
+        self.size -= 1
+
+    def decrease_key(self, item: int, priority: int) -> None:
+        self.remove(item)
+        self.push(item, priority)
+
+    def update(self, item: int, priority: int) -> None:
+        """Insert item, or move it to a new priority."""
+        if self.position[item] != ABSENT:
+            self.remove(item)
+        self.push(item, priority)
+
+    def clear(self) -> None:
+        """Empty the queue in time proportional to the items left in it, keeping `pushes`."""
+        position, bucket_of = self.position, self.bucket_of
+        for bucket in self.buckets:
+            for item in bucket:
+                position[item] = ABSENT
+                bucket_of[item] = ABSENT
+        self.buckets = []
+        self.cursor = 0
+        self.size = 0
+
+
+class RadixHeap:
+    """
+    Monotone radix heap for non-negative integer priorities.
+
+    Each entry sits in the bucket numbered by the highest bit in which its
+    priority differs from the last popped one, so a pop only scans up to 65
+    buckets and every entry is redistributed at most once per bit. That
+    suits Dijkstra and consistent-heuristic A* over small integer step
+    costs, where the spread of open priorities can be wide. Pushes must not
+    go below the last popped priority. There is no decrease-key: callers
+    push again and skip stale entries on pop, so len() counts those too.
+    """
+
+    def __init__(self):
+        self.buckets: List[List[Tuple[int, int]]] = [[] for _ in range(65)]
+        self.last = 0
+        self.size = 0
+        self.pushes = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    def push(self, item: int, priority: int) -> None:
+        if priority < self.last:
+            raise ValueError(f"priority {priority} is below the last popped priority {self.last}")
+        self.buckets[(priority ^ self.last).bit_length()].append((priority, item))
+        self.size += 1
+        self.pushes += 1
+
+    def pop(self) -> int:
+        """Remove and return an item with the smallest priority."""
+        return self.pop_with_priority()[1]
+
+    def pop_with_priority(self) -> Tuple[int, int]:
+        buckets = self.buckets
+        if not buckets[0]:
+            index = 1
+            while not buckets[index]:
+                index += 1
+            # Every entry of the lowest non-empty bucket moves to a lower one
+            # once its minimum becomes the new reference priority.
+            entries = buckets[index]
+            buckets[index] = []
+            last = self.last = min(entries)[0]
+            for entry in entries:
+                buckets[(entry[0] ^ last).bit_length()].append(entry)
+        self.size -= 1
+        priority, item = buckets[0].pop()
+        return priority, item
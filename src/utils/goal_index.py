@@ -0,0 +1,85 @@
+import math
+from typing import Callable, Dict, Iterable, List, Tuple
+from src.utils.pathfinding_utils import manhattan_distance
+
+Metric = Callable[[Tuple[int, int], Tuple[int, int]], float]
+
+
+class GoalIndex:
+    """
+    Answers "distance to the nearest goal" without scanning every goal.
+
+    Goals are bucketed into square tiles sized so each tile holds about one
+    goal. A query scans tiles in growing rings around the query tile and stops
+    once the ring is provably farther than the best goal found. Every supported
+    metric (Manhattan, octile, Euclidean, Chebyshev) is at least the larger
+    axis distance, which is what the ring bound relies on. Small goal sets are
+    simply scanned.
+    """
+
+    LINEAR_SCAN_LIMIT = 8
+
+    def __init__(self, goals: Iterable[Tuple[int, int]], metric: Metric = manhattan_distance):
+        self.goals = list(dict.fromkeys(goals))
+        self.metric = metric
+        self.tiles: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        if len(self.goals) <= self.LINEAR_SCAN_LIMIT:
+            return
+
+        xs = [x for x, _ in self.goals]
+        ys = [y for _, y in self.goals]
+        self.min_x, self.min_y = min(xs), min(ys)
+        area = (max(xs) - self.min_x + 1) * (max(ys) - self.min_y + 1)
+        self.tile_size = max(1, int(math.sqrt(area / len(self.goals))))
+        for goal in self.goals:
+            self.tiles.setdefault(self.tile_of(goal), []).append(goal)
+        self.max_tile_x = max(tx for tx, _ in self.tiles)
+        self.max_tile_y = max(ty for _, ty in self.tiles)
+
+    def tile_of(self, node: Tuple[int, int]) -> Tuple[int, int]:
+        return ((node[0] - self.min_x) // self.tile_size,
+                (node[1] - self.min_y) // self.tile_size)
+
+    def __call__(self, node: Tuple[int, int]) -> float:
+        return self.distance(node)
+
+    def distance(self, node: Tuple[int, int]) -> float:
+        """Return the metric distance from node to the nearest goal, or infinity without goals."""
+        metric = self.metric
+        if not self.tiles:
+            return min((metric(node, goal) for goal in self.goals), default=math.inf)
+
+        # Rings start from the occupied tile nearest the query. Clamping never
+        # brings a tile closer, so a tile in ring r around the clamped tile is
+        # still at least r tiles from the query's own tile, and a query far
+        # outside the goals' bounding box scans no empty rings to reach it.
+        tx, ty = self.tile_of(node)
+        tx = min(max(tx, 0), self.max_tile_x)
+        ty = min(max(ty, 0), self.max_tile_y)
+        last_ring = max(tx, self.max_tile_x - tx, ty, self.max_tile_y - ty)
+        best = math.inf
+        for ring in range(last_ring + 1):
+            if ring and (ring - 1) * self.tile_size + 1 >= best:
+                break
+            for tile in self._ring(tx, ty, ring):
+                for goal in self.tiles.get(tile, ()):
+                    d = metric(node, goal)
+                    if d < best:
+                        best = d
+        return best
+
+    def _ring(self, tx: int, ty: int, ring: int) -> Iterable[Tuple[int, int]]:
+        """Tiles at Chebyshev distance ring from (tx, ty) that lie in the occupied tile range."""
+        if ring == 0:
+            yield tx, ty
+            return
+        x0, x1 = max(tx - ring, 0), min(tx + ring, self.max_tile_x)
+        y0, y1 = max(ty - ring + 1, 0), min(ty + ring - 1, self.max_tile_y)
+        for y in (ty - ring, ty + ring):
+            if 0 <= y <= self.max_tile_y:
+                for x in range(x0, x1 + 1):
+                    yield x, y
+        for x in (tx - ring, tx + ring):
+            if 0 <= x <= self.max_tile_x:
+                for y in range(y0, y1 + 1):
+                    yield x, y
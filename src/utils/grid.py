@@ -0,0 +1,192 @@
+import hashlib
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+UNVISITED = -1
+# Largest step cost a cost rectangle may assign; the cost array is uint16 at most.
+MAX_COST = 0xFFFF
+
+
+class Grid:
+    """
+    Compact occupancy grid shared by every search algorithm.
+
+    Cells are addressed by integer ids laid out column by column (x-major)
+    with a one cell wall border around the map, so neighbor lookups are plain
+    offset additions without bounds checks. Because ids grow with (x, y) in
+    lexicographic order, comparing ids orders cells exactly like comparing
+    their coordinate tuples.
+
+    Maps with weighted terrain also carry `cost`, the cost of stepping into
+    each cell, as a uint8 array (uint16 once any cost exceeds 255) in the
+    same layout. It is None on unit-cost maps, which every engine treats as
+    a cost of 1 per step.
+    """
+
+    def __init__(self, rows: int, cols: int, blocked: Optional[Union[bytearray, memoryview]] = None):
+        self.rows = rows
+        self.cols = cols
+        self.stride = rows + 2
+        self.size = (cols + 2) * self.stride
+        if blocked is None:
+            blocked = bytearray(self.size)
+            self._fill_border(blocked)
+        self.blocked = blocked
+        self.cost: Optional[array] = None
+        self._fingerprint: Optional[bytes] = None
+        # Same order as the historical direction list: (0, 1), (1, 0), (0, -1), (-1, 0)
+        self.offsets = (1, self.stride, -1, -self.stride)
+
+    @classmethod
+    def from_environment(cls, environment: Dict) -> 'Grid':
+        """Return the grid for an environment, building and caching it on first use."""
+        grid = environment.get('grid')
+        if grid is None:
+            rows, cols = environment['dimensions']
+            grid = cls(rows, cols)
+            grid.add_walls(environment['walls'])
+            grid.add_costs(environment.get('costs', ()))
+            environment['grid'] = grid
+        return grid
+
+    def _fill_border(self, blocked: bytearray) -> None:
+        stride = self.stride
+        blocked[0:stride] = b'\x01' * stride
+        blocked[self.size - stride:self.size] = b'\x01' * stride
+        blocked[0:self.size:stride] = b'\x01' * (self.cols + 2)
+        blocked[stride - 1:self.size:stride] = b'\x01' * (self.cols + 2)
+
+    def _fill_rect(self, target, rect: Iterable[int], value: int) -> None:
+        x, y, width, height = rect
+        # Clip to the map so oversized rectangles never touch the border
+        x0, x1 = max(x, 0), min(x + width, self.cols)
+        y0, y1 = max(y, 0), min(y + height, self.rows)
+        if x0 >= x1 or y0 >= y1:
+            return
+        stride = self.stride
+        # Runs must match the target's type: bytes for occupancy, a typed array for costs.
+        unit = array(target.typecode, [value]) if isinstance(target, array) else bytes([value])
+        # One slice assignment per column or per row, whichever is fewer.
+        if x1 - x0 <= y1 - y0:
+            run = unit * (y1 - y0)
+            for column in range(x0, x1):
+                start = (column + 1) * stride + y0 + 1
+                target[start:start + len(run)] = run
+        else:
+            run = unit * (x1 - x0)
+            first, last = (x0 + 1) * stride, x1 * stride + 1
+            for row in range(y0 + 1, y1 + 1):
+                target[first + row:last + row:stride] = run
+
+    def add_walls(self, walls: Iterable[Iterable[int]]) -> None:
+        """Mark every (x, y, width, height) rectangle as blocked."""
+        for wall in walls:
+            self._fill_rect(self.blocked, wall, 1)
+        self.mark_changed()
+
+    def remove_walls(self, walls: Iterable[Iterable[int]]) -> None:
+        """Clear every (x, y, width, height) rectangle."""
+        for wall in walls:
+            self._fill_rect(self.blocked, wall, 0)
+        self.mark_changed()
+
+    def add_costs(self, costs: Iterable[Iterable[int]]) -> None:
+        """
+        Set the step cost of every (x, y, width, height, cost) rectangle;
+        later rectangles override earlier ones where they overlap. The cost
+        array is only allocated by the first rectangle.
+        """
+        costs = list(costs)
+        if not costs:
+            return
+        highest = max(rect[4] for rect in costs)
+        if min(rect[4] for rect in costs) < 1 or highest > MAX_COST:
+            raise ValueError(f"Step costs must be between 1 and {MAX_COST}")
+        typecode = 'B' if highest <= 0xFF else 'H'
+        if self.cost is None:
+            self.cost = array(typecode, [1]) * self.size
+        elif typecode == 'H' and self.cost.typecode == 'B':
+            self.cost = array('H', self.cost)
+        for x, y, width, height, cost in costs:
+            self._fill_rect(self.cost, (x, y, width, height), cost)
+        self.mark_changed()
+
+    def copy(self) -> 'Grid':
+        grid = Grid(self.rows, self.cols, bytearray(self.blocked))
+        if self.cost is not None:
+            grid.cost = array(self.cost.typecode, self.cost)
+        grid._fingerprint = self._fingerprint
+        return grid
+
+    def mark_changed(self) -> None:
+        """Forget the cached fingerprint; call after writing to blocked or cost directly."""
+        self._fingerprint = None
+
+    def fingerprint(self) -> bytes:
+        """
+        Content hash of the dimensions, occupancy and step costs, for keying
+        per-map caches. It is computed once and kept until the map changes.
+        """
+        if self._fingerprint is not None:
+            return self._fingerprint
+        digest = hashlib.blake2b(f"{self.rows}x{self.cols}".encode(), digest_size=16)
+        digest.update(self.blocked)
+        if self.cost is not None:
+            digest.update(self.cost.typecode.encode())
+            digest.update(self.cost)
+        self._fingerprint = digest.digest()
+        return self._fingerprint
+
+    def index(self, x: int, y: int) -> int:
+        """Return the cell id of (x, y)."""
+        return (x + 1) * self.stride + y + 1
+
+    def coords(self, cell: int) -> Tuple[int, int]:
+        """Return the (x, y) coordinates of a cell id."""
+        x, y = divmod(cell, self.stride)
+        return x - 1, y - 1
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.cols and 0 <= y < self.rows
+
+    def is_free(self, x: int, y: int) -> bool:
+        """Check if (x, y) is inside the map and not a wall."""
+        return self.in_bounds(x, y) and not self.blocked[self.index(x, y)]
+
+    def neighbors(self, cell: int) -> List[int]:
+        """Return the ids of the open 4-connected neighbors of a cell."""
+        blocked = self.blocked
+        return [cell + offset for offset in self.offsets if not blocked[cell + offset]]
+
+    def ids(self, cells: Iterable[Tuple[int, int]]) -> List[int]:
+        """Return the ids of the cells that lie inside the map."""
+        return [self.index(x, y) for x, y in cells if self.in_bounds(x, y)]
+
+    def new_parent_array(self) -> array:
+        """Flat parent table, UNVISITED everywhere."""
+        return array('i', [UNVISITED]) * self.size
+
+    def new_cost_array(self, fill: int = UNVISITED) -> array:
+        """Flat integer cost table (g-scores, depths, distances)."""
+        return array('i', [fill]) * self.size
+
+    def new_visited(self) -> bytearray:
+        """Flat visited/closed flags."""
+        return bytearray(self.size)
+
+    def path_cost(self, path: Iterable[Tuple[int, int]]) -> int:
+        """Total cost of the steps along a path of coordinates; the start cell is free."""
+        cells = [self.index(x, y) for x, y in path][1:]
+        if self.cost is None:
+            return len(cells)
+        cost = self.cost
+        return sum(cost[cell] for cell in cells)
+
+    def reconstruct_path(self, parent: array, goal: int) -> List[Tuple[int, int]]:
+        """Walk a flat parent table back from goal and return the path as coordinates."""
+        path = []
+        current = goal
+        while current != UNVISITED:
+            path.append(self.coords(current))
+            current = parent[current]
+        return list(reversed(path))
@@ -1,13 +1,78 @@
+import atexit
 import logging
-from datetime import datetime
+import logging.handlers
 import os
+import queue
+import sys
+import threading
+from datetime import datetime
+
+DEFAULT_LEVEL = "INFO"
+# Records one call site may log per RATE_INTERVAL seconds before the rest are dropped.
+RATE_BURST = 20
+RATE_INTERVAL = 1.0
+
+# (queue handler, listener, file handler) of the running pipeline
+_pipeline = None
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Caps how often a single call site can log.
 
+    Records are keyed by their source line. After `burst` records within
+    `interval` seconds, further records from that line are dropped until the
+    window ends, and the first record of the next window reports how many
+    were suppressed. Warnings and errors always pass. Dropped records are
+    never formatted or queued.
+    """
 
-def setup_logging(log_dir="logs"):
+    def __init__(self, burst: int = RATE_BURST, interval: float = RATE_INTERVAL):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.windows = {}  # (pathname, lineno) -> [window start, records, suppressed]
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.pathname, record.lineno)
+        with self.lock:
+            window = self.windows.get(key)
+            if window is None or record.created - window[0] >= self.interval:
+                suppressed = window[2] if window is not None else 0
+                self.windows[key] = [record.created, 1, 0]
+            elif window[1] < self.burst:
+                window[1] += 1
+                return True
+            else:
+                window[2] += 1
+                return False
+        if suppressed:
+            record.args = (record.getMessage(), suppressed)
+            record.msg = "%s (%d similar messages suppressed)"
+        return True
+
+
+def setup_logging(log_dir="logs", level=None):
+    """
+    Sends all logging through a queue to a background thread that writes the
+    log file, so callers never wait on file I/O. The level comes from level,
+    else the PATHFINDER_LOG_LEVEL environment variable, else INFO. Records
+    are rate-limited per call site (see RateLimitFilter). Calling it again
+    replaces the previous pipeline; it is flushed and stopped at exit.
+    """
     # Create logs directory if it doesn't exist
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
 
+    level = level or os.environ.get("PATHFINDER_LOG_LEVEL") or DEFAULT_LEVEL
+    if isinstance(level, str):
+        if not isinstance(logging.getLevelName(level.upper()), int):
+            raise ValueError(f"Unknown log level: {level}")
+        level = level.upper()
+
     # Create a valid filename
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     log_filename = f"pathfinderlog-{timestamp}.log"
@@ -18,9 +83,66 @@ def setup_logging(log_dir="logs"):
         style="{",
         datefmt="%Y-%m-%d %H:%M",
     )
-    handler = logging.FileHandler(log_path)
-    handler.setFormatter(formatter)
-    logger = logging.getLogger()
-    logger.setLevel(logging.DEBUG)  # Capture all levels of logs
-    logger.addHandler(handler)
+    file_handler = logging.FileHandler(log_path)
+    file_handler.setFormatter(formatter)
+
+    stop_logging()
+    logging.getLogger().setLevel(level)
+    _start_pipeline(file_handler)
     return log_path
+
+
+def _start_pipeline(file_handler):
+    """Attach a rate-limited queue handler to the root logger and start its writer thread."""
+    records = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(records)
+    queue_handler.addFilter(RateLimitFilter())
+    listener = logging.handlers.QueueListener(records, file_handler)
+    logging.getLogger().addHandler(queue_handler)
+    listener.start()
+
+    global _pipeline
+    _pipeline = (queue_handler, listener, file_handler)
+
+
+def stop_logging():
+    """Flush the queued records, stop the writer thread and detach the pipeline."""
+    global _pipeline
+    if _pipeline is None:
+        return
+    queue_handler, listener, file_handler = _pipeline
+    _pipeline = None
+    logging.getLogger().removeHandler(queue_handler)
+    listener.stop()
+    file_handler.close()
+
+
+def _restart_in_child():
+    """
+    A forked worker (e.g. a batch process) inherits the queue handler but not
+    the writer thread, so its records would pile up unwritten. Give it a
+    queue and writer thread of its own on the inherited log file.
+    """
+    global _pipeline
+    if _pipeline is None:
+        return
+    queue_handler, _, file_handler = _pipeline
+    _pipeline = None
+    logging.getLogger().removeHandler(queue_handler)
+    _start_pipeline(file_handler)
+
+    # multiprocessing workers leave through os._exit(), which skips atexit,
+    # and the process bootstrap drops finalizers registered before it runs;
+    # an after-fork callback registers the flush once it has.
+    util = sys.modules.get("multiprocessing.util")
+    if util is not None:
+        util.register_after_fork(_pipeline[1], _flush_at_worker_exit)
+
+
+def _flush_at_worker_exit(listener):
+    sys.modules["multiprocessing.util"].Finalize(None, stop_logging, exitpriority=0)
+
+
+atexit.register(stop_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_in_child)
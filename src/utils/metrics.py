@@ -0,0 +1,166 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class MoveCounter:
+    """
+    Stand-in for an algorithm's `moves` list that only counts.
+
+    Engines append every expanded cell to `moves` and yield `moves[-1]`;
+    this keeps the count and the last cell, so counting-only runs never
+    hold the whole expansion history in memory.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.last: Optional[Tuple[int, int]] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> Tuple[int, int]:
+        if index != -1 or not self.count:
+            raise IndexError("a MoveCounter only keeps the last move")
+        return self.last
+
+    def append(self, cell: Tuple[int, int]) -> None:
+        self.count += 1
+        self.last = cell
+
+    def clear(self) -> None:
+        self.count = 0
+        self.last = None
+
+
+class SearchMetrics:
+    """
+    Counters and timings of one search run, filled in by profile().
+
+    expansions counts every cell a search expands, including cells it
+    expands more than once (D* Lite repairs, or IDDFS re-entering a cell at
+    a smaller depth). reopens counts those repeat expansions. peak_closed
+    is the number of distinct expanded cells, which is the closed set of
+    the graph searches. pushes comes from the frontier's own counter when
+    it keeps one. For plain deques, stacks and heapq lists it is inferred
+    as pops plus what is left on the frontier. peak_frontier is sampled
+    after every expansion. heuristic_evaluations counts calls to both
+    heuristic() and start_heuristic(). phases maps a phase name to seconds;
+    engines add their own phases through SearchAlgorithm.phase().
+
+    With count_only, the algorithm's moves list is replaced by a
+    MoveCounter. With trace_memory, tracing() records the tracemalloc peak.
+    """
+
+    def __init__(self, count_only: bool = False, trace_memory: bool = False):
+        self.count_only = count_only
+        self.trace_memory = trace_memory
+        self.expansions = 0
+        self.pushes = 0
+        self.reopens = 0
+        self.peak_frontier = 0
+        self.peak_closed = 0
+        self.heuristic_evaluations = 0
+        self.path_length = 0
+        self.phases: Dict[str, float] = {}
+        self.tracemalloc_peak: Optional[int] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the wall time of the block to the named phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    @contextmanager
+    def tracing(self) -> Iterator[None]:
+        """Record the tracemalloc peak of the block when trace_memory is set."""
+        if not self.trace_memory:
+            yield
+            return
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        try:
+            yield
+        finally:
+            self.tracemalloc_peak = tracemalloc.get_traced_memory()[1]
+            if not was_tracing:
+                tracemalloc.stop()
+
+    def as_dict(self) -> Dict:
+        result = {
+            'expansions': self.expansions,
+            'pushes': self.pushes,
+            'reopens': self.reopens,
+            'peak_frontier': self.peak_frontier,
+            'peak_closed': self.peak_closed,
+            'heuristic_evaluations': self.heuristic_evaluations,
+            'path_length': self.path_length,
+            'phases': dict(self.phases),
+        }
+        if self.tracemalloc_peak is not None:
+            result['tracemalloc_peak'] = self.tracemalloc_peak
+        return result
+
+
+def _frontier_pushes(frontier, expansions: int) -> int:
+    counted = getattr(frontier, 'pushes', None)
+    if counted is not None:
+        return counted
+    return expansions + len(frontier)
+
+
+def _counted(heuristic, metrics: SearchMetrics):
+    def counted_heuristic(node):
+        metrics.heuristic_evaluations += 1
+        return heuristic(node)
+    return counted_heuristic
+
+
+def profile(algorithm, metrics: SearchMetrics) -> List[Tuple[int, int]]:
+    """
+    Run an algorithm to completion while filling in metrics, and return the
+    path. The heuristics are wrapped to count evaluations, and every expanded
+    cell is checked against a flat table to count repeat expansions. The
+    overhead is a few operations per expansion, and only for profiled runs.
+    """
+    algorithm.metrics = metrics
+    if metrics.count_only:
+        algorithm.moves = MoveCounter()
+    for name in ('heuristic', 'start_heuristic'):
+        setattr(algorithm, name, _counted(getattr(algorithm, name), metrics))
+    index = algorithm.grid.index
+    expanded = algorithm.grid.new_visited()
+    expansions = distinct = peak_frontier = 0
+    # Every frontier object the search used, with the expansions made while it was current.
+    frontiers: Dict[int, list] = {}
+
+    try:
+        with metrics.phase('search'):
+            for x, y in algorithm.steps():
+                expansions += 1
+                cell = index(x, y)
+                if not expanded[cell]:
+                    expanded[cell] = 1
+                    distinct += 1
+                frontier = algorithm.frontier
+                if frontier is not None:
+                    entry = frontiers.get(id(frontier))
+                    if entry is None:
+                        entry = frontiers[id(frontier)] = [frontier, 0]
+                    entry[1] += 1
+                    if len(frontier) > peak_frontier:
+                        peak_frontier = len(frontier)
+    finally:
+        del algorithm.heuristic, algorithm.start_heuristic
+    metrics.expansions += expansions
+    metrics.reopens += expansions - distinct
+    metrics.peak_closed = max(metrics.peak_closed, distinct)
+    metrics.peak_frontier = max(metrics.peak_frontier, peak_frontier)
+    metrics.pushes += sum(_frontier_pushes(frontier, count) for frontier, count in frontiers.values())
+    metrics.path_length = len(algorithm.path)
+    return algorithm.path
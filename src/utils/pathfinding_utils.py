@@ -1,34 +1,39 @@
-from typing import List, Tuple, Set, Dict
 import math
+from typing import Dict, List, Optional, Set, Tuple
+from src.utils.grid import Grid
+
+# Coordinate-level helpers. The engines work on Grid cell ids directly; these
+# are views over the same Grid for callers that think in (x, y) pairs.
 
 
 def parse_walls(walls: List[List[int]]) -> Set[Tuple[int, int]]:
     """Convert wall rectangles to individual cell coordinates."""
     wall_cells = set()
-    for wall in walls:
-        x, y, width, height = wall
+    for x, y, width, height in walls:
         for i in range(y, y + height):
             for j in range(x, x + width):
                 wall_cells.add((j, i))
     return wall_cells
 
 
-def is_valid_move(x: int, y: int, rows: int, cols: int, walls: Set[Tuple[int, int]]) -> bool:
+def is_valid_move(x: int, y: int, grid: Grid) -> bool:
     """Check if the given coordinates are within the grid and not a wall."""
-    return 0 <= x < cols and 0 <= y < rows and (x, y) not in walls
+    return grid.in_bounds(x, y) and not grid.blocked[grid.index(x, y)]
 
 
-def get_neighbors(x: int, y: int, rows: int, cols: int, walls: Set[Tuple[int, int]]) -> List[Tuple[int, int]]:
-    """Get valid neighboring cells."""
-    directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # right, down, left, up
-    return [(x + dx, y + dy) for dx, dy in directions if is_valid_move(x + dx, y + dy, rows, cols, walls)]
+def get_neighbors(x: int, y: int, grid: Grid) -> List[Tuple[int, int]]:
+    """Get the open 4-connected neighbors of (x, y), in Grid.neighbors order."""
+    if not grid.in_bounds(x, y):
+        return []
+    return [grid.coords(cell) for cell in grid.neighbors(grid.index(x, y))]
 
 
-def reconstruct_path(parent: Dict[Tuple[int, int], Tuple[int, int]], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
-    """Reconstruct the path from start to goal."""
+def reconstruct_path(parent: Dict[Tuple[int, int], Optional[Tuple[int, int]]],
+                     goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """Reconstruct the path from start to goal; the start's parent is None."""
     path = []
     current = goal
-    while current:
+    while current is not None:
         path.append(current)
         current = parent[current]
     return list(reversed(path))
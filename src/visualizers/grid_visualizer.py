@@ -1,15 +1,78 @@
 import customtkinter as ctk
 import logging
+import math
+import tkinter as tk
+from src.utils.grid import Grid
+
+MAX_CELL_SIZE = 50
+# Canvas size requested for a new map; larger maps are shown zoomed out or panned.
+VIEW_WIDTH, VIEW_HEIGHT = 1000, 750
+# Cell outlines are only drawn once cells are at least this many pixels wide.
+GRID_LINE_MIN_CELL = 8
+
+FREE_RGB = (255, 255, 255)
+WALL_RGB = (128, 128, 128)
+MOVE_COLOR = "#add8e6"
+START_COLOR = "red"
+GOAL_COLOR = "green"
+GRID_LINE_COLOR = "#c8c8c8"
+
+
+def map_ppm(grid: Grid) -> bytes:
+    """Render the grid as a binary PPM with one pixel per cell."""
+    rows, cols, stride = grid.rows, grid.cols, grid.stride
+    occupancy = bytearray(rows * cols)
+    for y in range(rows):
+        first = grid.index(0, y)
+        occupancy[y * cols:(y + 1) * cols] = bytes(grid.blocked[first:first + cols * stride:stride])
+    pixels = bytearray(3 * rows * cols)
+    for channel, (free, wall) in enumerate(zip(FREE_RGB, WALL_RGB)):
+        pixels[channel::3] = occupancy.translate(bytes([free, wall]) + bytes(254))
+    return f"P6\n{cols} {rows}\n255\n".encode() + pixels
 
 
 class GridVisualizer:
+    """
+    Draws the map as one image with a pixel per cell, scaled into the canvas.
+
+    Each frame only the newly expanded cells are painted into the map image.
+    The canvas shows a scaled copy of the visible part of it, made with Tk's
+    `image copy -from -zoom -subsample`, so the number of canvas items does
+    not grow with the map. A frame copies only the rectangle around its new
+    cells; the whole view and the grid lines are redrawn only when the zoom,
+    the origin or the canvas size changes.
+
+    The scale is `cell_size` pixels per cell, or on maps too large to fit at
+    one pixel per cell, one pixel per `subsample` cells; at most one of the
+    two is above 1. The mouse wheel zooms around the pointer and dragging
+    pans.
+    """
+
     def __init__(self, master):
         self.logger = logging.getLogger(__name__)
         self.master = master
-        self.cell_size = 50
+        self.cell_size = MAX_CELL_SIZE
+        self.subsample = 1
+        self.max_subsample = 1  # shows the whole map in the initial canvas
         self.canvas = ctk.CTkCanvas(self.master)
         self.canvas.pack(fill="both", expand=True)
-        self.move_layer = {}  # Dictionary to store move rectangles
+        self.grid = None
+        self.map_image = None  # one pixel per cell
+        self.view_image = None  # zoomed visible region shown on the canvas
+        self.origin = (0, 0)  # map cell shown at the top-left corner
+        self.view = (0, 0, 0, 0)  # visible cells: x0, y0, x1, y1 (exclusive)
+        self.drawn_lines = None  # (cell_size, view) the grid lines were drawn for
+        self.markers = {}  # start and goal cells, painted over moves
+        self.drawn_moves = 0
+        self.drag_anchor = None
+
+        self.canvas.bind("<Configure>", lambda event: self.render())
+        self.canvas.bind("<MouseWheel>", lambda event: self.zoom(
+            2 if event.delta > 0 else 0.5, event.x, event.y))
+        self.canvas.bind("<Button-4>", lambda event: self.zoom(2, event.x, event.y))
+        self.canvas.bind("<Button-5>", lambda event: self.zoom(0.5, event.x, event.y))
+        self.canvas.bind("<ButtonPress-1>", self.start_drag)
+        self.canvas.bind("<B1-Motion>", self.drag)
         self.logger.info("GridVisualizer initialized")
 
     def initialize_grid(self, environment):
@@ -19,82 +82,189 @@ class GridVisualizer:
         try:
             self.clear_grid()  # Clear existing grid before initializing new one
             rows, cols = environment['dimensions']
-            self.canvas.config(width=cols*self.cell_size,
-                               height=rows*self.cell_size)
-
-            # Layer 1 & 2: Background and Wall Layer
-            for i in range(rows):
-                for j in range(cols):
-                    x1, y1 = j * self.cell_size, i * self.cell_size
-                    x2, y2 = x1 + self.cell_size, y1 + self.cell_size
-                    self.canvas.create_rectangle(x1, y1, x2, y2, fill="white")
-
-            for wall in environment['walls']:
-                x, y, width, height = wall
-                for i in range(y, y + height):
-                    for j in range(x, x + width):
-                        x1, y1 = j * self.cell_size, i * self.cell_size
-                        x2, y2 = x1 + self.cell_size, y1 + self.cell_size
-                        self.canvas.create_rectangle(
-                            x1, y1, x2, y2, fill="gray")
-
-            # Layer 3: Start Position Layer
-            x, y = environment['start']
-            self.canvas.create_oval(x*self.cell_size, y*self.cell_size,
-                                    (x+1)*self.cell_size, (y+1)*self.cell_size, fill="red")
-
-            # Layer 4: Goal Layer
-            for goal in environment['goals']:
-                x, y = goal
-                self.canvas.create_rectangle(x*self.cell_size, y*self.cell_size,
-                                             (x+1)*self.cell_size, (y+1)*self.cell_size, fill="green")
+            self.grid = Grid.from_environment(environment)
+            self.markers = {(x, y): GOAL_COLOR for x, y in environment['goals']
+                            if self.grid.in_bounds(x, y)}
+            self.markers[tuple(environment['start'])] = START_COLOR
+
+            self.map_image = tk.PhotoImage(master=self.canvas, width=cols, height=rows)
+            self.view_image = tk.PhotoImage(master=self.canvas)
+            self.paint_base()
+            self.canvas.create_image(0, 0, image=self.view_image, anchor="nw", tags="map")
+
+            self.cell_size = max(1, min(MAX_CELL_SIZE, VIEW_WIDTH // cols, VIEW_HEIGHT // rows))
+            self.subsample = self.max_subsample = max(
+                1, math.ceil(cols / VIEW_WIDTH), math.ceil(rows / VIEW_HEIGHT))
+            self.origin = (0, 0)
+            self.canvas.config(width=min(self.pixels(cols), VIEW_WIDTH),
+                               height=min(self.pixels(rows), VIEW_HEIGHT))
+            self.render()
 
             self.logger.info("Grid initialized and drawn successfully")
         except KeyError as e:
             self.logger.error(
-                f"Missing key in environment dictionary: {str(e)}")
+                "Missing key in environment dictionary: %s", e)
             raise ValueError(
                 f"Invalid environment structure: missing {str(e)}")
         except Exception as e:
             self.logger.error(
-                f"Unexpected error occurred while initializing grid: {str(e)}")
+                "Unexpected error occurred while initializing grid: %s", e)
             raise
 
+    def paint_base(self):
+        """Paint walls, free cells and markers into the map image, erasing any moves."""
+        self.map_image.configure(data=map_ppm(self.grid), format="PPM")
+        for (x, y), color in self.markers.items():
+            self.map_image.put(color, to=(x, y, x + 1, y + 1))
+        self.drawn_moves = 0
+
     def clear_grid(self):
         """
         Clears the current grid.
         """
         try:
             self.canvas.delete("all")
-            self.move_layer = {}
+            self.grid = None
+            self.map_image = None
+            self.view_image = None
+            self.markers = {}
+            self.drawn_moves = 0
+            self.drawn_lines = None
             self.logger.info("Grid cleared successfully")
         except Exception as e:
             self.logger.error(
-                f"Unexpected error occurred while clearing grid: {str(e)}")
+                "Unexpected error occurred while clearing grid: %s", e)
             raise
 
-    def update_moves(self, move_map):
+    def reset_moves(self):
+        """Erase the moves of a previous search."""
+        if self.map_image is not None and self.drawn_moves:
+            self.paint_base()
+            self.render()
+
+    def update_moves(self, moves):
         """
-        Updates the grid to show all cells the robot has moved on.
+        Paints the cells expanded since the last call. moves is the search's
+        append-only list of expanded cells; a shorter list than last time
+        means a new search, so the old moves are erased first.
         """
         try:
-            # Remove old move markers
-            for rect_id in self.move_layer.values():
-                self.canvas.delete(rect_id)
-            self.move_layer.clear()
-
-            # Add new move markers
-            for (x, y), value in move_map.items():
-                if value > 0:  # If the robot has moved on this cell
-                    x1, y1 = x * self.cell_size, y * self.cell_size
-                    x2, y2 = x1 + self.cell_size, y1 + self.cell_size
-                    rect_id = self.canvas.create_rectangle(
-                        x1, y1, x2, y2, fill="light blue", stipple="gray50")
-                    self.move_layer[(x, y)] = rect_id
-
-            self.logger.info(
-                f"Move layer updated with {len(self.move_layer)} cells")
+            if self.map_image is None:
+                return
+            erased = len(moves) < self.drawn_moves
+            if erased:
+                self.paint_base()
+
+            x0, y0, x1, y1 = self.view
+            left = top = math.inf
+            right = bottom = -math.inf
+            for x, y in moves[self.drawn_moves:]:
+                if (x, y) in self.markers:
+                    continue
+                self.map_image.put(MOVE_COLOR, to=(x, y, x + 1, y + 1))
+                if x0 <= x < x1 and y0 <= y < y1:
+                    left, top = min(left, x), min(top, y)
+                    right, bottom = max(right, x + 1), max(bottom, y + 1)
+            self.drawn_moves = len(moves)
+
+            if erased:
+                self.render()
+            elif left < right:
+                self.copy_region(left, top, right, bottom)
+            self.logger.debug("Move layer updated with %s cells", self.drawn_moves)
         except Exception as e:
             self.logger.error(
-                f"Unexpected error occurred while updating moves: {str(e)}")
+                "Unexpected error occurred while updating moves: %s", e)
             raise
+
+    def pixels(self, cells: int) -> int:
+        """Canvas pixels taken by a run of cells at the current scale."""
+        return -(-cells * self.cell_size // self.subsample)
+
+    def cells(self, pixels: int) -> int:
+        """Whole cells covered by a run of canvas pixels at the current scale."""
+        return pixels * self.subsample // self.cell_size
+
+    def render(self):
+        """Copy the visible part of the map image into the canvas at the current scale."""
+        if self.map_image is None:
+            return
+        rows, cols = self.grid.rows, self.grid.cols
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), 1)
+        x0 = max(0, min(self.origin[0], cols - self.cells(width)))
+        y0 = max(0, min(self.origin[1], rows - self.cells(height)))
+        x1 = min(cols, x0 - self.cells(-width))
+        y1 = min(rows, y0 - self.cells(-height))
+        self.origin = (x0, y0)
+        self.view = (x0, y0, x1, y1)
+
+        self.view_image.blank()
+        self.view_image.configure(width=self.pixels(x1 - x0), height=self.pixels(y1 - y0))
+        self.copy_region(x0, y0, x1, y1)
+        self.draw_grid_lines()
+
+    def copy_region(self, left: int, top: int, right: int, bottom: int):
+        """Copy the map cells in [left, right) x [top, bottom) of the view into the view image."""
+        x0, y0, x1, y1 = self.view
+        size, step = self.cell_size, self.subsample
+        # Subsampling keeps every step-th cell counted from the view's corner;
+        # start the region on one of those so it matches the full copy.
+        left = x0 + (left - x0) // step * step
+        top = y0 + (top - y0) // step * step
+        self.view_image.tk.call(self.view_image.name, "copy", self.map_image.name,
+                                "-from", left, top, min(right, x1), min(bottom, y1),
+                                "-to", (left - x0) // step * size, (top - y0) // step * size,
+                                "-zoom", size, size, "-subsample", step, step)
+
+    def draw_grid_lines(self):
+        """Redraw the cell outlines, if the zoom or the visible cells changed since the last time."""
+        if self.drawn_lines == (self.cell_size, self.view):
+            return
+        self.drawn_lines = (self.cell_size, self.view)
+        self.canvas.delete("gridline")
+        size = self.cell_size
+        if size < GRID_LINE_MIN_CELL:
+            return
+        x0, y0, x1, y1 = self.view
+        right, bottom = (x1 - x0) * size, (y1 - y0) * size
+        for column in range(x1 - x0 + 1):
+            self.canvas.create_line(column * size, 0, column * size, bottom,
+                                    fill=GRID_LINE_COLOR, tags="gridline")
+        for row in range(y1 - y0 + 1):
+            self.canvas.create_line(0, row * size, right, row * size,
+                                    fill=GRID_LINE_COLOR, tags="gridline")
+
+    def zoom(self, factor, pointer_x, pointer_y):
+        """
+        Scale the view by factor, keeping the cell under the pointer in place.
+        Zooming out below one pixel per cell subsamples the map, down to the
+        scale that fits the whole map in the initial canvas.
+        """
+        if self.map_image is None:
+            return
+        size, step = self.cell_size, self.subsample
+        if factor > 1 and step > 1 or factor < 1 and size == 1:
+            step = max(1, min(self.max_subsample, int(step / factor)))
+        else:
+            size = max(1, min(MAX_CELL_SIZE, int(size * factor)))
+        if (size, step) == (self.cell_size, self.subsample):
+            return
+        cell_x = self.origin[0] + self.cells(pointer_x)
+        cell_y = self.origin[1] + self.cells(pointer_y)
+        self.cell_size, self.subsample = size, step
+        self.origin = (cell_x - self.cells(pointer_x), cell_y - self.cells(pointer_y))
+        self.render()
+
+    def start_drag(self, event):
+        self.drag_anchor = (event.x, event.y, self.origin)
+
+    def drag(self, event):
+        if self.drag_anchor is None or self.map_image is None:
+            return
+        anchor_x, anchor_y, (origin_x, origin_y) = self.drag_anchor
+        origin = (origin_x - self.cells(event.x - anchor_x),
+                  origin_y - self.cells(event.y - anchor_y))
+        if origin != self.origin:
+            self.origin = origin
+            self.render()
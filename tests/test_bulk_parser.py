@@ -0,0 +1,37 @@
+import re
+
+import pytest
+
+from src.data.bulk_parser import parse_environment_text, parse_rectangles_bulk
+from src.data.environment_parser import parse_environment
+
+HEADER = "[5,11]\n(0,1)\n(7,0) | (10,3)\n"
+
+
+def test_walls_and_costs():
+    walls, costs = parse_rectangles_bulk("(1,1,1,1,5)\n ( 2 , 2 , 2 , 2 ) \n\n(3,-3,3,3)\n")
+    assert walls == [[2, 2, 2, 2], [3, -3, 3, 3]]
+    assert costs == [[1, 1, 1, 1, 5]]
+
+
+def test_matches_line_by_line_parse():
+    text = HEADER + "(2,0,2,2)\n(8,0,1,2)\n(10,0,1,1)\n(2,3,1,2)\n"
+    environment = parse_environment_text(text)
+    assert environment == parse_environment(text.splitlines())
+    assert environment['walls'] == [[2, 0, 2, 2], [8, 0, 1, 2], [10, 0, 1, 1], [2, 3, 1, 2]]
+    assert 'costs' not in environment
+
+
+@pytest.mark.parametrize("body, number, line", [
+    ("(1,1,1,1,5)\n(2,2,2)", 5, "(2,2,2)"),
+    ("(1,2,3,4)\n\n(1,2,3)", 6, "(1,2,3)"),
+    ("(1,2,3,4)(5,6,7,8)", 4, "(1,2,3,4)(5,6,7,8)"),
+    ("(1,2,3,4,5,6)", 4, "(1,2,3,4,5,6)"),
+    ("(1,2,3,4)\n(1,2,x,4)", 5, "(1,2,x,4)"),
+    ("(1,2,\n3,4)", 4, "(1,2,"),
+])
+def test_malformed_line_is_reported(body, number, line):
+    with pytest.raises(ValueError, match=re.escape(f"invalid wall on line {number}: {line!r}")):
+        parse_rectangles_bulk(body)
+    with pytest.raises(ValueError, match="Error parsing numeric values"):
+        parse_environment_text(HEADER + body)
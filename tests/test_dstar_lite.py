@@ -0,0 +1,71 @@
+import random
+
+from src.algorithms.bfs import BFS
+from src.algorithms.dstar_lite import DStarLite
+from src.data.map_generator import generate_environment
+
+
+def shortest(planner):
+    """Path length BFS finds on the planner's current walls and start."""
+    environment = {'dimensions': (planner.rows, planner.cols), 'start': planner.start,
+                   'goals': list(planner.goals), 'walls': [], 'grid': planner.grid.copy()}
+    return len(BFS(environment).run())
+
+
+def random_rectangle(rng, planner):
+    return [rng.randrange(planner.cols), rng.randrange(planner.rows), rng.randint(1, 4), rng.randint(1, 4)]
+
+
+def test_replanning_matches_a_fresh_search():
+    rng = random.Random(13)
+    for seed in range(12):
+        environment = generate_environment(30, 40, density=0.25, goal_count=rng.randint(1, 3), seed=seed)
+        planner = DStarLite(environment)
+        assert len(planner.run()) == shortest(planner)
+        added = []
+        for _ in range(15):
+            change = rng.random()
+            if change < 0.4:
+                added.append(random_rectangle(rng, planner))
+                planner.add_walls([added[-1]])
+            elif change < 0.7 and added:
+                planner.remove_walls([added.pop(rng.randrange(len(added)))])
+            elif planner.path[1:]:
+                # The robot takes a few steps along its plan.
+                planner.move_start(planner.path[min(len(planner.path) - 1, rng.randint(1, 5))])
+            else:
+                planner.move_start((rng.randrange(planner.cols), rng.randrange(planner.rows)))
+            path = planner.replan()
+            assert len(path) == shortest(planner)
+            if path:
+                assert path[0] == tuple(planner.start) and path[-1] in planner.goals
+
+
+def test_repairs_expand_less_than_the_first_plan():
+    environment = generate_environment(60, 60, density=0.2, goal_count=1, seed=3)
+    planner = DStarLite(environment)
+    planner.run()
+    first = len(planner.moves)
+    x, y = planner.path[len(planner.path) // 2]
+    planner.add_walls([[x, y, 1, 1]])
+    assert len(planner.replan()) == shortest(planner)
+    assert 0 < len(planner.moves) < first
+
+
+def test_walls_that_cut_off_the_goal_and_reopen_it():
+    environment = {'dimensions': (5, 5), 'start': (0, 0), 'goals': [(4, 4)], 'walls': []}
+    planner = DStarLite(environment)
+    assert len(planner.run()) == 9
+    planner.add_walls([[0, 2, 5, 1]])
+    assert planner.replan() == []
+    planner.remove_walls([[2, 2, 1, 1]])
+    assert len(planner.replan()) == 9
+    planner.move_start((4, 3))
+    assert planner.replan() == [(4, 3), (4, 4)]
+
+
+def test_changes_stay_private_to_the_planner():
+    environment = {'dimensions': (5, 5), 'start': (0, 0), 'goals': [(4, 4)], 'walls': []}
+    planner = DStarLite(environment)
+    planner.add_walls([[1, 1, 3, 3]])
+    assert not environment['grid'].blocked[environment['grid'].index(2, 2)]
@@ -0,0 +1,140 @@
+import random
+
+import pytest
+
+from src.algorithms.registry import registry
+from src.data.map_generator import generate_environment
+from src.utils.grid import Grid
+from src.utils.metrics import SearchMetrics, profile
+
+ENGINES = [name for name in registry.specs if name != 'BFS']
+# Engines that may return a longer path than BFS, but still a valid one.
+SUBOPTIMAL = {name for name, spec in registry.specs.items() if not spec.optimal}
+EIGHT_CONNECTED = {'JPS8'}
+
+
+def random_maps(seed, count):
+    rng = random.Random(seed)
+    for _ in range(count):
+        rows, cols = rng.randint(1, 60), rng.randint(1, 60)
+        if rng.random() < 0.7:
+            # Goals guaranteed reachable
+            yield generate_environment(rows, cols, density=rng.uniform(0, 0.4),
+                                       goal_count=rng.randint(1, 4), seed=rng.randrange(2 ** 32))
+        else:
+            # Anything goes: walls may cut off the goals, and goals may sit in walls
+            walls = [[rng.randrange(cols), rng.randrange(rows), rng.randint(1, 4), rng.randint(1, 4)]
+                     for _ in range(rng.randint(0, rows * cols // 6))]
+            yield {
+                'dimensions': (rows, cols),
+                'start': (rng.randrange(cols), rng.randrange(rows)),
+                'goals': [(rng.randrange(cols), rng.randrange(rows)) for _ in range(rng.randint(1, 4))],
+                'walls': walls,
+            }
+
+
+def solve(name, environment):
+    algorithm = registry.load(name)(dict(environment))
+    algorithm.run()
+    return algorithm.path
+
+
+def assert_valid_path(path, environment, diagonal):
+    grid = Grid.from_environment(dict(environment))
+    assert path[0] == tuple(environment['start'])
+    assert path[-1] in environment['goals']
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        step = (abs(x1 - x0), abs(y1 - y0))
+        assert step in ({(0, 1), (1, 0), (1, 1)} if diagonal else {(0, 1), (1, 0)})
+        assert grid.is_free(x1, y1)
+        if step == (1, 1):
+            # No corner cutting
+            assert grid.is_free(x0, y1) and grid.is_free(x1, y0)
+
+
+@pytest.mark.parametrize("name", ENGINES)
+def test_path_lengths_match_bfs(name):
+    for environment in random_maps(name, 60):
+        shortest = solve('BFS', environment)
+        path = solve(name, environment)
+        if not shortest:
+            assert path == []
+            continue
+        assert_valid_path(path, environment, name in EIGHT_CONNECTED)
+        if name in EIGHT_CONNECTED:
+            assert len(path) <= len(shortest)
+        elif name in SUBOPTIMAL:
+            assert len(path) >= len(shortest)
+        else:
+            assert len(path) == len(shortest)
+
+
+def test_start_outside_the_map_is_unreachable():
+    environment = {'dimensions': (5, 5), 'start': (7, 2), 'goals': [(1, 1)], 'walls': []}
+    for name in registry.specs:
+        assert solve(name, environment) == []
+
+
+def test_weighted_engines_agree_on_the_cheapest_cost():
+    rng = random.Random(4)
+    for environment in random_maps(4, 40):
+        rows, cols = environment['dimensions']
+        environment['costs'] = [[rng.randrange(cols), rng.randrange(rows), rng.randint(1, 5),
+                                 rng.randint(1, 5), rng.randint(1, 300)] for _ in range(rng.randint(1, 6))]
+        dijkstra, weighted = solve('DIJ', environment), solve('WAS', environment)
+        assert bool(dijkstra) == bool(solve('BFS', environment))
+        if dijkstra:
+            grid = Grid.from_environment(dict(environment))
+            assert_valid_path(weighted, environment, False)
+            assert grid.path_cost(weighted) == grid.path_cost(dijkstra)
+
+
+@pytest.mark.parametrize("name", ['IDDFS', 'IDAS', 'FRINGE'])
+def test_iterative_deepening_reports_its_frontier(name):
+    environment = generate_environment(30, 30, density=0.2, goal_count=1, seed=8)
+    algorithm = registry.load(name)(dict(environment))
+    metrics = SearchMetrics()
+    path = profile(algorithm, metrics)
+    assert path and metrics.peak_frontier > 0
+    assert metrics.expansions >= metrics.peak_closed
+
+
+def test_iddfs_walks_only_the_current_path():
+    environment = {'dimensions': (40, 40), 'start': (0, 0), 'goals': [(39, 39)], 'walls': []}
+    algorithm = registry.load('IDDFS')(dict(environment))
+    metrics = SearchMetrics()
+    path = profile(algorithm, metrics)
+    assert len(path) == 79
+    # Depth-first: every iteration re-walks the cells inside its bound, so it
+    # expands far more than the breadth-first layers, and its stack never
+    # holds more than one path.
+    assert metrics.expansions > 20 * metrics.peak_closed
+    assert metrics.peak_frontier <= len(path)
+
+
+def test_bidirectional_search_expands_less_than_astar_around_obstacles():
+    expansions = {'AS': 0, 'BIAS': 0}
+    for seed in range(20):
+        environment = generate_environment(80, 80, density=0.3, goal_count=1, seed=seed)
+        for name in expansions:
+            algorithm = registry.load(name)(dict(environment))
+            algorithm.run()
+            expansions[name] += len(algorithm.moves)
+    assert expansions['BIAS'] < 0.8 * expansions['AS']
+
+
+def test_goals_all_outside_the_map_are_unreachable():
+    environment = {'dimensions': (5, 5), 'start': (1, 2), 'goals': [(9, 1), (-1, 3)], 'walls': []}
+    for name in registry.specs:
+        assert solve(name, environment) == []
+
+
+@pytest.mark.parametrize("name", ['BIAS', 'DSL'])
+def test_searches_from_the_goals_count_their_heuristic(name):
+    environment = generate_environment(30, 30, density=0.2, goal_count=1, seed=5)
+    algorithm = registry.load(name)(dict(environment))
+    metrics = SearchMetrics()
+    assert profile(algorithm, metrics)
+    # Every push or key change evaluates the heuristic of its side once.
+    assert metrics.heuristic_evaluations >= metrics.pushes > 0
+    assert 'start_heuristic' not in vars(algorithm)
@@ -0,0 +1,36 @@
+import math
+import random
+import time
+
+from src.utils.goal_index import GoalIndex
+from src.utils.pathfinding_utils import manhattan_distance, octile_distance
+
+
+def nearest(node, goals, metric):
+    return min(metric(node, goal) for goal in goals)
+
+
+def test_matches_linear_scan_on_random_goal_sets():
+    rng = random.Random(5)
+    for _ in range(200):
+        spread = rng.choice([3, 40, 800])
+        goals = [(rng.randint(0, spread), rng.randint(0, spread)) for _ in range(rng.randint(1, 120))]
+        for metric in (manhattan_distance, octile_distance):
+            index = GoalIndex(goals, metric)
+            for _ in range(20):
+                node = (rng.randint(-1000, 2000), rng.randint(-1000, 2000))
+                assert index.distance(node) == nearest(node, goals, metric)
+
+
+def test_far_query_against_clustered_goals():
+    goals = [(x, y) for x in range(10) for y in range(10)]
+    index = GoalIndex(goals)
+    started = time.perf_counter()
+    for node in [(3999, 3999), (3999, 0), (0, 3999), (-4000, 5)]:
+        assert index.distance(node) == nearest(node, goals, manhattan_distance)
+    # Clustered goals leave tiles around a far query empty; they must not be walked.
+    assert time.perf_counter() - started < 0.5
+
+
+def test_no_goals_is_infinitely_far():
+    assert GoalIndex([]).distance((3, 4)) == math.inf
@@ -0,0 +1,35 @@
+from src.utils.grid import Grid
+from src.utils.pathfinding_utils import get_neighbors, is_valid_move, parse_walls, reconstruct_path
+
+
+def test_fingerprint_follows_every_change():
+    grid = Grid(50, 40)
+    empty = grid.fingerprint()
+    assert grid.fingerprint() is empty
+
+    grid.add_walls([[3, 4, 5, 6]])
+    walled = grid.fingerprint()
+    assert walled != empty
+    grid.remove_walls([[3, 4, 5, 6]])
+    assert grid.fingerprint() == empty
+
+    copy = grid.copy()
+    assert copy.fingerprint() == empty
+    copy.add_costs([[0, 0, 2, 2, 7]])
+    assert copy.fingerprint() != empty
+    assert grid.fingerprint() == empty
+
+    grid.blocked[grid.index(1, 1)] = 1
+    grid.mark_changed()
+    assert grid.fingerprint() != empty
+
+
+def test_coordinate_helpers_are_views_over_the_grid():
+    walls = [[1, 0, 1, 2]]
+    grid = Grid(3, 3)
+    grid.add_walls(walls)
+    assert parse_walls(walls) == {(1, 0), (1, 1)}
+    assert [is_valid_move(x, 1, grid) for x in (-1, 0, 1, 2, 3)] == [False, True, False, True, False]
+    assert sorted(get_neighbors(0, 1, grid)) == [(0, 0), (0, 2)]
+    assert get_neighbors(5, 5, grid) == []
+    assert reconstruct_path({(0, 0): None, (0, 1): (0, 0), (0, 2): (0, 1)}, (0, 2)) == [(0, 0), (0, 1), (0, 2)]
@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+from src.algorithms import hpa_star
+from src.algorithms.bfs import BFS
+from src.algorithms.hpa_star import AbstractGraph, HPAStar, abstract_graph
+from src.data.map_generator import generate_environment
+from src.utils.grid import Grid
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    hpa_star._graphs.clear()
+    yield
+    hpa_star._graphs.clear()
+
+
+@pytest.fixture
+def copies(monkeypatch):
+    """The cached graphs copied for patching, in order."""
+    copied = []
+    original_copy = AbstractGraph.copy
+    monkeypatch.setattr(AbstractGraph, 'copy', lambda graph: copied.append(graph) or original_copy(graph))
+    return copied
+
+
+def same_graph(graph, other):
+    return (graph.edges, graph.borders, graph.nodes) == (other.edges, other.borders, other.nodes)
+
+
+def edited(grid, rng, count):
+    """A copy of grid with count small wall rectangles added or cleared."""
+    grid = grid.copy()
+    for _ in range(count):
+        rect = [rng.randrange(grid.cols), rng.randrange(grid.rows), rng.randint(1, 3), rng.randint(1, 3)]
+        if rng.random() < 0.5:
+            grid.add_walls([rect])
+        else:
+            grid.remove_walls([rect])
+    return grid
+
+
+def test_patched_graph_matches_a_fresh_build_and_leaves_the_old_one_alone():
+    rng = random.Random(12)
+    for seed in range(5):
+        grid = Grid.from_environment(generate_environment(70, 90, density=0.25, seed=seed))
+        graph = abstract_graph(grid, 16)
+        for _ in range(4):
+            changed = edited(grid, rng, 3)
+            patched = abstract_graph(changed, 16)
+            assert patched is not graph
+            assert same_graph(patched, AbstractGraph(changed, 16))
+            assert same_graph(graph, AbstractGraph(grid, 16))
+            # The old map keeps its own entry.
+            assert abstract_graph(grid, 16) is graph
+            grid, graph = changed, patched
+
+
+def test_only_small_changes_are_patched(copies):
+    grid = Grid.from_environment(generate_environment(64, 64, density=0.2, seed=1))
+    graph = abstract_graph(grid, 16)
+
+    small = grid.copy()
+    small.remove_walls([[3, 3, 2, 2]])
+    abstract_graph(small, 16)
+    assert copies == [graph]
+
+    # Every cluster changes, more than PATCH_FRACTION, so the graph is rebuilt.
+    large = grid.copy()
+    large.remove_walls([[0, 0, 64, 64]])
+    rebuilt = abstract_graph(large, 16)
+    assert len(copies) == 1
+    assert same_graph(rebuilt, AbstractGraph(large, 16))
+
+
+def test_cache_keeps_the_most_recent_maps():
+    grids = [Grid.from_environment(generate_environment(40, 40, density=0.2, seed=seed))
+             for seed in range(hpa_star.CACHE_SIZE + 1)]
+    graphs = [abstract_graph(grid, 16) for grid in grids]
+    assert len(hpa_star._graphs) == hpa_star.CACHE_SIZE
+    assert abstract_graph(grids[-1], 16) is graphs[-1]
+    assert abstract_graph(grids[0], 16) is not graphs[0]
+
+
+def test_search_after_a_patch_finds_a_valid_path(copies):
+    environment = generate_environment(80, 80, density=0.3, seed=9)
+    HPAStar(dict(environment)).run()
+    # Dropping the walls of one corner only opens cells, so the goal stays reachable.
+    changed = {key: environment[key] for key in ('dimensions', 'start', 'goals')}
+    changed['walls'] = [wall for wall in environment['walls'] if wall[0] >= 20 or wall[1] >= 20]
+    path = HPAStar(dict(changed)).run()
+    assert len(copies) == 1
+    grid = Grid.from_environment(dict(changed))
+    assert path[0] == tuple(changed['start']) and path[-1] in changed['goals']
+    assert len(path) >= len(BFS(dict(changed)).run())
+    assert all(grid.is_free(x, y) for x, y in path[1:])
+    assert all(abs(x1 - x0) + abs(y1 - y0) == 1 for (x0, y0), (x1, y1) in zip(path, path[1:]))
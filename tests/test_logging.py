@@ -0,0 +1,82 @@
+import logging
+import multiprocessing
+import os
+
+import pytest
+
+from src.utils import logging as log_setup
+from src.utils.logging import RateLimitFilter, setup_logging, stop_logging
+
+logger = logging.getLogger(__name__)
+
+needs_fork = pytest.mark.skipif(not hasattr(os, "register_at_fork"), reason="needs os.fork")
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    level = logging.getLogger().level
+    path = setup_logging(str(tmp_path), "DEBUG")
+    yield path
+    stop_logging()
+    logging.getLogger().setLevel(level)
+
+
+def read_log(path):
+    stop_logging()
+    with open(path) as file:
+        return file.read()
+
+
+def record(lineno, created, level=logging.INFO):
+    record = logging.LogRecord("test", level, "site.py", lineno, "message %s", (lineno,), None)
+    record.created = created
+    return record
+
+
+def test_rate_limit_drops_a_noisy_call_site_and_reports_it():
+    limiter = RateLimitFilter(burst=3, interval=1.0)
+    passed = [limiter.filter(record(10, 0.1 * step)) for step in range(8)]
+    assert passed == [True] * 3 + [False] * 5
+    # Another call site and warnings are not affected.
+    assert limiter.filter(record(11, 0.5))
+    assert limiter.filter(record(10, 0.6, logging.WARNING))
+    next_window = record(10, 1.2)
+    assert limiter.filter(next_window)
+    assert next_window.getMessage() == "message 10 (5 similar messages suppressed)"
+
+
+def test_unknown_level_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        setup_logging(str(tmp_path), "LOUD")
+
+
+def test_records_reach_the_file_through_the_writer_thread(log_file):
+    for number in range(5):
+        logger.warning("record %s", number)
+    contents = read_log(log_file)
+    assert all(f"record {number}" in contents for number in range(5))
+
+
+def _log_in_worker(count, inherited, connection):
+    queue_handler, listener, _ = log_setup._pipeline
+    own_writer = queue_handler is not inherited and listener._thread.is_alive()
+    connection.send(own_writer and inherited not in logging.getLogger().handlers)
+    for number in range(count):
+        logger.warning("worker record %s", number)
+
+
+@needs_fork
+def test_forked_workers_get_their_own_writer_and_flush_at_exit(log_file):
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    inherited = log_setup._pipeline[0]
+    workers = [context.Process(target=_log_in_worker, args=(10, inherited, sender)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    assert all(receiver.recv() for _ in workers)
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    contents = read_log(log_file)
+    assert contents.count("worker record") == 30
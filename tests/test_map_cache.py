@@ -0,0 +1,69 @@
+import pytest
+
+from src.data import map_cache
+from src.data.bulk_parser import load_environment, parse_environment_text
+from src.data.file_writer import environment_lines
+from src.utils.grid import Grid
+
+TEXT = "[6,9]\n(0,1)\n(7,0) | (8,5)\n(2,0,2,2)\n(8,0,1,2)\n(20,3,5,5)\n(3,3,2,2,7)\n(0,4,9,1,300)\n"
+
+
+def compiled(tmp_path, text=TEXT, digest=b''):
+    path = str(tmp_path / "map.pfm")
+    map_cache.compile_environment(parse_environment_text(text), path, digest)
+    return path
+
+
+def test_compiled_map_round_trip(tmp_path):
+    source = parse_environment_text(TEXT)
+    loaded = map_cache.load_compiled(compiled(tmp_path))
+    for key in ('dimensions', 'start', 'goals', 'costs'):
+        assert loaded[key] == source[key]
+    assert [list(wall) for wall in loaded['walls']] == source['walls']
+    expected = Grid.from_environment(parse_environment_text(TEXT))
+    assert bytes(loaded['grid'].blocked) == bytes(expected.blocked)
+    assert loaded['grid'].cost == expected.cost
+    assert parse_environment_text("".join(environment_lines(loaded))) == source
+
+
+def test_compiled_map_checks(tmp_path):
+    path = compiled(tmp_path, digest=map_cache.source_hash(b"one"))
+    with pytest.raises(ValueError, match="does not match"):
+        map_cache.load_compiled(path, map_cache.source_hash(b"two"))
+    with open(path, 'rb') as file:
+        data = file.read()
+    with open(path, 'wb') as file:
+        file.write(data[:-1])
+    with pytest.raises(ValueError, match="truncated"):
+        map_cache.load_compiled(path)
+
+
+def test_text_maps_are_cached_by_content(tmp_path):
+    source = tmp_path / "map.txt"
+    source.write_text(TEXT)
+    cache_dir = str(tmp_path / "cache")
+    first = load_environment(str(source), cache_dir=cache_dir)
+    second = load_environment(str(source), cache_dir=cache_dir)
+    assert 'grid' in second and len(list((tmp_path / "cache").iterdir())) == 1
+    assert second['goals'] == first['goals']
+    assert bytes(second['grid'].blocked) == bytes(first['grid'].blocked)
+
+    source.write_text(TEXT.replace("(2,0,2,2)", "(2,0,3,3)"))
+    edited = load_environment(str(source), cache_dir=cache_dir)
+    assert [2, 0, 3, 3] in [list(wall) for wall in edited['walls']]
+    # The copy of the old content is evicted; other maps keep theirs.
+    other = tmp_path / "other.txt"
+    other.write_text(TEXT)
+    load_environment(str(other), cache_dir=cache_dir)
+    cached = sorted(str(path) for path in (tmp_path / "cache").iterdir())
+    assert cached == sorted(map_cache.cache_path(str(path), map_cache.source_hash(path.read_bytes()), cache_dir)
+                            for path in (source, other))
+
+
+def test_uncached_loads_leave_no_files(tmp_path):
+    source = tmp_path / "map.txt"
+    source.write_text(TEXT)
+    cache_dir = tmp_path / "cache"
+    environment = load_environment(str(source), use_cache=False, cache_dir=str(cache_dir))
+    assert environment['goals'] == [(7, 0), (8, 5)]
+    assert not cache_dir.exists()
@@ -0,0 +1,23 @@
+import pytest
+
+from benchmarks.map_generators import STYLES, generate
+from src.algorithms.bfs import BFS
+from src.data.map_generator import generate_environment
+
+
+def test_benchmark_rectangles_are_the_generator_map_for_the_same_seed():
+    for seed in range(3):
+        benchmark = generate('rectangles', 120, seed)
+        environment = generate_environment(120, 120, density=0.25, goal_count=3, seed=seed, max_wall_size=6)
+        for key in ('dimensions', 'start', 'goals', 'walls'):
+            assert benchmark[key] == environment[key]
+
+
+@pytest.mark.parametrize("style", STYLES)
+@pytest.mark.parametrize("size", [9, 10, 60])
+def test_benchmark_maps_are_deterministic_and_solvable(style, size):
+    environment = generate(style, size, seed=2)
+    assert generate(style, size, seed=2)['walls'] == environment['walls']
+    for goal in environment['goals']:
+        search = BFS({**environment, 'goals': [goal]})
+        assert search.run(), f"{style} map of size {size} cannot reach {goal}"
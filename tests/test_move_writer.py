@@ -0,0 +1,154 @@
+import io
+import random
+
+import pytest
+
+from src.command_line_robot import CommandLineRobot
+from src.data.move_writer import (
+    PACKED_FRAME, PACKED_FRAME_MOVES, PACKED_MAGIC, STEP_MOVES, decode_main, decode_rle, iter_moves,
+    move_writer, read_output_moves, read_packed, write_moves)
+
+STRAIGHT = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+DIAGONAL = [(-1, -1), (1, -1), (-1, 1), (1, 1)]
+
+
+def random_path(rng, length, steps):
+    x, y = 0, 0
+    path = [(x, y)]
+    for _ in range(length):
+        # Long runs of one move exercise run-length encoding.
+        dx, dy = rng.choice(steps)
+        for _ in range(rng.choice([1, 1, 2, 7])):
+            x, y = x + dx, y + dy
+            path.append((x, y))
+    return path
+
+
+def encoded(path, move_format):
+    if move_format == 'packed':
+        stream = io.BytesIO()
+        count = write_moves(stream, path, move_format)
+        data = stream.getvalue()
+    else:
+        stream = io.StringIO()
+        count = write_moves(stream, path, move_format)
+        data = (stream.getvalue() + "\n").encode()
+    return count, data
+
+
+def decoded(data):
+    return read_output_moves(io.BufferedReader(io.BytesIO(data)))
+
+
+@pytest.mark.parametrize("move_format", ['text', 'rle', 'packed'])
+def test_random_paths_round_trip(move_format):
+    rng = random.Random(move_format)
+    for length in [0, 1, 3, 4, 5, 100, 1000]:
+        path = random_path(rng, length, STRAIGHT)
+        moves = list(iter_moves(path))
+        count, data = encoded(path, move_format)
+        assert count == len(moves)
+        # An empty run-length line reads like the output of an unreachable goal.
+        assert decoded(data) == (None if move_format == 'rle' and not moves else moves)
+
+
+def test_diagonal_paths_round_trip_through_rle():
+    rng = random.Random(2)
+    path = random_path(rng, 500, STRAIGHT + DIAGONAL)
+    _, data = encoded(path, 'rle')
+    assert decoded(data) == list(iter_moves(path))
+
+
+def test_rle_runs():
+    path = [(0, 0), (1, 0), (2, 0), (2, 1), (1, 0)]
+    assert encoded(path, 'rle')[1] == b"R2 D1 UL1\n"
+    assert list(decode_rle("R2 D1 UL1")) == ['right', 'right', 'down', 'up-left']
+    with pytest.raises(ValueError, match="Invalid run-length token"):
+        list(decode_rle("R2 X1"))
+
+
+def test_packed_frames_split_long_paths():
+    path = [(x, 0) for x in range(PACKED_FRAME_MOVES + 10)]
+    count, data = encoded(path, 'packed')
+    assert count == PACKED_FRAME_MOVES + 9
+    assert decoded(data) == ['right'] * count
+    with pytest.raises(ValueError, match="truncated"):
+        list(read_packed(io.BytesIO(data[:-3])))
+
+
+@pytest.mark.parametrize("token", ["X1", "R", "2R", "r2", "UU2", "DU1", "URD1", "R-1", "R2,"])
+def test_rle_rejects_malformed_tokens(token):
+    with pytest.raises(ValueError, match="Invalid run-length token"):
+        list(decode_rle(f"R1 {token}"))
+    with pytest.raises(ValueError, match="Invalid run-length token"):
+        read_output_moves(io.BufferedReader(io.BytesIO(f"D3 {token}\n".encode())))
+
+
+def test_rle_zero_runs_and_blank_lines_have_no_moves():
+    assert list(decode_rle("R0 D0")) == []
+    assert list(decode_rle("  ")) == []
+    assert decoded(b"\n") is None
+    assert decoded(b"") is None
+
+
+@pytest.mark.parametrize("data, error", [
+    (b"", "Not a packed move stream"),
+    (b"PFM", "Not a packed move stream"),
+    (b"MVPF" + PACKED_FRAME.pack(0), "Not a packed move stream"),
+    # No end-of-stream frame
+    (PACKED_MAGIC, "truncated"),
+    (PACKED_MAGIC + b"\x05", "truncated"),
+    (PACKED_MAGIC + PACKED_FRAME.pack(5) + b"\x55", "truncated"),
+    (PACKED_MAGIC + PACKED_FRAME.pack(4) + b"\x55", "truncated"),
+])
+def test_packed_rejects_corrupt_streams(data, error):
+    with pytest.raises(ValueError, match=error):
+        list(read_packed(io.BytesIO(data)))
+
+
+def test_packed_frames_decode_every_code():
+    data = PACKED_MAGIC + PACKED_FRAME.pack(5) + bytes([0b11100100, 0b01]) + PACKED_FRAME.pack(0)
+    assert list(read_packed(io.BytesIO(data))) == ['up', 'right', 'down', 'left', 'right']
+
+
+def test_unknown_move_format():
+    with pytest.raises(ValueError, match="Unknown move format"):
+        move_writer(io.StringIO(), 'json')
+
+
+def test_decode_command(tmp_path, capsys):
+    path = [(0, 0), (1, 0), (1, 1)]
+    saved = tmp_path / "run.out"
+    with open(saved, 'wb') as file:
+        file.write(b"map.txt AS\n(1, 1) 3\n")
+        write_moves(file, path, 'packed')
+    assert decode_main([str(saved)]) == 0
+    assert capsys.readouterr().out == "map.txt AS\n(1, 1) 3\n['right', 'down']\n"
+
+    saved.write_bytes(saved.read_bytes()[:-2])
+    with pytest.raises(ValueError, match="truncated"):
+        decode_main([str(saved)])
+
+
+def test_packed_rejects_diagonals():
+    with pytest.raises(ValueError, match="4-connected"):
+        encoded([(0, 0), (1, 1)], 'packed')
+
+
+def test_long_jumps_are_named_by_direction():
+    assert list(iter_moves([(0, 0), (5, 0), (5, 5), (2, 2), (2, 2)])) == ['right', 'down', 'up-left']
+    assert set(STEP_MOVES.values()) == set(list(iter_moves(random_path(random.Random(1), 300, STRAIGHT + DIAGONAL))))
+
+
+@pytest.mark.parametrize("move_format", ['text', 'rle', 'packed'])
+def test_written_output_decodes_to_the_text_format(move_format):
+    path = random_path(random.Random(9), 50, STRAIGHT)
+    buffer = io.BytesIO()
+    stream = io.TextIOWrapper(buffer, write_through=True)
+    CommandLineRobot.write_output(stream, "map.txt", "AS", path[-1], 42, path, move_format)
+    stream.flush()
+    data = io.BufferedReader(io.BytesIO(buffer.getvalue()))
+    header = [data.readline().decode().rstrip('\n') for _ in range(2)]
+    text = CommandLineRobot.format_output("map.txt", "AS", path[-1], 42, path).split("\n")
+    assert header == text[:2]
+    assert str(read_output_moves(data)) == text[2]
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from src.algorithms.astar import AStar
+from src.algorithms.registry import registry
+from src.utils import search_buffers
+from src.utils.grid import UNVISITED
+
+
+# Every engine that takes its tables from SearchBuffers.
+ENGINES = ['BFS', 'DFS', 'GBFS', 'AS', 'BEST', 'JPS', 'JPS8', 'BIAS', 'DIJ', 'WAS']
+
+
+def random_environment(rng, rows, cols, weighted=False):
+    walls = [[rng.randrange(cols), rng.randrange(rows), rng.randint(1, 3), rng.randint(1, 3)]
+             for _ in range(rows * cols // 12)]
+    environment = {
+        'dimensions': (rows, cols),
+        'start': (rng.randrange(cols), rng.randrange(rows)),
+        'goals': [(rng.randrange(cols), rng.randrange(rows)) for _ in range(rng.randint(1, 3))],
+        'walls': walls,
+    }
+    if weighted:
+        environment['costs'] = [[rng.randrange(cols), rng.randrange(rows), rng.randint(1, 6),
+                                 rng.randint(1, 6), rng.randint(1, 9)] for _ in range(4)]
+    return environment
+
+
+def search(name, environment):
+    algorithm = registry.load(name)(dict(environment))
+    algorithm.run()
+    return algorithm.moves, algorithm.path
+
+
+def assert_spare_is_clean():
+    for buffers in search_buffers._spare:
+        assert set(buffers.parent) == {UNVISITED}
+        assert set(buffers.g_score) == {UNVISITED}
+        assert not any(buffers.closed)
+        assert not buffers.open_set
+        assert set(buffers.open_set.position) == {-1}
+        if buffers._heap is not None:
+            assert not buffers.heap
+            assert set(buffers.heap.position) == {-1}
+        if buffers._totals is not None:
+            assert set(buffers.totals) == {UNVISITED}
+
+
+@pytest.mark.parametrize("name", ENGINES)
+def test_reused_buffers_give_the_same_searches(name, monkeypatch):
+    # Keep every set, however much of these small maps the search covered.
+    monkeypatch.setattr(search_buffers, 'RESET_FRACTION', 1)
+    rng = random.Random(name)
+    for _ in range(60):
+        environment = random_environment(rng, 24, 30, weighted=name in ('DIJ', 'WAS'))
+        search_buffers._spare.clear()
+        reference = search(name, environment)
+        for other in ('AS', 'GBFS', 'BIAS', 'DIJ'):
+            search(other, random_environment(rng, 24, 30, weighted=True))
+            assert search(name, environment) == reference
+            assert_spare_is_clean()
+
+
+def test_abandoned_search_still_resets_its_buffers():
+    rng = random.Random(3)
+    environment = random_environment(rng, 40, 40)
+    environment['goals'] = [(39, 39)]
+    steps = AStar(environment).steps()
+    for _ in range(10):
+        if next(steps, None) is None:
+            break
+    steps.close()
+    assert len(search_buffers._spare) == 1
+    assert_spare_is_clean()
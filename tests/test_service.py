@@ -0,0 +1,85 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from src.batch_runner import run_job
+from src.service import PathfindingService, is_loopback, parse_map_option
+
+MAP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'input.txt')
+
+
+@pytest.fixture
+def service():
+    service = PathfindingService({'demo': MAP}, workers=1)
+    yield service
+    service.pool.shutdown()
+
+
+def respond(service, request):
+    line = request if isinstance(request, bytes) else json.dumps(request).encode()
+    return json.loads(asyncio.run(service.respond(line)))
+
+
+def test_server_answers_ping_and_stats_itself(service):
+    assert respond(service, {'id': 1, 'op': 'ping'}) == {'id': 1, 'ok': True}
+    assert respond(service, {'op': 'stats'}) == {'served': 0, 'workers': 1, 'connections': 0,
+                                                 'maps': ['demo']}
+
+
+@pytest.mark.parametrize("request_line, request_id, error", [
+    (b'{"map": ', None, "invalid request"),
+    (b'[1, 2]', None, "invalid request: a request must be a JSON object"),
+    (b'{"id": 3, "op": "reset"}', 3, "unknown op: reset"),
+    (b'{"id": 3, "map": "demo"}', 3, "a query needs 'map' and 'method' strings"),
+    (b'{"map": "input.txt", "method": "AS"}', None, "unknown map: input.txt"),
+])
+def test_bad_requests_get_an_error_reply(service, request_line, request_id, error):
+    reply = respond(service, request_line)
+    assert reply['error'].startswith(error)
+    assert reply.get('id') == request_id
+
+
+def test_a_query_returns_the_batch_runner_record(service):
+    reply = respond(service, {'id': 'q', 'map': 'demo', 'method': 'AS'})
+    expected = run_job(MAP, 'AS')
+    assert reply['id'] == 'q'
+    assert (reply['goal'], reply['path'], reply['moves']) == \
+        (expected['goal'], expected['path'], expected['moves'])
+    assert reply['output'].startswith(MAP)
+    assert respond(service, {'op': 'stats'})['served'] == 1
+
+
+def test_pipelined_requests_over_a_socket(service, tmp_path):
+    socket_path = str(tmp_path / 'service.sock')
+    requests = [{'id': 1, 'map': 'demo', 'method': 'BFS'},
+                {'id': 2, 'map': 'demo', 'method': 'NOPE'},
+                {'id': 3, 'op': 'ping'}]
+
+    async def exchange():
+        service.pending = asyncio.Semaphore(2)
+        server = await asyncio.start_unix_server(service.handle_connection, path=socket_path)
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        writer.write(b''.join(json.dumps(request).encode() + b'\n\n' for request in requests))
+        await writer.drain()
+        replies = [json.loads(await reader.readline()) for _ in requests]
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return replies
+
+    replies = {reply['id']: reply for reply in asyncio.run(exchange())}
+    assert replies[1]['path'] == run_job(MAP, 'BFS')['path']
+    assert 'error' in replies[2]
+    assert replies[3] == {'id': 3, 'ok': True}
+
+
+def test_only_loopback_hosts_are_served():
+    assert is_loopback('localhost') and is_loopback('127.0.0.1') and is_loopback('::1')
+    assert not is_loopback('0.0.0.0') and not is_loopback('example.com')
+
+
+def test_map_options():
+    assert parse_map_option('maps/warehouse.txt') == ['warehouse', 'maps/warehouse.txt']
+    assert parse_map_option('w=maps/a=b.txt') == ['w', 'maps/a=b.txt']
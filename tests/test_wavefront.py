@@ -0,0 +1,40 @@
+import random
+from collections import deque
+
+import pytest
+
+from src.utils.grid import Grid
+from src.utils.wavefront import AVAILABLE, wavefront
+
+pytestmark = pytest.mark.skipif(not AVAILABLE, reason="NumPy is not installed")
+
+
+def bfs_distances(grid, sources):
+    distance = {source: 0 for source in sources}
+    queue = deque(sources)
+    while queue:
+        cell = queue.popleft()
+        for neighbor in grid.neighbors(cell):
+            if neighbor not in distance:
+                distance[neighbor] = distance[cell] + 1
+                queue.append(neighbor)
+    return distance
+
+
+def test_distances_match_bfs_on_random_maps():
+    rng = random.Random(15)
+    for _ in range(80):
+        rows, cols = rng.randint(1, 40), rng.randint(1, 40)
+        walls = [[rng.randrange(cols), rng.randrange(rows), rng.randint(1, 4), rng.randint(1, 4)]
+                 for _ in range(rng.randint(0, rows * cols // 5))]
+        grid = Grid.from_environment({'dimensions': (rows, cols), 'start': (0, 0), 'goals': [], 'walls': walls})
+        open_cells = [cell for cell in grid.ids((x, y) for x in range(cols) for y in range(rows))
+                      if not grid.blocked[cell]]
+        sources = rng.sample(open_cells, min(len(open_cells), rng.randint(0, 4)))
+
+        expected = bfs_distances(grid, sources)
+        distance = wavefront(grid, sources)
+        assert distance.shape == (cols + 2, rows + 2)
+        for x in range(cols):
+            for y in range(rows):
+                assert distance[x + 1, y + 1] == expected.get(grid.index(x, y), -1)